@@ -0,0 +1,4 @@
+"""Benchmarks of the phone book API against a throwaway PostgreSQL server.
+
+Run them with `python -m benchmarks`, see `python -m benchmarks --help`.
+"""
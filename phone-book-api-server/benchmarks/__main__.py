@@ -0,0 +1,119 @@
+"""Run the benchmarks, or compare two of their reports.
+
+python -m benchmarks --contacts 100000 --output results.json
+python -m benchmarks compare baseline.json results.json
+"""
+
+import argparse
+import asyncio
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from benchmarks.compare import compare_reports
+from benchmarks.database import seed_contacts, throwaway_database
+from benchmarks.harness import DEFAULT_CONCURRENCY, DEFAULT_MIN_TIME, BenchmarkReport
+
+SUITES = ("validation", "service", "serialization", "http")
+
+
+def get_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(arguments: argparse.Namespace) -> BenchmarkReport:
+    with throwaway_database() as database_url:
+        # The settings and the logging config are read when the app is first imported
+        os.environ["DATABASE_URL"] = database_url
+        os.environ.setdefault("LOG_LEVEL", "WARNING")
+        from benchmarks.load import run_load_benchmarks
+        from benchmarks.micro import (
+            run_serialization_benchmarks,
+            run_service_benchmarks,
+            run_validation_benchmarks,
+        )
+        from phone_book_api_server.api.server import app
+
+        container = app.extra["container"]
+        container.config.database.client.from_value(arguments.database_client)
+        container.config.autocomplete.index.from_value("memory")
+        db_client = container.db_client() if arguments.database_client == "sync" else None
+        if db_client is None:
+            from phone_book_api_server.clients.db_client import PostgreSQLClient
+
+            db_client = PostgreSQLClient()
+        db_client.create_schema()
+        seed_contacts(db_client, arguments.contacts)
+
+        results = []
+        if "validation" in arguments.suites:
+            results += run_validation_benchmarks(arguments.min_time)
+        if "service" in arguments.suites:
+            results += run_service_benchmarks(db_client, arguments.contacts, arguments.min_time)
+        if "serialization" in arguments.suites:
+            results += run_serialization_benchmarks(db_client, arguments.min_time)
+        if "http" in arguments.suites:
+            results += asyncio.run(
+                run_load_benchmarks(
+                    app, arguments.contacts, arguments.min_time, arguments.concurrency
+                )
+            )
+    return BenchmarkReport(
+        commit=get_commit(),
+        created_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        python=platform.python_version(),
+        contacts=arguments.contacts,
+        database_client=arguments.database_client,
+        results=results,
+    )
+
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    compare_parser = subparsers.add_parser("compare", help="Compare two reports")
+    compare_parser.add_argument("baseline", help="The report before the change")
+    compare_parser.add_argument("candidate", help="The report after the change")
+    parser.add_argument("--contacts", type=int, default=10000, help="Contacts to seed")
+    parser.add_argument(
+        "--min-time", type=float, default=DEFAULT_MIN_TIME, help="Seconds per benchmark"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Concurrent HTTP clients"
+    )
+    parser.add_argument("--database-client", choices=("sync", "asyncio"), default="sync")
+    parser.add_argument("--suites", nargs="+", choices=SUITES, default=list(SUITES))
+    parser.add_argument("--output", help="Write the JSON report to this file, not stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    arguments = parse_arguments(argv)
+    if arguments.command == "compare":
+        reports = [
+            BenchmarkReport.parse_file(path) for path in (arguments.baseline, arguments.candidate)
+        ]
+        print("\n".join(compare_reports(*reports)))
+        return
+    report_json = run(arguments).json(indent=2)
+    if arguments.output:
+        with open(arguments.output, "w") as output_file:
+            output_file.write(report_json + "\n")
+    else:
+        sys.stdout.write(report_json + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""Compare two benchmark reports, to see the effect of a change."""
+
+from typing import List
+
+from benchmarks.harness import BenchmarkReport
+
+
+def compare_reports(baseline: BenchmarkReport, candidate: BenchmarkReport) -> List[str]:
+    """One line per benchmark of both reports: the throughput and p99 change."""
+    baseline_results = {result.name: result for result in baseline.results}
+    lines = [
+        f"{'benchmark':<48} {'throughput/s':>14} {'change':>8} {'p99 ms':>10} {'change':>8}",
+    ]
+    for result in candidate.results:
+        baseline_result = baseline_results.get(result.name)
+        if baseline_result is None:
+            continue
+        throughput_change = (
+            result.throughput / baseline_result.throughput - 1
+            if baseline_result.throughput
+            else 0.0
+        )
+        p99_change = result.p99_ms / baseline_result.p99_ms - 1 if baseline_result.p99_ms else 0.0
+        lines.append(
+            f"{result.name:<48} {result.throughput:>14.1f} {throughput_change:>+8.1%} "
+            f"{result.p99_ms:>10.3f} {p99_change:>+8.1%}"
+        )
+    return lines
@@ -0,0 +1,49 @@
+"""A throwaway PostgreSQL server seeded with contacts."""
+
+import random
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+import testing.postgresql
+
+SEED_BATCH_SIZE = 10000
+FIRST_NAMES = ["Dana", "Avi", "Moshe", "Noa", "Yael", "Omer", "Tamar", "Itai", "Maya", "Lior"]
+LAST_NAMES = ["Cohen", "Levi", "Mizrahi", "Peretz", "Biton", "Dahan", "Avraham", "Friedman"]
+
+
+def get_seeded_phone_number(position: int) -> str:
+    """The E.164 phone number of the seeded contact at this position."""
+    return f"+97253{position:07d}"
+
+
+def get_new_phone_number(position: int) -> str:
+    """A valid phone number no seeded contact has."""
+    return f"+3361{position:07d}"
+
+
+def get_seed_contacts(start: int, stop: int, seed: int = 0) -> List[Dict[str, Any]]:
+    names = random.Random(seed + start)
+    return [
+        {
+            "phone_number": get_seeded_phone_number(position),
+            "first_name": names.choice(FIRST_NAMES),
+            "last_name": names.choice(LAST_NAMES),
+            "email_address": f"contact{position}@example.com",
+        }
+        for position in range(start, stop)
+    ]
+
+
+@contextmanager
+def throwaway_database() -> Iterator[str]:
+    """Start an empty PostgreSQL server for the run, and yield its URL."""
+    with testing.postgresql.Postgresql() as postgresql:
+        yield postgresql.url()
+
+
+def seed_contacts(db_client: Any, contacts: int) -> None:
+    """Insert `contacts` contacts through a sync PostgreSQLClient."""
+    for start in range(0, contacts, SEED_BATCH_SIZE):
+        db_client.insert_contacts(get_seed_contacts(start, min(start + SEED_BATCH_SIZE, contacts)))
+    with db_client.engine.begin() as connection:
+        connection.exec_driver_sql("ANALYZE contacts")
@@ -0,0 +1,103 @@
+"""Timing of benchmark runs, and their results."""
+
+import asyncio
+import itertools
+import statistics
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+from pydantic import BaseModel, Field
+
+# Runs shorter than this are repeated until they last it, so fast calls get enough samples
+DEFAULT_MIN_TIME = 1.0
+DEFAULT_CONCURRENCY = 16
+
+
+class BenchmarkResult(BaseModel):
+    name: str = Field(description="The group and name of the benchmark")
+    iterations: int = Field(description="The number of timed calls")
+    errors: int = Field(0, description="The calls that failed")
+    throughput: float = Field(description="Calls per second")
+    p50_ms: float = Field(description="The median latency, in milliseconds")
+    p95_ms: float = Field(description="The 95th percentile latency, in milliseconds")
+    p99_ms: float = Field(description="The 99th percentile latency, in milliseconds")
+
+
+class BenchmarkReport(BaseModel):
+    commit: str = Field(description="The git commit of the benchmarked tree")
+    created_at: str = Field(description="When the benchmarks ran, in ISO 8601")
+    python: str = Field(description="The Python version")
+    contacts: int = Field(description="The number of contacts in the database")
+    database_client: str = Field(description="The sync or asyncio PostgreSQL client")
+    results: List[BenchmarkResult] = Field(description="The result of every benchmark")
+
+
+def summarize(
+    name: str, latencies: List[float], elapsed: float, errors: int = 0
+) -> BenchmarkResult:
+    """Throughput and latency percentiles of the calls of one run."""
+    percentiles = (
+        statistics.quantiles(latencies, n=100, method="inclusive")
+        if len(latencies) > 1
+        else latencies * 99
+    )
+    return BenchmarkResult(
+        name=name,
+        iterations=len(latencies),
+        errors=errors,
+        throughput=len(latencies) / elapsed if elapsed else 0.0,
+        p50_ms=percentiles[49] * 1000,
+        p95_ms=percentiles[94] * 1000,
+        p99_ms=percentiles[98] * 1000,
+    )
+
+
+def run_benchmark(
+    name: str,
+    function: Callable[[int], Any],
+    min_time: float = DEFAULT_MIN_TIME,
+    warmup: int = 10,
+) -> BenchmarkResult:
+    """Call `function(iteration)` until `min_time` seconds went by, timing every call."""
+    for iteration in range(warmup):
+        function(-iteration - 1)
+    latencies: List[float] = []
+    start_time = time.perf_counter()
+    deadline = start_time + min_time
+    for iteration in itertools.count():
+        call_start_time = time.perf_counter()
+        function(iteration)
+        call_end_time = time.perf_counter()
+        latencies.append(call_end_time - call_start_time)
+        if call_end_time >= deadline:
+            break
+    return summarize(name, latencies, time.perf_counter() - start_time)
+
+
+async def run_load(
+    name: str,
+    send_request: Callable[[int], Awaitable[Any]],
+    min_time: float = DEFAULT_MIN_TIME,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> BenchmarkResult:
+    """Send requests from `concurrency` concurrent clients until `min_time` seconds went by.
+
+    `send_request(iteration)` returns the response, responses with a 4xx or 5xx status
+    count as errors.
+    """
+    latencies: List[float] = []
+    errors: Dict[str, int] = {"count": 0}
+    iterations = itertools.count()
+    start_time = time.perf_counter()
+    deadline = start_time + min_time
+
+    async def client() -> None:
+        while time.perf_counter() < deadline:
+            request_start_time = time.perf_counter()
+            response = await send_request(next(iterations))
+            latencies.append(time.perf_counter() - request_start_time)
+            if response.status_code >= 400:
+                errors["count"] += 1
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return summarize(name, latencies, time.perf_counter() - start_time, errors["count"])
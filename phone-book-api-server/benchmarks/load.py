@@ -0,0 +1,110 @@
+"""HTTP load test of every contact route, through the ASGI app in-process."""
+
+import asyncio
+import random
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+import httpx
+
+from benchmarks.database import get_new_phone_number, get_seeded_phone_number
+from benchmarks.harness import BenchmarkResult, run_load
+
+BULK_IMPORT_SIZE = 100
+LOOKUP_SIZE = 100
+
+SendRequest = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+def get_route_requests(contacts: int) -> List[Tuple[str, SendRequest]]:
+    """The request of every benchmarked route, by benchmark name.
+
+    Inserts use phone numbers no seeded contact has, deletes remove the seeded contacts from
+    the last one down, so every delete finds its contact while the table lasts.
+    """
+    phone_numbers = random.Random(0)
+
+    def get_random_phone_number() -> str:
+        return get_seeded_phone_number(phone_numbers.randrange(contacts))
+
+    def get_contact_body(iteration: int) -> Dict[str, Any]:
+        return {
+            "phoneNumber": get_new_phone_number(iteration),
+            "firstName": "Benchmark",
+            "lastName": "Contact",
+            "emailAddress": "benchmark@example.com",
+        }
+
+    return [
+        (
+            "GET /contacts/{contact_phone_number}",
+            lambda client, _: client.get(f"/contacts/{get_random_phone_number()}"),
+        ),
+        ("GET /contacts/", lambda client, _: client.get("/contacts/", params={"limit": 10})),
+        (
+            "GET /contacts/search",
+            lambda client, _: client.get("/contacts/search", params={"q": "Coh"}),
+        ),
+        (
+            "GET /contacts/autocomplete",
+            lambda client, _: client.get("/contacts/autocomplete", params={"prefix": "+97253000"}),
+        ),
+        (
+            "POST /contacts/lookup",
+            lambda client, _: client.post(
+                "/contacts/lookup",
+                json={"phoneNumbers": [get_random_phone_number() for _ in range(LOOKUP_SIZE)]},
+            ),
+        ),
+        (
+            "POST /contacts/",
+            lambda client, iteration: client.post("/contacts/", json=get_contact_body(iteration)),
+        ),
+        (
+            "PUT /contacts/{contact_phone_number}",
+            lambda client, _: client.put(
+                f"/contacts/{get_random_phone_number()}", json={"firstName": "Updated"}
+            ),
+        ),
+        (
+            "DELETE /contacts/{contact_phone_number}",
+            lambda client, iteration: client.delete(
+                f"/contacts/{get_seeded_phone_number(contacts - 1 - iteration % contacts)}"
+            ),
+        ),
+        (
+            "POST /contacts/bulk",
+            lambda client, iteration: client.post(
+                "/contacts/bulk",
+                json=[
+                    get_contact_body(5 * 10**6 + iteration * BULK_IMPORT_SIZE + position)
+                    for position in range(BULK_IMPORT_SIZE)
+                ],
+            ),
+        ),
+        ("GET /contacts/export", lambda client, _: client.get("/contacts/export")),
+    ]
+
+
+async def run_load_benchmarks(
+    app: Any, contacts: int, min_time: float, concurrency: int
+) -> List[BenchmarkResult]:
+    results = []
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            # The worker warms up in the background, its index loaded once it reports ready
+            while (await client.get("/health/ready")).status_code != 200:
+                await asyncio.sleep(0.1)
+            for name, send_request in get_route_requests(contacts):
+                results.append(
+                    await run_load(
+                        f"http/{name}",
+                        lambda iteration, send_request=send_request: send_request(
+                            client, iteration
+                        ),
+                        min_time,
+                        # Every export streams the whole table, one at a time is enough
+                        1 if name.endswith("/export") else concurrency,
+                    )
+                )
+    return results
@@ -0,0 +1,151 @@
+"""Microbenchmarks of the validators, the ContactService methods and the JSON encoding."""
+
+import random
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete
+
+from benchmarks.database import get_new_phone_number, get_seeded_phone_number
+from benchmarks.harness import BenchmarkResult, run_benchmark
+from phone_book_api_server.api.responses import FastJSONResponse
+from phone_book_api_server.clients.contact_cache import InMemoryContactCache
+from phone_book_api_server.clients.db_client import PostgreSQLClient
+from phone_book_api_server.clients.phone_number_index import PhoneNumberIndex
+from phone_book_api_server.data_models.contacts import (
+    ContactRequest,
+    ContactResponse,
+    ContactsPageResponse,
+    UpdateContactRequest,
+)
+from phone_book_api_server.database.models import Contacts
+from phone_book_api_server.services import contact_validation
+from phone_book_api_server.services.contact_service import ContactService
+
+
+def run_validation_benchmarks(min_time: float) -> List[BenchmarkResult]:
+    phone_number = "+972 54-664-3567"
+    return [
+        run_benchmark(
+            "validation/normalize_phone_number",
+            lambda _: contact_validation.normalize_phone_number(phone_number),
+            min_time,
+        ),
+        run_benchmark(
+            "validation/normalize_phone_number_uncached",
+            lambda _: contact_validation._parse_phone_number.__wrapped__(phone_number),
+            min_time,
+        ),
+        run_benchmark(
+            "validation/validate_email",
+            lambda _: contact_validation.validate_email("contact@example.com"),
+            min_time,
+        ),
+        run_benchmark(
+            "validation/validate_name", lambda _: contact_validation.validate_name("Dana"), min_time
+        ),
+    ]
+
+
+def run_service_benchmarks(
+    db_client: PostgreSQLClient, contacts: int, min_time: float
+) -> List[BenchmarkResult]:
+    """Benchmark the sync ContactService, its reads spread over the seeded contacts."""
+    phone_numbers = random.Random(0)
+    contact_service = ContactService(db_client)
+    cached_contact_service = ContactService(
+        db_client, InMemoryContactCache(max_size=contacts, ttl=3600), PhoneNumberIndex()
+    )
+    cached_contact_service.load_phone_number_index()
+    hot_phone_number = get_seeded_phone_number(0)
+
+    def get_seeded_phone_numbers(count: int) -> List[str]:
+        return [get_seeded_phone_number(phone_numbers.randrange(contacts)) for _ in range(count)]
+
+    def insert_contact(iteration: int) -> None:
+        contact_service.insert_contact(
+            ContactRequest(
+                phone_number=get_new_phone_number(iteration % 10**7),
+                first_name="Benchmark",
+                last_name="Contact",
+            )
+        )
+
+    results = [
+        run_benchmark(
+            "service/get_contact",
+            lambda _: contact_service.get_contact(get_seeded_phone_numbers(1)[0]),
+            min_time,
+        ),
+        run_benchmark(
+            "service/get_contact_cached",
+            lambda _: cached_contact_service.get_contact(hot_phone_number),
+            min_time,
+        ),
+        run_benchmark(
+            "service/get_contacts_list", lambda _: contact_service.get_contacts_list(10), min_time
+        ),
+        run_benchmark(
+            "service/search_contacts_phone_prefix",
+            lambda _: contact_service.search_contacts("+97253000", 10),
+            min_time,
+        ),
+        run_benchmark(
+            "service/search_contacts_name_prefix",
+            lambda _: contact_service.search_contacts("Coh", 10),
+            min_time,
+        ),
+        run_benchmark(
+            "service/search_contacts_fuzzy",
+            lambda _: contact_service.search_contacts("Cohem", 10),
+            min_time,
+        ),
+        run_benchmark(
+            "service/autocomplete_phone_numbers",
+            lambda _: cached_contact_service.autocomplete_phone_numbers("+97253000", 10),
+            min_time,
+        ),
+        run_benchmark(
+            "service/lookup_contacts_100",
+            lambda _: contact_service.lookup_contacts(get_seeded_phone_numbers(100)),
+            min_time,
+        ),
+        run_benchmark(
+            "service/update_contact",
+            lambda _: contact_service.update_contact(
+                UpdateContactRequest(first_name="Updated"), get_seeded_phone_numbers(1)[0]
+            ),
+            min_time,
+        ),
+        run_benchmark("service/insert_contact", insert_contact, min_time, warmup=0),
+    ]
+    # Leave the seeded contacts as they were for the HTTP benchmarks
+    with db_client.engine.begin() as connection:
+        connection.execute(
+            delete(Contacts).where(Contacts.phone_number.startswith(get_new_phone_number(0)[:5]))
+        )
+    return results
+
+
+def run_serialization_benchmarks(
+    db_client: PostgreSQLClient, min_time: float, page_size: int = 100
+) -> List[BenchmarkResult]:
+    """Encode one page of contacts as FastAPI does, and as the fast JSON path does."""
+    contacts_rows = db_client.get_contacts(page_size)
+
+    def encode_page(_: int) -> bytes:
+        page = ContactsPageResponse(
+            contacts=[ContactResponse.from_orm(contact) for contact in contacts_rows],
+            next_cursor=None,
+        )
+        return JSONResponse(jsonable_encoder(page, by_alias=True)).body
+
+    def encode_page_fast(_: int) -> bytes:
+        page = ContactsPageResponse.construct(contacts=contacts_rows, next_cursor=None)
+        return FastJSONResponse(page).body
+
+    return [
+        run_benchmark(f"serialization/contacts_page_{page_size}", encode_page, min_time),
+        run_benchmark(f"serialization/contacts_page_{page_size}_fast", encode_page_fast, min_time),
+    ]
@@ -1,9 +1,13 @@
-import uvicorn
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from phone_book_api_server.api.server import app
+from phone_book_api_server.launcher import run
+
+
+def create_app() -> FastAPI:
+    # Imported here, so the app and its db engine are created in each worker, not in the parent
+    from phone_book_api_server.api.server import app
 
-if __name__ == "__main__":
     origins = ["*"]
     app.add_middleware(
         CORSMiddleware,
@@ -12,4 +16,8 @@ if __name__ == "__main__":
         allow_methods=["*"],
         allow_headers=["*"],
     )
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    return app
+
+
+if __name__ == "__main__":
+    run("main:create_app", factory=True)
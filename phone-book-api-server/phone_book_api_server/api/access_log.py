@@ -0,0 +1,82 @@
+"""Access log middleware, one log record per request."""
+
+import logging
+import os
+import random
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from phone_book_api_server.logs import reset_request_context, set_request_context
+
+REQUEST_ID_HEADER = b"x-request-id"
+
+
+class AccessLogMiddleware:
+    """Log the method, path, status and duration of every request, and time it.
+
+    A plain ASGI middleware: unlike `@app.middleware("http")`, it neither wraps the response
+    body in a stream nor runs the app in another task. Success logs are kept for a
+    `sample_rate` share of the requests, error responses are always logged.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float = 1.0) -> None:
+        self.app = app
+        self.sample_rate = sample_rate
+        self.__logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start_time = time.perf_counter()
+        request_id = self.__get_request_id(scope)
+        sampled = self.sample_rate >= 1 or random.random() < self.sample_rate
+        context_token = set_request_context(request_id, sampled)
+        status_code = 500
+
+        async def send_with_headers(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Process-Time", f"{time.perf_counter() - start_time:.6f}")
+                headers.append("X-Request-ID", request_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            process_time = time.perf_counter() - start_time
+            self.__logger.log(
+                self.__get_level(status_code),
+                "%s %s %d %.6f",
+                scope["method"],
+                scope["path"],
+                status_code,
+                process_time,
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status_code": status_code,
+                    "process_time": process_time,
+                },
+            )
+            reset_request_context(context_token)
+
+    @staticmethod
+    def __get_request_id(scope: Scope) -> str:
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER:
+                request_id: str = value.decode("latin-1")
+                return request_id
+        return os.urandom(4).hex()
+
+    @staticmethod
+    def __get_level(status_code: int) -> int:
+        if status_code >= 500:
+            return logging.ERROR
+        if status_code >= 400:
+            return logging.WARNING
+        return logging.INFO
@@ -0,0 +1,260 @@
+"""Response compression middleware, for the clients that accept an encoding."""
+
+import functools
+import logging
+import zlib
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple, cast
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # Optional, the "br" encoding is left out without it
+    brotli = None
+try:
+    import zstandard
+except ImportError:  # Optional, the "zstd" encoding is left out without it
+    zstandard = None
+
+# The encodings in order of preference, the first one a client accepts is used
+ENCODINGS = ("zstd", "br", "gzip")
+# Fast levels: on a bandwidth-bound link, most of the gain for a fraction of the CPU
+LEVELS = {"gzip": 6, "br": 4, "zstd": 3}
+# A point lookup is a few hundred bytes, not worth the CPU of compressing it
+MINIMUM_SIZE = 1024
+COMPRESSIBLE_MEDIA_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/msgpack",
+    "application/javascript",
+)
+
+
+class Compressor(ABC):
+    """The compression of one response body, fed chunk by chunk."""
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk, which may stay buffered until `flush`."""
+
+    @abstractmethod
+    def flush(self) -> bytes:
+        """Return everything compressed so far, so a streamed chunk reaches the client now."""
+
+    @abstractmethod
+    def finish(self) -> bytes:
+        """End the compressed stream."""
+
+
+class GzipCompressor(Compressor):
+    def __init__(self, level: int) -> None:
+        self.__compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self.__compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self.__compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self.__compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliCompressor(Compressor):
+    def __init__(self, level: int) -> None:
+        self.__compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return cast(bytes, self.__compressor.process(data))
+
+    def flush(self) -> bytes:
+        return cast(bytes, self.__compressor.flush())
+
+    def finish(self) -> bytes:
+        return cast(bytes, self.__compressor.finish())
+
+
+class ZstdCompressor(Compressor):
+    def __init__(self, level: int) -> None:
+        self.__compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return cast(bytes, self.__compressor.compress(data))
+
+    def flush(self) -> bytes:
+        return cast(bytes, self.__compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK))
+
+    def finish(self) -> bytes:
+        return cast(bytes, self.__compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH))
+
+
+def get_compressors() -> Dict[str, Callable[[int], Compressor]]:
+    """The compressors of the encodings whose package is installed."""
+    compressors: Dict[str, Callable[[int], Compressor]] = {"gzip": GzipCompressor}
+    if brotli is not None:
+        compressors["br"] = BrotliCompressor
+    if zstandard is not None:
+        compressors["zstd"] = ZstdCompressor
+    return compressors
+
+
+def _parse_accept_encoding(accept_encoding: str) -> Dict[str, float]:
+    qualities = {}
+    for coding in accept_encoding.split(","):
+        name, *params = coding.split(";")
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name.strip():
+            qualities[name.strip().lower()] = quality
+    return qualities
+
+
+def select_encoding(accept_encoding: str, encodings: Iterable[str]) -> Optional[str]:
+    """The first of our encodings the client accepts, None to send the response as it is."""
+    qualities = _parse_accept_encoding(accept_encoding)
+    for encoding in encodings:
+        if qualities.get(encoding, qualities.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+class CompressionMiddleware:
+    """Compress the responses with the best encoding the client accepts.
+
+    A response whose whole body is smaller than `minimum_size` is sent as it is. A streamed
+    response is buffered up to `minimum_size` bytes, then compressed chunk by chunk, each
+    chunk flushed to the client as it comes.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        encodings: Sequence[str] = ENCODINGS,
+        minimum_size: int = MINIMUM_SIZE,
+        levels: Optional[Dict[str, int]] = None,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {**LEVELS, **(levels or {})}
+        self.__logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.__compressors = get_compressors()
+        missing_encodings = [
+            encoding for encoding in encodings if encoding not in self.__compressors
+        ]
+        if missing_encodings:
+            self.__logger.warning(
+                f"Compression encodings {missing_encodings} are not installed, skipping them"
+            )
+        self.encodings = [encoding for encoding in encodings if encoding in self.__compressors]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = select_encoding(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            responder = CompressionResponder(send, None, self.minimum_size)
+        else:
+            create_compressor = functools.partial(
+                self.__compressors[encoding], self.levels[encoding]
+            )
+            responder = CompressionResponder(send, (encoding, create_compressor), self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+
+class CompressionResponder:
+    """The sending of one response, compressed by `compression` when it is worth it.
+
+    `compression` is the negotiated encoding and the factory of its compressor, None when the
+    client accepts none of them; the response then only gets its Vary header.
+    """
+
+    def __init__(
+        self,
+        send: Send,
+        compression: Optional[Tuple[str, Callable[[], Compressor]]],
+        minimum_size: int,
+    ) -> None:
+        self.__send = send
+        self.__compression = compression
+        self.__minimum_size = minimum_size
+        self.__start_message: Optional[Message] = None
+        self.__buffered_body = bytearray()
+        self.__compressor: Optional[Compressor] = None
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            await self.__send_start(message)
+        elif message["type"] != "http.response.body":
+            await self.__send(message)
+        elif self.__compressor is not None:
+            body = _compress(self.__compressor, message.get("body", b""), message)
+            await self.__send({**message, "body": body})
+        elif self.__start_message is None or self.__compression is None:
+            await self.__send(message)
+        else:
+            await self.__send_buffered(self.__start_message, self.__compression, message)
+
+    async def __send_start(self, message: Message) -> None:
+        headers = MutableHeaders(scope=message)
+        if not _is_compressible(headers):
+            await self.__send(message)
+            return
+        # Compressed or not, the body depends on the Accept-Encoding of the request
+        headers.add_vary_header("Accept-Encoding")
+        if self.__compression is None:
+            await self.__send(message)
+            return
+        # Held back until the first `minimum_size` bytes tell whether to compress
+        self.__start_message = message
+
+    async def __send_buffered(
+        self,
+        start_message: Message,
+        compression: Tuple[str, Callable[[], Compressor]],
+        message: Message,
+    ) -> None:
+        self.__buffered_body.extend(message.get("body", b""))
+        if message.get("more_body", False) and len(self.__buffered_body) < self.__minimum_size:
+            return
+        self.__start_message = None
+        body = bytes(self.__buffered_body)
+        self.__buffered_body.clear()
+        if len(body) < self.__minimum_size:
+            # The whole body, streamed or not, is too small to be worth compressing
+            await self.__send(start_message)
+            await self.__send({"type": "http.response.body", "body": body})
+            return
+        encoding, create_compressor = compression
+        self.__compressor = create_compressor()
+        body = _compress(self.__compressor, body, message)
+        headers = MutableHeaders(scope=start_message)
+        del headers["content-length"]
+        headers["Content-Encoding"] = encoding
+        if not message.get("more_body", False):
+            headers["Content-Length"] = str(len(body))
+        await self.__send(start_message)
+        await self.__send({**message, "body": body})
+
+
+def _compress(compressor: Compressor, body: bytes, message: Message) -> bytes:
+    """Compress a chunk, flushed to the client when more follow, ending the stream otherwise."""
+    compressed_body = compressor.compress(body)
+    if message.get("more_body", False):
+        return compressed_body + compressor.flush()
+    return compressed_body + compressor.finish()
+
+
+def _is_compressible(headers: MutableHeaders) -> bool:
+    if "content-encoding" in headers:
+        return False
+    return headers.get("content-type", "").startswith(COMPRESSIBLE_MEDIA_TYPES)
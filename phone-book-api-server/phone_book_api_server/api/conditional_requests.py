@@ -0,0 +1,61 @@
+"""Conditional GETs of contacts, so clients revalidate a cached contact without its body."""
+
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict
+
+from starlette.datastructures import Headers
+
+from phone_book_api_server.data_models.contacts import ContactResponse
+
+
+def get_contact_validators(contact: ContactResponse) -> Dict[str, str]:
+    """The ETag and Last-Modified headers of a contact, none for a contact without a version.
+
+    The ETag is weak, a contact is the same whatever its encoding or compression.
+    """
+    if contact.version is None or contact.updated_at is None:
+        return {}
+    updated_at = contact.updated_at.astimezone(timezone.utc)
+    # The update time tells apart a deleted and recreated contact, back at its first version
+    updated_at_micros = int(updated_at.timestamp() * 1_000_000)
+    return {
+        "ETag": f'W/"{contact.version}-{updated_at_micros:x}"',
+        "Last-Modified": format_datetime(updated_at, usegmt=True),
+    }
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match compares weakly, "v1" matches W/"v1"
+    opaque_tag = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if (candidate[2:] if candidate.startswith("W/") else candidate) == opaque_tag:
+            return True
+    return False
+
+
+def is_not_modified(request_headers: Headers, validators: Dict[str, str]) -> bool:
+    """Whether the client's copy is still current, so a 304 replaces the contact.
+
+    If-Modified-Since only counts without an If-None-Match, which is the more precise of
+    the two.
+    """
+    if not validators:
+        return False
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, validators["ETag"])
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+    try:
+        modified_since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if modified_since.tzinfo is None:
+        modified_since = modified_since.replace(tzinfo=timezone.utc)
+    # Last-Modified is in whole seconds, compare it rather than the exact update time
+    return parsedate_to_datetime(validators["Last-Modified"]) <= modified_since
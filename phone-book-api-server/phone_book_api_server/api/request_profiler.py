@@ -0,0 +1,74 @@
+"""Per-request profiling middleware, turned on by a header or a sampling rate."""
+
+import random
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from phone_book_api_server.profiling import (
+    MAX_STATEMENTS,
+    ProfileStore,
+    finish_request_profile,
+    is_profiling_token,
+    start_request_profile,
+)
+
+PROFILE_HEADER = b"x-profile"
+
+
+class RequestProfilerMiddleware:
+    """Profile the requests sent with an `X-Profile: <token>` header, or a `sample_rate` share.
+
+    The header is only honored with the configured `token`, so no other client can make the
+    server profile a request. The profile is stored in `profile_store` and its id sent back in
+    the `X-Profile-ID` header. One request is profiled at a time per worker, the others run as
+    usual, and the other requests the event loop serves meanwhile show up in its profile too.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        profile_store: ProfileStore,
+        sample_rate: float = 0.0,
+        token: Optional[str] = None,
+        max_statements: int = MAX_STATEMENTS,
+    ) -> None:
+        self.app = app
+        self.profile_store = profile_store
+        self.sample_rate = sample_rate
+        self.token = token
+        self.max_statements = max_statements
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.__should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+        started_profile = start_request_profile(scope["method"], scope["path"], self.max_statements)
+        if started_profile is None:
+            await self.app(scope, receive, send)
+            return
+        profile, context_token = started_profile
+        status_code = 500
+
+        async def send_with_profile_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append("X-Profile-ID", profile.id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            seconds = finish_request_profile(profile, context_token)
+            # Sorting and printing the stats is too slow for the event loop
+            self.profile_store.add(await run_in_threadpool(profile.finish, status_code, seconds))
+
+    def __should_profile(self, scope: Scope) -> bool:
+        if self.token:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER:
+                    return is_profiling_token(value.decode("latin-1"), self.token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
@@ -0,0 +1,68 @@
+"""Response classes of the contact routes, and the negotiation of their encoding."""
+
+from typing import Any, Dict, Union
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+
+from phone_book_api_server.services.contact_serialization import (
+    MSGPACK_MEDIA_TYPES,
+    dump_json,
+    dump_msgpack,
+)
+
+# A negotiated response depends on the Accept header, shared caches must key on it
+VARY_HEADERS = {"Vary": "Accept"}
+MSGPACK_RESPONSES: Dict[Union[int, str], Dict[str, Any]] = {
+    200: {"content": {media_type: {} for media_type in MSGPACK_MEDIA_TYPES}}
+}
+
+
+class FastJSONResponse(JSONResponse):
+    """A response model encoded by orjson as is, skipping FastAPI's validation of the model
+    and its jsonable_encoder, with the same JSON on the wire."""
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
+
+
+class MessagePackResponse(Response):
+    """A response model encoded in MessagePack, with the keys and values of its JSON."""
+
+    media_type = MSGPACK_MEDIA_TYPES[0]
+
+    def render(self, content: Any) -> bytes:
+        return dump_msgpack(content)
+
+
+def vary_on_accept(response: Response) -> None:
+    """Route dependency of the negotiated routes, for the responses FastAPI encodes."""
+    response.headers.update(VARY_HEADERS)
+
+
+def _quality(params: str) -> float:
+    for param in params.split(";"):
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def accepts_msgpack(request_headers: Headers) -> bool:
+    """Whether the client asks for MessagePack, at least as much as for JSON.
+
+    Only an explicit MessagePack media type counts, a wildcard Accept still gets JSON.
+    """
+    msgpack_quality = json_quality = 0.0
+    for media_range in request_headers.get("accept", "").split(","):
+        media_type, _, params = media_range.partition(";")
+        media_type = media_type.strip().lower()
+        if media_type in MSGPACK_MEDIA_TYPES:
+            msgpack_quality = max(msgpack_quality, _quality(params))
+        elif media_type == "application/json":
+            json_quality = max(json_quality, _quality(params))
+    return msgpack_quality > 0 and msgpack_quality >= json_quality
@@ -1,14 +1,35 @@
+import inspect
 import logging
-from typing import List
+from typing import Any, Callable, Dict, Optional
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from starlette import status
 
+from phone_book_api_server.api.conditional_requests import get_contact_validators, is_not_modified
+from phone_book_api_server.api.responses import (
+    MSGPACK_RESPONSES,
+    VARY_HEADERS,
+    FastJSONResponse,
+    MessagePackResponse,
+    accepts_msgpack,
+    vary_on_accept,
+)
 from phone_book_api_server.containers import Container
 from phone_book_api_server.data_models.contacts import (
+    AutocompleteResponse,
     ContactRequest,
     ContactResponse,
+    ContactsChangesResponse,
+    ContactsPageResponse,
+    ContactsSearchResponse,
+    ContactsSort,
+    ExportFormat,
+    ImportContactsResponse,
+    LookupContactsRequest,
+    LookupContactsResponse,
     UpdateContactRequest,
 )
 from phone_book_api_server.data_models.db import DeleteContactResponse
@@ -16,8 +37,33 @@ from phone_book_api_server.exceptions.contact import (
     ContactAlreadyExist,
     ContactNotFoundError,
     InvalidContactParams,
+    PhoneNumberIndexUnavailable,
+    UnsupportedContactImportFormat,
+)
+from phone_book_api_server.profiling import profile_thread
+from phone_book_api_server.services.contact_export import EXPORT_MEDIA_TYPES
+from phone_book_api_server.services.contact_import import (
+    CSV_MEDIA_TYPE,
+    JSON_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPES,
+    parse_contact_rows,
+)
+from phone_book_api_server.services.contact_service import (
+    AUTOCOMPLETE_SIZE,
+    CHANGES_PAGE_SIZE,
+    CHANGES_SETTLE_SECONDS,
+    DEFAULT_PAGE_SIZE,
+    EXPORT_BATCH_SIZE,
+    IMPORT_BATCH_SIZE,
+    LOOKUP_MAX_SIZE,
+    MAX_AUTOCOMPLETE_SIZE,
+    MAX_CHANGES_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    MAX_SEARCH_PAGE_SIZE,
+    SEARCH_MAX_RESULTS,
+    SEARCH_PAGE_SIZE,
+    ContactService,
 )
-from phone_book_api_server.services.contact_service import ContactService
 
 router = APIRouter(
     prefix="/contacts",
@@ -30,25 +76,240 @@ router = APIRouter(
 )
 
 
+async def call_service(method: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Await async service methods, run blocking ones in the threadpool."""
+    if inspect.iscoroutinefunction(method):
+        return await method(*args, **kwargs)
+    return await run_in_threadpool(profile_thread(method), *args, **kwargs)
+
+
+def contacts_response(
+    request: Request,
+    config: Dict[str, Any],
+    response: Any,
+    headers: Optional[Dict[str, str]] = None,
+) -> Any:
+    """Encode a response in MessagePack when the client accepts it, or with FastJSONResponse
+    when `serialization.fast_json` is on.
+
+    Otherwise FastAPI validates and encodes it, as every other response.
+    """
+    response_headers = {**VARY_HEADERS, **(headers or {})}
+    if accepts_msgpack(request.headers):
+        return MessagePackResponse(response, headers=response_headers)
+    if (config.get("serialization") or {}).get("fast_json"):
+        return FastJSONResponse(response, headers=response_headers)
+    return response
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    description="Stream the whole phone book as NDJSON, CSV or MessagePack",
+    responses={
+        status.HTTP_200_OK: {
+            "content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()}
+        }
+    },
+)
+@inject
+async def export_contacts(
+    request: Request,
+    export_format: Optional[ExportFormat] = Query(
+        None, alias="format", description="NDJSON by default, or MessagePack when accepted"
+    ),
+    config: Dict[str, Any] = Depends(Provide[Container.config]),
+    contact_service: ContactService = Depends(Provide[Container.contact_service]),
+) -> StreamingResponse:
+    """Export all contacts without loading them into memory."""
+    logger = logging.getLogger(__name__)
+    headers: Dict[str, str] = {}
+    if export_format is None:
+        export_format = (
+            ExportFormat.MSGPACK if accepts_msgpack(request.headers) else ExportFormat.NDJSON
+        )
+        headers.update(VARY_HEADERS)
+    logger.info("Trying to export contacts from the db as %s", export_format.value)
+    export_config = config.get("export") or {}
+    contacts_stream = contact_service.export_contacts(
+        export_format, export_config.get("batch_size", EXPORT_BATCH_SIZE)
+    )
+    return StreamingResponse(
+        contacts_stream,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            **headers,
+            "Content-Disposition": f'attachment; filename="contacts.{export_format.value}"',
+        },
+    )
+
+
+@router.get(
+    "/search",
+    response_model=ContactsSearchResponse,
+    description="Search contacts by phone number prefix, or by name prefix or spelling",
+    responses=MSGPACK_RESPONSES,
+    dependencies=[Depends(vary_on_accept)],
+)
+@inject
+async def search_contacts(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=100, description="A phone number or name"),
+    limit: Optional[int] = Query(None, ge=1, description="The maximum number of contacts"),
+    offset: int = Query(0, ge=0, description="The nextOffset of the previous page"),
+    config: Dict[str, Any] = Depends(Provide[Container.config]),
+    contact_service: ContactService = Depends(Provide[Container.contact_service]),
+) -> Any:
+    """Search contacts, best matches first."""
+    logger = logging.getLogger(__name__)
+    try:
+        logger.info("Trying to search contacts matching (%s)", q)
+        search_config = config.get("search") or {}
+        search_limit = min(
+            limit or search_config.get("limit") or SEARCH_PAGE_SIZE,
+            search_config.get("max_limit") or MAX_SEARCH_PAGE_SIZE,
+        )
+        search_response = await call_service(
+            contact_service.search_contacts,
+            q,
+            search_limit,
+            offset,
+            search_config.get("max_results") or SEARCH_MAX_RESULTS,
+        )
+        logger.info("successfully found %d contacts", len(search_response.contacts))
+        return contacts_response(request, config, search_response)
+    except InvalidContactParams as error:
+        logger.exception(error)
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, detail=str(error)) from error
+    except Exception as error:
+        logger.exception(error)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error"
+        ) from error
+
+
+@router.get(
+    "/autocomplete",
+    response_model=AutocompleteResponse,
+    description="Complete a phone number prefix from the in-memory phone number index",
+    responses={status.HTTP_503_SERVICE_UNAVAILABLE: {"description": "Service Unavailable"}},
+)
+@inject
+async def autocomplete_phone_numbers(
+    prefix: str = Query(..., min_length=1, max_length=30, description="A phone number prefix"),
+    limit: Optional[int] = Query(None, ge=1, description="The maximum number of phone numbers"),
+    config: Dict[str, Any] = Depends(Provide[Container.config]),
+    contact_service: ContactService = Depends(Provide[Container.contact_service]),
+) -> AutocompleteResponse:
+    """Get the first phone numbers starting with the prefix, in order."""
+    logger = logging.getLogger(__name__)
+    try:
+        autocomplete_config = config.get("autocomplete") or {}
+        autocomplete_limit = min(
+            limit or autocomplete_config.get("limit") or AUTOCOMPLETE_SIZE,
+            autocomplete_config.get("max_limit") or MAX_AUTOCOMPLETE_SIZE,
+        )
+        # The index is searched in memory, without a blocking call worth a threadpool hop
+        return contact_service.autocomplete_phone_numbers(prefix, autocomplete_limit)
+    except InvalidContactParams as error:
+        logger.exception(error)
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, detail=str(error)) from error
+    except PhoneNumberIndexUnavailable as error:
+        logger.exception(error)
+        raise HTTPException(
+            status.HTTP_503_SERVICE_UNAVAILABLE, detail="phone number index is not available"
+        ) from error
+    except Exception as error:
+        logger.exception(error)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error"
+        ) from error
+
+
+@router.get(
+    "/changes",
+    response_model=ContactsChangesResponse,
+    description="Get the contacts inserted, updated or deleted since a sync token",
+    responses=MSGPACK_RESPONSES,
+    dependencies=[Depends(vary_on_accept)],
+)
+@inject
+async def get_contacts_changes(
+    request: Request,
+    since: Optional[str] = Query(
+        None, description="The nextToken of the previous sync, none for a first full sync"
+    ),
+    limit: Optional[int] = Query(None, ge=1, description="The maximum number of changes"),
+    config: Dict[str, Any] = Depends(Provide[Container.config]),
+    contact_service: ContactService = Depends(Provide[Container.contact_service]),
+) -> Any:
+    """Get a page of the changes feed, in change order."""
+    logger = logging.getLogger(__name__)
+    try:
+        logger.info("Trying to get the contacts changed since (%s)", since)
+        changes_config = config.get("changes") or {}
+        changes_limit = min(
+            limit or changes_config.get("limit") or CHANGES_PAGE_SIZE,
+            changes_config.get("max_limit") or MAX_CHANGES_PAGE_SIZE,
+        )
+        changes_response = await call_service(
+            contact_service.get_contacts_changes,
+            since,
+            changes_limit,
+            changes_config.get("settle_seconds", CHANGES_SETTLE_SECONDS),
+        )
+        logger.info(
+            "successfully got %d changed and %d deleted contacts",
+            len(changes_response.contacts),
+            len(changes_response.deleted),
+        )
+        return contacts_response(request, config, changes_response)
+    except InvalidContactParams as error:
+        logger.exception(error)
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, detail=str(error)) from error
+    except Exception as error:
+        logger.exception(error)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error"
+        ) from error
+
+
 @router.get(
     "/{contact_phone_number}",
     response_model=ContactResponse,
-    description="Get a contact by ID",
+    description="Get a contact by ID, or 304 when the If-None-Match ETag is still current",
+    responses={
+        **MSGPACK_RESPONSES,
+        status.HTTP_304_NOT_MODIFIED: {"description": "Not Modified"},
+    },
+    dependencies=[Depends(vary_on_accept)],
 )
 @inject
-def get_contact(
+async def get_contact(
     contact_phone_number: str,
+    request: Request,
+    response: Response,
+    config: Dict[str, Any] = Depends(Provide[Container.config]),
     contact_service: ContactService = Depends(Provide[Container.contact_service]),
-) -> ContactResponse:
+) -> Any:
     """Get a contact by its phone number."""
     logger = logging.getLogger(__name__)
     try:
-        logger.info(f"Trying to get contact with his phone number =({contact_phone_number})")
-        contact_response = contact_service.get_contact(contact_phone_number)
+        logger.info("Trying to get contact with his phone number =(%s)", contact_phone_number)
+        contact_response = await call_service(contact_service.get_contact, contact_phone_number)
+        validators = get_contact_validators(contact_response)
+        if is_not_modified(request.headers, validators):
+            logger.info("contact %s is not modified", contact_phone_number)
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers={**VARY_HEADERS, **validators}
+            )
+        response.headers.update(validators)
         logger.info(
-            f"successfully got contact {contact_response.first_name} {contact_response.last_name})"
+            "successfully got contact %s %s",
+            contact_response.first_name,
+            contact_response.last_name,
         )
-        return contact_response
+        return contacts_response(request, config, contact_response, validators)
     except InvalidContactParams as error:
         logger.exception(error)
         raise HTTPException(status.HTTP_400_BAD_REQUEST, detail=str(error)) from error
@@ -66,23 +327,36 @@ def get_contact(
 
 @router.get(
     "/",
-    response_model=List[ContactResponse],
-    description="Get contacts with pagination",
+    response_model=ContactsPageResponse,
+    description="Get contacts with keyset pagination",
+    responses=MSGPACK_RESPONSES,
+    dependencies=[Depends(vary_on_accept)],
 )
 @inject
-def get_contacts_with_limit(
-    config=Depends(Provide[Container.config]),
+async def get_contacts_with_limit(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, description="The maximum number of contacts"),
+    cursor: Optional[str] = Query(None, description="The nextCursor of the previous page"),
+    sort: ContactsSort = Query(ContactsSort.PHONE_NUMBER, description="The order of the pages"),
+    config: Dict[str, Any] = Depends(Provide[Container.config]),
     contact_service: ContactService = Depends(Provide[Container.contact_service]),
-) -> List[ContactResponse]:
-    """Get a contact by its phone number."""
+) -> Any:
+    """Get a page of contacts, following the cursor of the previous page."""
     logger = logging.getLogger(__name__)
     try:
-        logger.info(f"Trying to get from db contants with pagination")
-        contacts_list_response = contact_service.get_contacts_list(
-            config.get("limit_contacts_list")
+        logger.info("Trying to get from db contants with pagination")
+        limit_contacts_list = min(
+            limit or config.get("limit_contacts_list") or DEFAULT_PAGE_SIZE,
+            config.get("max_limit_contacts_list") or MAX_PAGE_SIZE,
+        )
+        contacts_list_response = await call_service(
+            contact_service.get_contacts_list, limit_contacts_list, cursor, sort
         )
-        logger.info(f"successfully got list of contants")
-        return contacts_list_response
+        logger.info("successfully got list of contants")
+        return contacts_response(request, config, contacts_list_response)
+    except InvalidContactParams as error:
+        logger.exception(error)
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, detail=str(error)) from error
     except Exception as error:
         logger.exception(error)
         raise HTTPException(
@@ -92,19 +366,21 @@ def get_contacts_with_limit(
 
 @router.post("/", response_model=ContactResponse, description="Create a new contact")
 @inject
-def create_contact(
+async def create_contact(
     contact_data: ContactRequest,
     contact_service: ContactService = Depends(Provide[Container.contact_service]),
-) -> None:
+) -> ContactResponse:
     """Create a new contact."""
     logger = logging.getLogger(__name__)
     try:
         logger.info(
-            f"Trying to add contact {contact_data.first_name} {contact_data.last_name} to the db"
+            "Trying to add contact %s %s to the db", contact_data.first_name, contact_data.last_name
+        )
+        contact_response: ContactResponse = await call_service(
+            contact_service.insert_contact, contact_data
         )
-        contact_response = contact_service.insert_contact(contact_data)
         logger.info(
-            f"Successfully added contact: {contact_data.first_name} {contact_data.last_name}"
+            "Successfully added contact: %s %s", contact_data.first_name, contact_data.last_name
         )
         return contact_response
     except InvalidContactParams as error:
@@ -122,24 +398,127 @@ def create_contact(
         ) from error
 
 
+@router.post(
+    "/bulk",
+    response_model=ImportContactsResponse,
+    description="Import many contacts from a JSON array, NDJSON or CSV payload",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                JSON_MEDIA_TYPE: {
+                    "schema": {"type": "array", "items": ContactRequest.schema(by_alias=True)}
+                },
+                NDJSON_MEDIA_TYPES[0]: {"schema": {"type": "string"}},
+                CSV_MEDIA_TYPE: {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+@inject
+async def import_contacts(
+    request: Request,
+    config: Dict[str, Any] = Depends(Provide[Container.config]),
+    contact_service: ContactService = Depends(Provide[Container.contact_service]),
+) -> ImportContactsResponse:
+    """Import many contacts, reporting which rows were accepted, rejected or duplicated."""
+    logger = logging.getLogger(__name__)
+    try:
+        contact_rows = await run_in_threadpool(
+            parse_contact_rows, await request.body(), request.headers.get("content-type", "")
+        )
+        logger.info("Trying to import %d contacts to the db", len(contact_rows))
+        import_config = config.get("bulk_import") or {}
+        import_response: ImportContactsResponse = await call_service(
+            contact_service.import_contacts,
+            contact_rows,
+            import_config.get("batch_size", IMPORT_BATCH_SIZE),
+        )
+        logger.info(
+            "Imported contacts: %d accepted, %d rejected, %d duplicates",
+            import_response.accepted,
+            import_response.rejected,
+            import_response.duplicates,
+        )
+        return import_response
+    except UnsupportedContactImportFormat as error:
+        logger.exception(error)
+        raise HTTPException(status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(error)) from error
+    except InvalidContactParams as error:
+        logger.exception(error)
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, detail=str(error)) from error
+    except Exception as error:
+        logger.exception(error)
+        raise HTTPException(
+            status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error"
+        ) from error
+
+
+@router.post(
+    "/lookup",
+    response_model=LookupContactsResponse,
+    description="Resolve many phone numbers to their contacts in one request",
+    responses=MSGPACK_RESPONSES,
+    dependencies=[Depends(vary_on_accept)],
+)
+@inject
+async def lookup_contacts(
+    request: Request,
+    lookup_request: LookupContactsRequest,
+    config: Dict[str, Any] = Depends(Provide[Container.config]),
+    contact_service: ContactService = Depends(Provide[Container.contact_service]),
+) -> Any:
+    """Look up contacts by phone number, reporting the missing and invalid numbers."""
+    logger = logging.getLogger(__name__)
+    try:
+        logger.info("Trying to look up %d phone numbers", len(lookup_request.phone_numbers))
+        lookup_config = config.get("lookup") or {}
+        lookup_response = await call_service(
+            contact_service.lookup_contacts,
+            lookup_request.phone_numbers,
+            lookup_config.get("max_phone_numbers") or LOOKUP_MAX_SIZE,
+        )
+        logger.info(
+            "Looked up contacts: %d found, %d missing, %d invalid",
+            len(lookup_response.contacts),
+            len(lookup_response.missing),
+            len(lookup_response.invalid),
+        )
+        return contacts_response(request, config, lookup_response)
+    except InvalidContactParams as error:
+        logger.exception(error)
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, detail=str(error)) from error
+    except Exception as error:
+        logger.exception(error)
+        raise HTTPException(
+            status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal Server Error"
+        ) from error
+
+
 @router.put(
     "/{contact_phone_number}",
     response_model=ContactResponse,
     description="Update an existing contact",
 )
 @inject
-def update_contact(
+async def update_contact(
     contact_phone_number: str,
     contact_data: UpdateContactRequest,
+    response: Response,
     contact_service: ContactService = Depends(Provide[Container.contact_service]),
 ) -> ContactResponse:
     """Update an existing contact."""
     logger = logging.getLogger(__name__)
     try:
-        logger.info(f"Trying to update contact: {contact_data.first_name} {contact_data.last_name}")
-        contact_response = contact_service.update_contact(contact_data, contact_phone_number)
         logger.info(
-            f"Successfully updated contact: {contact_data.first_name} {contact_data.last_name}"
+            "Trying to update contact: %s %s", contact_data.first_name, contact_data.last_name
+        )
+        contact_response: ContactResponse = await call_service(
+            contact_service.update_contact, contact_data, contact_phone_number
+        )
+        response.headers.update(get_contact_validators(contact_response))
+        logger.info(
+            "Successfully updated contact: %s %s", contact_data.first_name, contact_data.last_name
         )
         return contact_response
     except InvalidContactParams as error:
@@ -165,16 +544,18 @@ def update_contact(
     description="Delete a contact by ID",
 )
 @inject
-def delete_contact(
+async def delete_contact(
     contact_phone_number: str,
     contact_service: ContactService = Depends(Provide[Container.contact_service]),
 ) -> DeleteContactResponse:
     """Delete a contact by its ID."""
     logger = logging.getLogger(__name__)
     try:
-        logger.info(f"Trying to delete contact with his phone number : {contact_phone_number}")
-        delete_response = contact_service.delete_contact(contact_phone_number=contact_phone_number)
-        logger.info(f"successfully deleted contact whith phone number :  {contact_phone_number})")
+        logger.info("Trying to delete contact with his phone number : %s", contact_phone_number)
+        delete_response: DeleteContactResponse = await call_service(
+            contact_service.delete_contact, contact_phone_number=contact_phone_number
+        )
+        logger.info("successfully deleted contact whith phone number :  %s", contact_phone_number)
         return delete_response
     except InvalidContactParams as error:
         logger.exception(error)
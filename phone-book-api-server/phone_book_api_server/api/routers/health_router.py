@@ -0,0 +1,44 @@
+"""Liveness and readiness probe routes."""
+
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends, Response
+from starlette import status
+
+from phone_book_api_server.containers import Container
+from phone_book_api_server.data_models.readiness import ReadinessResponse
+from phone_book_api_server.readiness import Readiness
+
+router = APIRouter(
+    prefix="/health",
+    tags=["Health"],
+    responses={
+        status.HTTP_200_OK: {"description": "OK"},
+    },
+)
+
+
+@router.get("/live", response_model=ReadinessResponse, description="Liveness probe")
+@inject
+def get_liveness(
+    readiness: Readiness = Depends(Provide[Container.readiness]),
+) -> ReadinessResponse:
+    """Answers as soon as the worker runs, without touching the database."""
+    return readiness.status()
+
+
+@router.get(
+    "/ready",
+    response_model=ReadinessResponse,
+    description="Readiness probe",
+    responses={status.HTTP_503_SERVICE_UNAVAILABLE: {"model": ReadinessResponse}},
+)
+@inject
+def get_readiness(
+    response: Response,
+    readiness: Readiness = Depends(Provide[Container.readiness]),
+) -> ReadinessResponse:
+    """503 until the worker reached its database and loaded its index, 200 after."""
+    readiness_status = readiness.status()
+    if not readiness_status.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return readiness_status
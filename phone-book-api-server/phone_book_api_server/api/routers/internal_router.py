@@ -0,0 +1,135 @@
+"""Internal operational routes."""
+
+from typing import Any, Dict, List, Optional
+
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from starlette import status
+
+from phone_book_api_server.clients.contact_cache import ContactCache
+from phone_book_api_server.clients.phone_number_index import PhoneNumberIndex
+from phone_book_api_server.containers import Container
+from phone_book_api_server.data_models.cache import CacheStatsResponse
+from phone_book_api_server.data_models.phone_number_index import PhoneNumberIndexStatsResponse
+from phone_book_api_server.data_models.pool import PoolStatusResponse
+from phone_book_api_server.data_models.profiling import ProfileResponse, ProfileSummaryResponse
+from phone_book_api_server.data_models.single_flight import SingleFlightStatsResponse
+from phone_book_api_server.profiling import ProfileStore, is_profiling_token
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["Internal"],
+    responses={
+        status.HTTP_200_OK: {"description": "OK"},
+    },
+)
+# Reads the profiling token, the routes answer 401 themselves when it is missing
+PROFILING_BEARER = HTTPBearer(auto_error=False)
+
+
+@router.get(
+    "/pool",
+    response_model=PoolStatusResponse,
+    description="Get the database connection pool status",
+)
+@inject
+def get_pool_status(
+    db_client: Any = Depends(Provide[Container.db_client]),
+) -> PoolStatusResponse:
+    """Database connection pool usage, collected from SQLAlchemy pool events."""
+    pool_status: PoolStatusResponse = db_client.pool_status()
+    return pool_status
+
+
+@router.get(
+    "/cache",
+    response_model=CacheStatsResponse,
+    description="Get the contact cache statistics",
+)
+@inject
+def get_cache_stats(
+    contact_cache: ContactCache = Depends(Provide[Container.contact_cache]),
+) -> CacheStatsResponse:
+    """Contact cache hits, misses and evictions since startup."""
+    return contact_cache.stats()
+
+
+@router.get(
+    "/phone-number-index",
+    response_model=PhoneNumberIndexStatsResponse,
+    description="Get the size and memory footprint of the phone number index",
+)
+@inject
+def get_phone_number_index_stats(
+    phone_number_index: Optional[PhoneNumberIndex] = Depends(Provide[Container.phone_number_index]),
+) -> PhoneNumberIndexStatsResponse:
+    """Phone number index size, memory and load time of this worker."""
+    if phone_number_index is None:
+        raise HTTPException(
+            status.HTTP_404_NOT_FOUND, detail="The phone number index is turned off"
+        )
+    return phone_number_index.stats()
+
+
+@router.get(
+    "/lookups",
+    response_model=SingleFlightStatsResponse,
+    description="Get the counters of the coalesced contact lookups",
+)
+@inject
+def get_lookups_stats(
+    contact_lookups: Any = Depends(Provide[Container.contact_lookups]),
+) -> SingleFlightStatsResponse:
+    """Contact lookups that queried the database, and those that shared a running query."""
+    lookups_stats: SingleFlightStatsResponse = contact_lookups.stats()
+    return lookups_stats
+
+
+@inject
+def verify_profiling_token(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(PROFILING_BEARER),
+    config: Dict[str, Any] = Depends(Provide[Container.config]),
+) -> None:
+    """Serve the profiles, which hold the SQL of other requests, to the profiling token only."""
+    token = (config.get("profiling") or {}).get("token")
+    if not token:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Profiling has no token configured")
+    if credentials is None or not is_profiling_token(credentials.credentials, token):
+        raise HTTPException(
+            status.HTTP_401_UNAUTHORIZED,
+            detail="A valid profiling token is required",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+@router.get(
+    "/profiles",
+    response_model=List[ProfileSummaryResponse],
+    description="List the latest request profiles of this worker",
+    dependencies=[Depends(verify_profiling_token)],
+)
+@inject
+def get_profiles(
+    profile_store: ProfileStore = Depends(Provide[Container.profile_store]),
+) -> List[ProfileSummaryResponse]:
+    """Requests profiled with the X-Profile header or by sampling, the latest first."""
+    return profile_store.list()
+
+
+@router.get(
+    "/profiles/{profile_id}",
+    response_model=ProfileResponse,
+    description="Get the cProfile stats and SQL statement timings of a profiled request",
+    dependencies=[Depends(verify_profiling_token)],
+)
+@inject
+def get_profile(
+    profile_id: str,
+    profile_store: ProfileStore = Depends(Provide[Container.profile_store]),
+) -> ProfileResponse:
+    """Time by package, SQL statements and slowest functions of one profiled request."""
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return profile
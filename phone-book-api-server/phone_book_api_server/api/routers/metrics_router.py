@@ -0,0 +1,22 @@
+"""Prometheus metrics route."""
+
+from typing import Any
+
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from phone_book_api_server.containers import Container
+from phone_book_api_server.metrics import CONTENT_TYPE, REGISTRY, render_gauges
+
+router = APIRouter(tags=["Internal"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+@inject
+def get_metrics(db_client: Any = Depends(Provide[Container.db_client])) -> PlainTextResponse:
+    """Request latency, db query time, validation time and pool usage of this worker."""
+    metrics = REGISTRY.render() + render_gauges(
+        "db_pool", "Database connection pool", db_client.pool_status()
+    )
+    return PlainTextResponse(metrics, media_type=CONTENT_TYPE)
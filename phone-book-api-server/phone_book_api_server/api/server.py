@@ -1,29 +1,97 @@
+import asyncio
 import logging
 import os
-import time
-import uuid
-from typing import Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Any, AsyncContextManager, AsyncIterator, Callable
 
-from fastapi import FastAPI, Request, Response, status
-from fastapi.concurrency import iterate_in_threadpool
+from fastapi import FastAPI, Request, Response
 from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 
 from phone_book_api_server import SETTINGS
-from phone_book_api_server.api.routers import contact_router, index_router
+from phone_book_api_server.api.access_log import AccessLogMiddleware
+from phone_book_api_server.api.compression import ENCODINGS, MINIMUM_SIZE, CompressionMiddleware
+from phone_book_api_server.api.request_metrics import RequestMetricsMiddleware
+from phone_book_api_server.api.request_profiler import RequestProfilerMiddleware
+from phone_book_api_server.api.routers import (
+    contact_router,
+    health_router,
+    index_router,
+    internal_router,
+    metrics_router,
+)
+from phone_book_api_server.api.routers.contact_router import call_service
 from phone_book_api_server.constants import get_from_env
 from phone_book_api_server.containers import Container
+from phone_book_api_server.profiling import MAX_STATEMENTS, install_sql_timing
+from phone_book_api_server.services.contact_service import PHONE_NUMBER_INDEX_BATCH_SIZE
+
+# Seconds between two attempts to reach the database while warming up
+WARM_UP_RETRY_SECONDS = 1.0
 
 
 def create_container() -> Container:
     container = Container()
     container.config.from_yaml(SETTINGS.CONFIG, required=True, envs_required=True)
     container.init_resources()
-    container.wire(modules=[contact_router, index_router])
+    container.wire(
+        modules=[contact_router, health_router, index_router, internal_router, metrics_router]
+    )
     return container
 
 
+async def warm_up(container: Container, db_client: Any) -> None:
+    """Reach the database and load the phone number index, then report the worker ready."""
+    logger = logging.getLogger(__name__)
+    readiness = container.readiness()
+    readiness.set_not_ready("Connecting to the database")
+    while True:
+        try:
+            await call_service(db_client.ping)
+            break
+        except Exception as error:
+            readiness.set_not_ready(f"The database is unreachable: {error}")
+            logger.warning("The database is unreachable, retrying: %s", error)
+            await asyncio.sleep(WARM_UP_RETRY_SECONDS)
+    if container.config.autocomplete.index() == "memory":
+        readiness.set_not_ready("Loading the phone number index")
+        logger.info("Loading the phone number index...")
+        contact_service = container.contact_service()
+        try:
+            await call_service(
+                contact_service.load_phone_number_index,
+                container.config.autocomplete.load_batch_size() or PHONE_NUMBER_INDEX_BATCH_SIZE,
+            )
+        except Exception as error:
+            readiness.set_not_ready(f"Loading the phone number index failed: {error}")
+            logger.exception("Loading the phone number index failed")
+            return
+        logger.info("Loaded the phone number index: %s", container.phone_number_index().stats())
+    readiness.set_ready()
+    logger.info("Ready to serve traffic")
+
+
+def create_lifespan(container: Container) -> Callable[[FastAPI], AsyncContextManager[None]]:
+    @asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        # Every worker process creates its own engine, once it is forked; creating it does not
+        # connect, and the schema is left to the migrations
+        db_client = container.db_client()
+        # The worker answers the probes at once and warms up meanwhile
+        warm_up_task = asyncio.create_task(warm_up(container, db_client))
+        yield
+        warm_up_task.cancel()
+        try:
+            await warm_up_task
+        except asyncio.CancelledError:
+            pass
+        # The server stops only once the requests in flight are served
+        await call_service(db_client.close)
+
+    return lifespan
+
+
 def create_app() -> FastAPI:
     container = create_container()
 
@@ -36,68 +104,84 @@ def create_app() -> FastAPI:
         root_path=get_from_env("FASTAPI_SERVER_ROOT_PATH", ""),
         docs_url=None,
         redoc_url=None,
+        lifespan=create_lifespan(container),
     )
     _app.extra = {"container": container}
+    compression_config = container.config.compression() or {}
+    # Added first, innermost, so the access log and the metrics time the compression too
+    if compression_config.get("enabled"):
+        _app.add_middleware(
+            CompressionMiddleware,
+            encodings=compression_config.get("encodings") or ENCODINGS,
+            minimum_size=compression_config.get("minimum_size", MINIMUM_SIZE),
+            levels=compression_config.get("levels"),
+        )
+    access_log_config = container.config.access_log() or {}
+    _app.add_middleware(AccessLogMiddleware, sample_rate=access_log_config.get("sample_rate", 1.0))
+    _app.add_middleware(RequestMetricsMiddleware)
+    profiling_config = container.config.profiling() or {}
+    # Turned off, the middleware and the SQL hooks are left out, so profiling costs nothing
+    if profiling_config.get("enabled"):
+        install_sql_timing()
+        _app.add_middleware(
+            RequestProfilerMiddleware,
+            profile_store=container.profile_store(),
+            sample_rate=profiling_config.get("sample_rate", 0.0),
+            token=profiling_config.get("token"),
+            max_statements=profiling_config.get("max_statements", MAX_STATEMENTS),
+        )
     _app.include_router(contact_router.router)
     _app.include_router(index_router.router)
+    _app.include_router(internal_router.router)
+    _app.include_router(metrics_router.router)
+    _app.include_router(health_router.router)
+    _app.add_exception_handler(Exception, exception_handler)
+    add_docs_routes(_app)
 
     logger.info(f"FastAPI server {SETTINGS.NAME} v{SETTINGS.VERSION} is up and running!")
 
     return _app
 
 
-app = create_app()
-
-
-@app.exception_handler(Exception)
-async def exception_handler(_: Request, error: Exception) -> None:
+async def exception_handler(_: Request, error: Exception) -> Response:
     logger = logging.getLogger(__name__)
     logger.exception(error)
     raise error
 
 
-static_folder = os.path.join(SETTINGS.ROOT_DIR, "api/static")
-app.mount("/static", StaticFiles(directory=static_folder), name="static")
-
-
-@app.get("/docs", include_in_schema=False)
-def custom_swagger_ui_html() -> HTMLResponse:
-    return get_swagger_ui_html(
-        openapi_url=f"{app.root_path}{app.openapi_url}",
-        title=app.title + " - Swagger UI",
-        oauth2_redirect_url=app.swagger_ui_oauth2_redirect_url,
-        swagger_js_url=f"{app.root_path}/static/swagger-ui-bundle.js",
-        swagger_css_url=f"{app.root_path}/static/swagger-ui.css",
-        swagger_favicon_url=f"{app.root_path}/static/favicon.png",
-    )
-
-
-@app.get("/redoc", include_in_schema=False)
-def redoc_html() -> HTMLResponse:
-    return get_redoc_html(
-        openapi_url=f"{app.root_path}{app.openapi_url}",
-        title=app.title + " - ReDoc",
-        redoc_js_url=f"{app.root_path}/static/redoc.standalone.js",
-        redoc_favicon_url=f"{app.root_path}/static/favicon.png",
-    )
-
-
-@app.middleware("http")
-async def add_process_time_header(
-    request: Request, call_next: Callable[[Request], Awaitable[Response]]
-) -> Response:
-    logger = logging.getLogger(__name__)
-    start_time = time.time()
-    idem = str(uuid.uuid1())[:8]
-    logger.info("rid=%s start request [%s] path=%s", idem, request.method.upper(), request.url.path)
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    msg = f"rid={idem} completed_in={process_time} seconds status_code={response.status_code}"
-    if response.status_code < status.HTTP_400_BAD_REQUEST:
-        logger.info(msg)
-    else:
-        resp_body = [section async for section in response.__dict__["body_iterator"]]
-        response.__dict__["body_iterator"] = iterate_in_threadpool(iter(resp_body))
-        logger.info(f"{msg}, {resp_body}")
-    return response
+def add_docs_routes(_app: FastAPI) -> None:
+    static_folder = os.path.join(SETTINGS.ROOT_DIR, "api/static")
+    _app.mount("/static", StaticFiles(directory=static_folder), name="static")
+
+    @_app.get("/docs", include_in_schema=False)
+    def custom_swagger_ui_html() -> HTMLResponse:
+        return get_swagger_ui_html(
+            openapi_url=f"{_app.root_path}{_app.openapi_url}",
+            title=_app.title + " - Swagger UI",
+            oauth2_redirect_url=_app.swagger_ui_oauth2_redirect_url,
+            swagger_js_url=f"{_app.root_path}/static/swagger-ui-bundle.js",
+            swagger_css_url=f"{_app.root_path}/static/swagger-ui.css",
+            swagger_favicon_url=f"{_app.root_path}/static/favicon.png",
+        )
+
+    @_app.get("/redoc", include_in_schema=False)
+    def redoc_html() -> HTMLResponse:
+        return get_redoc_html(
+            openapi_url=f"{_app.root_path}{_app.openapi_url}",
+            title=_app.title + " - ReDoc",
+            redoc_js_url=f"{_app.root_path}/static/redoc.standalone.js",
+            redoc_favicon_url=f"{_app.root_path}/static/favicon.png",
+        )
+
+
+# Declared only, the module __getattr__ below builds it on first access
+app: FastAPI
+
+
+def __getattr__(name: str) -> Any:
+    # The app is built on first use, not on import, so tools importing this module stay fast
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,245 @@
+"""Asynchronous PostgreSQL client."""
+
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from sqlalchemy import Row, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from phone_book_api_server.clients.pool import (
+    PoolMetrics,
+    TimedAsyncQueuePool,
+    dispose_after_fork,
+    get_engine_pool_options,
+    instrument_engine,
+)
+from phone_book_api_server.constants import SETTINGS
+from phone_book_api_server.data_models.contacts import (
+    ContactResponse,
+    ContactSearchQuery,
+    ContactsSort,
+)
+from phone_book_api_server.data_models.pool import PoolStatusResponse
+from phone_book_api_server.database.models import Base, Contacts
+from phone_book_api_server.database.statements import (
+    delete_contact_statement,
+    insert_contact_statement,
+    insert_contacts_statement,
+    insert_tombstone_statement,
+    search_contacts_statement,
+    select_contacts_by_phone_numbers_statement,
+    select_contacts_changes_statement,
+    select_contacts_page_statement,
+    select_contacts_statement,
+    select_phone_numbers_statement,
+    update_contact_statement,
+)
+from phone_book_api_server.exceptions.contact import ContactAlreadyExist, ContactNotFoundError
+from phone_book_api_server.metrics import DB_QUERY_SECONDS
+
+ASYNC_DRIVER_NAME = "postgresql+asyncpg"
+
+
+def get_async_database_url(database_url: Optional[str] = None) -> str:
+    """Return an asyncpg URL, derived from the sync one when no async URL is configured."""
+    if database_url:
+        return database_url
+    if SETTINGS.ASYNC_DATABASE_URL:
+        return SETTINGS.ASYNC_DATABASE_URL
+    url = make_url(SETTINGS.DATABASE_URL).set(  # type: ignore[arg-type]
+        drivername=ASYNC_DRIVER_NAME
+    )
+    return url.render_as_string(hide_password=False)
+
+
+class AsyncPostgreSQLClient:
+    """Asynchronous PostgreSQL Client Class."""
+
+    def __init__(
+        self,
+        database_url: Optional[str] = None,
+        pool_config: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.__logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.engine = create_async_engine(
+            get_async_database_url(database_url),
+            poolclass=TimedAsyncQueuePool,
+            **get_engine_pool_options(pool_config),
+        )
+        self.pool_metrics = PoolMetrics()
+        instrument_engine(self.engine.sync_engine, self.pool_metrics)
+        dispose_after_fork(self.engine.sync_engine)
+        self.SessionLocal = async_sessionmaker(
+            bind=self.engine, autoflush=False, expire_on_commit=False
+        )
+
+    async def create_schema(self) -> None:
+        self.__logger.info("Creating the PostgreSQL schema.")
+        async with self.engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    async def ping(self) -> None:
+        async with self.engine.connect() as connection:
+            await connection.exec_driver_sql("SELECT 1")
+
+    async def close(self) -> None:
+        await self.engine.dispose()
+
+    def pool_status(self) -> PoolStatusResponse:
+        return self.pool_metrics.snapshot(self.engine.sync_engine.pool)
+
+    @DB_QUERY_SECONDS.time("insert_contact")
+    async def insert_contact(self, new_contact: Contacts) -> ContactResponse:
+        self.__logger.info("Inserting new contact into 'contacts' table in PostgreSQL.")
+        async with self.SessionLocal() as db:
+            try:
+                result = await db.execute(insert_contact_statement(new_contact))
+                inserted_contact = result.one()
+                await db.commit()
+                self.__logger.info("Data has been successfully inserted into the 'contacts' table.")
+                contact_response: ContactResponse = ContactResponse.from_orm(inserted_contact)
+                return contact_response
+            except IntegrityError as error:
+                raise ContactAlreadyExist from error
+
+    @DB_QUERY_SECONDS.time("insert_contacts")
+    async def insert_contacts(self, new_contacts: List[Dict[str, Any]]) -> List[str]:
+        self.__logger.info(f"Inserting {len(new_contacts)} contacts into 'contacts' table.")
+        async with self.SessionLocal() as db:
+            result = await db.scalars(insert_contacts_statement(), new_contacts)
+            inserted_phone_numbers = result.all()
+            await db.commit()
+            self.__logger.info(
+                f"{len(inserted_phone_numbers)} contacts have been inserted, "
+                "the others already exist in the 'contacts' table."
+            )
+            return list(inserted_phone_numbers)
+
+    @DB_QUERY_SECONDS.time("get_contacts")
+    async def get_contacts(
+        self,
+        limit_contacts_list: int,
+        sort: ContactsSort = ContactsSort.PHONE_NUMBER,
+        after: Optional[Sequence[str]] = None,
+    ) -> Sequence[Row[Any]]:
+        self.__logger.info("Get a list of contacts with pagination from 'contacts' table.")
+        async with self.SessionLocal() as db:
+            result = await db.execute(
+                select_contacts_page_statement(limit_contacts_list, sort, after)
+            )
+            contacts_list = result.all()
+            self.__logger.info(
+                "Successfully got a list of contacts with pagination from 'contacts' table."
+            )
+            return contacts_list
+
+    @DB_QUERY_SECONDS.time("get_contacts_changes")
+    async def get_contacts_changes(
+        self, after: int, limit: int, settle_seconds: float, include_deleted: bool = True
+    ) -> Sequence[Row[Any]]:
+        self.__logger.info(f"Get the contacts changed after {after} from 'contacts' table.")
+        async with self.SessionLocal() as db:
+            result = await db.execute(
+                select_contacts_changes_statement(after, limit, settle_seconds, include_deleted)
+            )
+            changes = result.all()
+            self.__logger.info(f"Successfully got {len(changes)} contact changes.")
+            return changes
+
+    @DB_QUERY_SECONDS.time("search_contacts")
+    async def search_contacts(
+        self, search_query: ContactSearchQuery, limit: int, offset: int = 0
+    ) -> Sequence[Row[Any]]:
+        self.__logger.info("Search contacts in 'contacts' table.")
+        async with self.SessionLocal() as db:
+            result = await db.execute(search_contacts_statement(search_query, limit, offset))
+            contacts_list = result.all()
+            self.__logger.info("Successfully searched contacts in 'contacts' table.")
+            return contacts_list
+
+    @DB_QUERY_SECONDS.time("get_contacts_by_phone_numbers")
+    async def get_contacts_by_phone_numbers(
+        self, phone_numbers: Sequence[str]
+    ) -> Sequence[Row[Any]]:
+        self.__logger.info(f"Get {len(phone_numbers)} contacts from 'contacts' table.")
+        async with self.SessionLocal() as db:
+            result = await db.execute(select_contacts_by_phone_numbers_statement(phone_numbers))
+            contacts_list = result.all()
+            self.__logger.info(
+                f"Successfully got {len(contacts_list)} contacts from 'contacts' table."
+            )
+            return contacts_list
+
+    async def stream_contacts(self, batch_size: int) -> AsyncIterator[Sequence[Row[Any]]]:
+        """Yield all contacts in batches, read through a server-side cursor."""
+        self.__logger.info("Stream all contacts from 'contacts' table.")
+        async with self.SessionLocal() as db:
+            result = await db.stream(
+                select_contacts_statement().execution_options(yield_per=batch_size)
+            )
+            async for partition in result.partitions():
+                yield partition
+            self.__logger.info("Successfully streamed all contacts from 'contacts' table.")
+
+    async def stream_phone_numbers(self, batch_size: int) -> AsyncIterator[Sequence[str]]:
+        """Yield all phone numbers in batches, read through a server-side cursor."""
+        self.__logger.info("Stream all phone numbers from 'contacts' table.")
+        async with self.SessionLocal() as db:
+            result = await db.stream_scalars(
+                select_phone_numbers_statement().execution_options(yield_per=batch_size)
+            )
+            async for partition in result.partitions():
+                yield partition
+            self.__logger.info("Successfully streamed all phone numbers from 'contacts' table.")
+
+    @DB_QUERY_SECONDS.time("get_contact")
+    async def get_contact(self, contact_phone_number: str) -> ContactResponse:
+        self.__logger.info("Get contact from 'contacts' table.")
+        async with self.SessionLocal() as db:
+            try:
+                result = await db.scalars(
+                    select(Contacts).filter_by(phone_number=contact_phone_number)
+                )
+                contact_data = result.one()
+                self.__logger.info("Successfully got contact from 'contacts' table.")
+                return contact_data
+            except Exception as error:
+                raise ContactNotFoundError from error
+
+    @DB_QUERY_SECONDS.time("update_contact")
+    async def update_contact(
+        self, contact_phone_number: str, contact_values: Dict[str, Any]
+    ) -> ContactResponse:
+        self.__logger.info("Update contact on 'contacts' table.")
+        async with self.SessionLocal() as db:
+            try:
+                result = await db.execute(
+                    update_contact_statement(contact_phone_number, contact_values)
+                )
+                updated_contact = result.one_or_none()
+                # A new phone number deletes the old one from the devices that synced it
+                if (
+                    updated_contact is not None
+                    and updated_contact.phone_number != contact_phone_number
+                ):
+                    await db.execute(insert_tombstone_statement(contact_phone_number))
+                await db.commit()
+            except IntegrityError as error:
+                raise ContactAlreadyExist from error
+        if updated_contact is None:
+            raise ContactNotFoundError
+        self.__logger.info("Successfully updated contact on 'contacts' table.")
+        contact_response: ContactResponse = ContactResponse.from_orm(updated_contact)
+        return contact_response
+
+    @DB_QUERY_SECONDS.time("delete_contact")
+    async def delete_contact(self, contact_phone_number: str) -> bool:
+        """Delete the contact, returning whether it existed."""
+        self.__logger.info("Delete contact from 'contacts' table.")
+        async with self.SessionLocal() as db:
+            result = await db.execute(delete_contact_statement(contact_phone_number))
+            await db.commit()
+            self.__logger.info("Successfully removed contact from 'contacts' table.")
+            return bool(result.rowcount)
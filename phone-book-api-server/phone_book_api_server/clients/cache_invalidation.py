@@ -0,0 +1,187 @@
+"""Messages between the contact caches and the phone number indexes of several workers."""
+
+import json
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import redis
+from redis.client import PubSubWorkerThread
+
+from phone_book_api_server.clients.contact_cache import ContactCache
+from phone_book_api_server.clients.phone_number_index import (
+    PhoneNumberIndex,
+    PhoneNumberIndexLoader,
+)
+from phone_book_api_server.data_models.cache import CacheStatsResponse
+from phone_book_api_server.data_models.contacts import ContactResponse
+from phone_book_api_server.data_models.phone_number_index import PhoneNumberIndexStatsResponse
+
+InvalidationCallback = Callable[[List[str]], None]
+
+
+class CacheInvalidationBroker(ABC):
+    """Publishes the phone numbers changed by a write to every subscribed worker."""
+
+    @abstractmethod
+    def publish(self, phone_numbers: Sequence[str]) -> None:
+        """Tell every subscriber that these contacts changed."""
+
+    @abstractmethod
+    def subscribe(self, callback: InvalidationCallback) -> None:
+        """Call back with the phone numbers of every published message."""
+
+    def close(self) -> None:  # noqa: B027
+        """Stop listening for messages."""
+
+
+class InProcessInvalidationBroker(CacheInvalidationBroker):
+    """Delivers invalidation messages to the subscribers of the same process."""
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__callbacks: List[InvalidationCallback] = []
+
+    def publish(self, phone_numbers: Sequence[str]) -> None:
+        with self.__lock:
+            callbacks = list(self.__callbacks)
+        for callback in callbacks:
+            callback(list(phone_numbers))
+
+    def subscribe(self, callback: InvalidationCallback) -> None:
+        with self.__lock:
+            self.__callbacks.append(callback)
+
+
+class RedisInvalidationBroker(CacheInvalidationBroker):
+    """Delivers invalidation messages to every worker over a Redis pub/sub channel."""
+
+    def __init__(self, redis_client: redis.Redis, channel: str = "contacts:invalidate") -> None:
+        self.__logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.__redis = redis_client
+        self.channel = channel
+        self.__pubsub = redis_client.pubsub(  # type: ignore[no-untyped-call]
+            ignore_subscribe_messages=True
+        )
+        self.__listener: Optional[PubSubWorkerThread] = None
+
+    def publish(self, phone_numbers: Sequence[str]) -> None:
+        try:
+            self.__redis.publish(self.channel, json.dumps(list(phone_numbers)))
+        except redis.RedisError as error:
+            self.__logger.error(f"Failed to publish the invalidation of {phone_numbers}: {error}")
+
+    def subscribe(self, callback: InvalidationCallback) -> None:
+        def handle_message(message: Dict[str, Any]) -> None:
+            callback(json.loads(message["data"]))
+
+        self.__pubsub.subscribe(**{self.channel: handle_message})
+        if self.__listener is None:
+            self.__listener = self.__pubsub.run_in_thread(sleep_time=1, daemon=True)
+
+    def close(self) -> None:
+        if self.__listener is not None:
+            self.__listener.stop()
+            self.__listener = None
+        self.__pubsub.close()
+
+
+class BroadcastContactCache(ContactCache):
+    """A contact cache that tells the caches of the other workers about its writes.
+
+    The messages bump the generations of the other workers' caches too, so a read racing a
+    write there is not cached; the TTL bounds how stale a worker can get if a message is lost.
+    """
+
+    def __init__(self, contact_cache: ContactCache, broker: CacheInvalidationBroker) -> None:
+        self.__contact_cache = contact_cache
+        self.__broker = broker
+        self.is_remote = contact_cache.is_remote
+        broker.subscribe(self.__on_invalidation)
+
+    def get(self, phone_number: str) -> Optional[ContactResponse]:
+        return self.__contact_cache.get(phone_number)
+
+    def get_many(self, phone_numbers: Iterable[str]) -> Dict[str, ContactResponse]:
+        return self.__contact_cache.get_many(phone_numbers)
+
+    def get_generations(self, phone_numbers: Iterable[str]) -> Dict[str, int]:
+        return self.__contact_cache.get_generations(phone_numbers)
+
+    def set(
+        self, phone_number: str, contact: ContactResponse, generation: Optional[int] = None
+    ) -> None:
+        self.__contact_cache.set(phone_number, contact, generation)
+
+    def set_many(
+        self, contacts: Dict[str, ContactResponse], generations: Optional[Dict[str, int]] = None
+    ) -> None:
+        self.__contact_cache.set_many(contacts, generations)
+
+    def delete(self, *phone_numbers: str) -> None:
+        self.__contact_cache.delete(*phone_numbers)
+        self.__broker.publish(phone_numbers)
+
+    def stats(self) -> CacheStatsResponse:
+        return self.__contact_cache.stats()
+
+    def close(self) -> None:
+        self.__broker.close()
+        self.__contact_cache.close()
+
+    def __on_invalidation(self, phone_numbers: List[str]) -> None:
+        # Our own messages come back too, dropping a missing contact is a no-op
+        self.__contact_cache.delete(*phone_numbers)
+
+
+class BroadcastPhoneNumberIndex:
+    """A phone number index that sends its writes to the indexes of the other workers.
+
+    A message lists the added numbers as they are, "+972...", and the removed ones with a
+    "-" instead of their "+". Our own messages come back too and replay our writes in
+    order; a lost message leaves a number wrong in the other workers until they reload.
+    """
+
+    def __init__(
+        self, phone_number_index: PhoneNumberIndex, broker: CacheInvalidationBroker
+    ) -> None:
+        self.__phone_number_index = phone_number_index
+        self.__broker = broker
+        broker.subscribe(self.__on_changes)
+
+    @property
+    def loaded(self) -> bool:
+        return self.__phone_number_index.loaded
+
+    def start_load(self) -> PhoneNumberIndexLoader:
+        return self.__phone_number_index.start_load()
+
+    def add(self, *phone_numbers: str) -> None:
+        self.__phone_number_index.add(*phone_numbers)
+        self.__publish(phone_numbers, ())
+
+    def remove(self, *phone_numbers: str) -> None:
+        self.__phone_number_index.remove(*phone_numbers)
+        self.__publish((), phone_numbers)
+
+    def search(self, digits: str, limit: int) -> Tuple[List[str], int]:
+        return self.__phone_number_index.search(digits, limit)
+
+    def stats(self) -> PhoneNumberIndexStatsResponse:
+        return self.__phone_number_index.stats()
+
+    def close(self) -> None:
+        self.__broker.close()
+
+    def __publish(self, added: Sequence[str], removed: Sequence[str]) -> None:
+        changes = [*added, *("-" + phone_number[1:] for phone_number in removed)]
+        if changes:
+            self.__broker.publish(changes)
+
+    def __on_changes(self, changes: List[str]) -> None:
+        for change in changes:
+            if change.startswith("-"):
+                self.__phone_number_index.remove("+" + change[1:])
+            else:
+                self.__phone_number_index.add(change)
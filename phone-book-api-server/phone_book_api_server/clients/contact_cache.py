@@ -0,0 +1,153 @@
+"""Caches of contact lookups."""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from phone_book_api_server.data_models.cache import CacheStatsResponse
+from phone_book_api_server.data_models.contacts import ContactResponse
+
+# Invalidated phone numbers remembered for the reads in flight, see InMemoryContactCache.set
+INVALIDATIONS_HISTORY_SIZE = 10000
+
+
+class ContactCache(ABC):
+    """A cache of contacts by phone number."""
+
+    # Whether every call is a network round-trip to a shared server
+    is_remote = False
+
+    @abstractmethod
+    def get(self, phone_number: str) -> Optional[ContactResponse]:
+        """Return the cached contact, or None on a miss."""
+
+    def get_many(self, phone_numbers: Iterable[str]) -> Dict[str, ContactResponse]:
+        """Return the cached contacts of these phone numbers, leaving out the misses."""
+        cached_contacts = {}
+        for phone_number in phone_numbers:
+            cached_contact = self.get(phone_number)
+            if cached_contact is not None:
+                cached_contacts[phone_number] = cached_contact
+        return cached_contacts
+
+    @abstractmethod
+    def get_generations(self, phone_numbers: Iterable[str]) -> Dict[str, int]:
+        """Tokens of the invalidations so far, taken before reading these contacts from the db."""
+
+    @abstractmethod
+    def set(
+        self, phone_number: str, contact: ContactResponse, generation: Optional[int] = None
+    ) -> None:
+        """Cache a contact read from the db.
+
+        Given the generation taken before the read, the contact is left out if a write
+        invalidated it meanwhile, instead of caching the row that write replaced.
+        """
+
+    def set_many(
+        self, contacts: Dict[str, ContactResponse], generations: Optional[Dict[str, int]] = None
+    ) -> None:
+        """Cache contacts read from the db, keyed by phone number."""
+        for phone_number, contact in contacts.items():
+            self.set(
+                phone_number, contact, None if generations is None else generations[phone_number]
+            )
+
+    @abstractmethod
+    def delete(self, *phone_numbers: str) -> None:
+        """Drop contacts changed by a write."""
+
+    @abstractmethod
+    def stats(self) -> CacheStatsResponse:
+        """Cache statistics since startup."""
+
+    def close(self) -> None:  # noqa: B027
+        """Release the connections of the cache, if any."""
+
+
+class InMemoryContactCache(ContactCache):
+    """Bounded LRU cache of contacts by phone number, with a time to live per entry."""
+
+    def __init__(self, max_size: int = 10000, ttl: float = 60) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.__lock = threading.Lock()
+        self.__entries: "OrderedDict[str, Tuple[float, ContactResponse]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.__generation = 0
+        self.__invalidated: "OrderedDict[str, int]" = OrderedDict()
+        self.__forgotten_generation = 0
+
+    def get(self, phone_number: str) -> Optional[ContactResponse]:
+        with self.__lock:
+            entry = self.__entries.get(phone_number)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, contact = entry
+            if expires_at <= time.monotonic():
+                del self.__entries[phone_number]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self.__entries.move_to_end(phone_number)
+            self.hits += 1
+            return contact
+
+    def get_generations(self, phone_numbers: Iterable[str]) -> Dict[str, int]:
+        with self.__lock:
+            return dict.fromkeys(phone_numbers, self.__generation)
+
+    def set(
+        self, phone_number: str, contact: ContactResponse, generation: Optional[int] = None
+    ) -> None:
+        if self.max_size <= 0:
+            return
+        with self.__lock:
+            if generation is not None and self.__invalidated_since(phone_number, generation):
+                return
+            self.__entries[phone_number] = (time.monotonic() + self.ttl, contact)
+            self.__entries.move_to_end(phone_number)
+            while len(self.__entries) > self.max_size:
+                self.__entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, *phone_numbers: str) -> None:
+        with self.__lock:
+            for phone_number in phone_numbers:
+                if self.__entries.pop(phone_number, None) is not None:
+                    self.invalidations += 1
+                self.__generation += 1
+                self.__invalidated[phone_number] = self.__generation
+                self.__invalidated.move_to_end(phone_number)
+            while len(self.__invalidated) > INVALIDATIONS_HISTORY_SIZE:
+                _, self.__forgotten_generation = self.__invalidated.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+
+    def stats(self) -> CacheStatsResponse:
+        with self.__lock:
+            return CacheStatsResponse(
+                size=len(self.__entries),
+                max_size=self.max_size,
+                ttl=self.ttl,
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                expirations=self.expirations,
+                invalidations=self.invalidations,
+            )
+
+    def __invalidated_since(self, phone_number: str, generation: int) -> bool:
+        # A read older than the history cannot tell, so it is not cached
+        if generation < self.__forgotten_generation:
+            return True
+        return self.__invalidated.get(phone_number, 0) > generation
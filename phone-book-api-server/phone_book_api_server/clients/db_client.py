@@ -1,46 +1,119 @@
 """PostgreSQL client."""
 
 import logging
-from typing import List
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 
 import sqlalchemy
 
 # from sqlalchemy.orm import sessionmaker
-from sqlalchemy import orm
+from sqlalchemy import Row, orm
+from sqlalchemy.exc import IntegrityError
 
+from phone_book_api_server.clients.pool import (
+    PoolMetrics,
+    TimedQueuePool,
+    dispose_after_fork,
+    get_engine_pool_options,
+    instrument_engine,
+)
 from phone_book_api_server.constants import SETTINGS
-from phone_book_api_server.data_models.contacts import ContactResponse
+from phone_book_api_server.data_models.contacts import (
+    ContactResponse,
+    ContactSearchQuery,
+    ContactsSort,
+)
+from phone_book_api_server.data_models.pool import PoolStatusResponse
 from phone_book_api_server.database.models import Base, Contacts
+from phone_book_api_server.database.statements import (
+    delete_contact_statement,
+    insert_contact_statement,
+    insert_contacts_statement,
+    insert_tombstone_statement,
+    search_contacts_statement,
+    select_contacts_by_phone_numbers_statement,
+    select_contacts_changes_statement,
+    select_contacts_page_statement,
+    select_contacts_statement,
+    select_phone_numbers_statement,
+    update_contact_statement,
+)
 from phone_book_api_server.exceptions.contact import ContactAlreadyExist, ContactNotFoundError
+from phone_book_api_server.metrics import DB_QUERY_SECONDS
 
 
 class PostgreSQLClient:
     """PostgreSQL Client Class."""
 
-    def __init__(self) -> None:
+    def __init__(self, pool_config: Optional[Dict[str, Any]] = None) -> None:
         self.__logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
-        engine = sqlalchemy.create_engine(SETTINGS.DATABASE_URL)
+        engine = sqlalchemy.create_engine(
+            SETTINGS.DATABASE_URL,
+            poolclass=TimedQueuePool,
+            **get_engine_pool_options(pool_config),
+        )
+        self.engine = engine
+        self.pool_metrics = PoolMetrics()
+        instrument_engine(engine, self.pool_metrics)
+        dispose_after_fork(engine)
         self.SessionLocal = orm.sessionmaker(autocommit=False, autoflush=False, bind=engine)
-        Base.metadata.create_all(engine)
 
-    def insert_contact(self, new_contact: Contacts) -> None:
+    def create_schema(self) -> None:
+        self.__logger.info("Creating the PostgreSQL schema.")
+        Base.metadata.create_all(self.engine)
+
+    def ping(self) -> None:
+        with self.engine.connect() as connection:
+            connection.exec_driver_sql("SELECT 1")
+
+    def close(self) -> None:
+        self.engine.dispose()
+
+    def pool_status(self) -> PoolStatusResponse:
+        return self.pool_metrics.snapshot(self.engine.pool)
+
+    @DB_QUERY_SECONDS.time("insert_contact")
+    def insert_contact(self, new_contact: Contacts) -> ContactResponse:
         self.__logger.info("Inserting new contact into 'contacts' table in PostgreSQL.")
         db = self.SessionLocal()
         try:
-            db.add(new_contact)
+            inserted_contact = db.execute(insert_contact_statement(new_contact)).one()
             db.commit()
-            db.refresh(new_contact)
             self.__logger.info("Data has been successfully inserted into the 'contacts' table.")
-        except:
-            raise ContactAlreadyExist
+            contact_response: ContactResponse = ContactResponse.from_orm(inserted_contact)
+            return contact_response
+        except IntegrityError as error:
+            raise ContactAlreadyExist from error
         finally:
             db.close()
 
-    def get_contacts(self, limit_contacts_list: int) -> List[ContactResponse]:
+    @DB_QUERY_SECONDS.time("insert_contacts")
+    def insert_contacts(self, new_contacts: List[Dict[str, Any]]) -> List[str]:
+        self.__logger.info(f"Inserting {len(new_contacts)} contacts into 'contacts' table.")
+        db = self.SessionLocal()
+        try:
+            inserted_phone_numbers = db.scalars(insert_contacts_statement(), new_contacts).all()
+            db.commit()
+            self.__logger.info(
+                f"{len(inserted_phone_numbers)} contacts have been inserted, "
+                "the others already exist in the 'contacts' table."
+            )
+            return list(inserted_phone_numbers)
+        finally:
+            db.close()
+
+    @DB_QUERY_SECONDS.time("get_contacts")
+    def get_contacts(
+        self,
+        limit_contacts_list: int,
+        sort: ContactsSort = ContactsSort.PHONE_NUMBER,
+        after: Optional[Sequence[str]] = None,
+    ) -> Sequence[Row[Any]]:
         self.__logger.info("Get a list of contacts with pagination from 'contacts' table.")
         db = self.SessionLocal()
         try:
-            contacts_list = db.query(Contacts).limit(limit_contacts_list).all()
+            contacts_list = db.execute(
+                select_contacts_page_statement(limit_contacts_list, sort, after)
+            ).all()
             self.__logger.info(
                 "Successfully got a list of contacts with pagination from 'contacts' table."
             )
@@ -48,6 +121,74 @@ class PostgreSQLClient:
         finally:
             db.close()
 
+    @DB_QUERY_SECONDS.time("get_contacts_changes")
+    def get_contacts_changes(
+        self, after: int, limit: int, settle_seconds: float, include_deleted: bool = True
+    ) -> Sequence[Row[Any]]:
+        self.__logger.info(f"Get the contacts changed after {after} from 'contacts' table.")
+        db = self.SessionLocal()
+        try:
+            changes = db.execute(
+                select_contacts_changes_statement(after, limit, settle_seconds, include_deleted)
+            ).all()
+            self.__logger.info(f"Successfully got {len(changes)} contact changes.")
+            return changes
+        finally:
+            db.close()
+
+    @DB_QUERY_SECONDS.time("search_contacts")
+    def search_contacts(
+        self, search_query: ContactSearchQuery, limit: int, offset: int = 0
+    ) -> Sequence[Row[Any]]:
+        self.__logger.info("Search contacts in 'contacts' table.")
+        db = self.SessionLocal()
+        try:
+            contacts_list = db.execute(search_contacts_statement(search_query, limit, offset)).all()
+            self.__logger.info("Successfully searched contacts in 'contacts' table.")
+            return contacts_list
+        finally:
+            db.close()
+
+    @DB_QUERY_SECONDS.time("get_contacts_by_phone_numbers")
+    def get_contacts_by_phone_numbers(self, phone_numbers: Sequence[str]) -> Sequence[Row[Any]]:
+        self.__logger.info(f"Get {len(phone_numbers)} contacts from 'contacts' table.")
+        db = self.SessionLocal()
+        try:
+            contacts_list = db.execute(
+                select_contacts_by_phone_numbers_statement(phone_numbers)
+            ).all()
+            self.__logger.info(
+                f"Successfully got {len(contacts_list)} contacts from 'contacts' table."
+            )
+            return contacts_list
+        finally:
+            db.close()
+
+    def stream_contacts(self, batch_size: int) -> Iterator[Sequence[Row[Any]]]:
+        """Yield all contacts in batches, read through a server-side cursor."""
+        self.__logger.info("Stream all contacts from 'contacts' table.")
+        db = self.SessionLocal()
+        try:
+            result = db.execute(select_contacts_statement().execution_options(yield_per=batch_size))
+            yield from result.partitions()
+            self.__logger.info("Successfully streamed all contacts from 'contacts' table.")
+        finally:
+            db.close()
+
+    def stream_phone_numbers(self, batch_size: int) -> Iterator[Sequence[str]]:
+        """Yield all phone numbers in batches, read through a server-side cursor."""
+        self.__logger.info("Stream all phone numbers from 'contacts' table.")
+        db = self.SessionLocal()
+        try:
+            result = db.scalars(
+                select_phone_numbers_statement().execution_options(yield_per=batch_size)
+            )
+            yield from result.partitions()
+            self.__logger.info("Successfully streamed all phone numbers from 'contacts' table.")
+        finally:
+            db.close()
+
+    @DB_QUERY_SECONDS.time("get_contact")
     def get_contact(self, contact_phone_number: str) -> ContactResponse:
         self.__logger.info("Get contact from 'contacts' table.")
         db = self.SessionLocal()
@@ -60,26 +201,39 @@ class PostgreSQLClient:
         finally:
             db.close()
 
-    def update_contact(self, contact_phone_number: str, contact_data: ContactResponse) -> None:
+    @DB_QUERY_SECONDS.time("update_contact")
+    def update_contact(
+        self, contact_phone_number: str, contact_values: Dict[str, Any]
+    ) -> ContactResponse:
         self.__logger.info("Update contact on 'contacts' table.")
         db = self.SessionLocal()
         try:
-            db.query(Contacts).filter_by(phone_number=contact_phone_number).update(
-                contact_data.__dict__
-            )
+            updated_contact = db.execute(
+                update_contact_statement(contact_phone_number, contact_values)
+            ).one_or_none()
+            # A new phone number deletes the old one from the devices that synced it
+            if updated_contact is not None and updated_contact.phone_number != contact_phone_number:
+                db.execute(insert_tombstone_statement(contact_phone_number))
             db.commit()
-            self.__logger.info("Successfully updated contact on 'contacts' table.")
-        except:
-            raise ContactAlreadyExist
+        except IntegrityError as error:
+            raise ContactAlreadyExist from error
         finally:
             db.close()
+        if updated_contact is None:
+            raise ContactNotFoundError
+        self.__logger.info("Successfully updated contact on 'contacts' table.")
+        contact_response: ContactResponse = ContactResponse.from_orm(updated_contact)
+        return contact_response
 
-    def delete_contact(self, contact_phone_number: str):
+    @DB_QUERY_SECONDS.time("delete_contact")
+    def delete_contact(self, contact_phone_number: str) -> bool:
+        """Delete the contact, returning whether it existed."""
         self.__logger.info("Delete contact from 'contacts' table.")
         db = self.SessionLocal()
         try:
-            db.query(Contacts).filter_by(phone_number=contact_phone_number).delete()
+            result = db.execute(delete_contact_statement(contact_phone_number))
             db.commit()
             self.__logger.info("Successfully removed contact from 'contacts' table.")
+            return bool(result.rowcount)
         finally:
             db.close()
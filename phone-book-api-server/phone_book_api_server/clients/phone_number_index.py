@@ -0,0 +1,252 @@
+"""In-memory index of every phone number, for autocomplete without a database round-trip."""
+
+import re
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, insort
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from phone_book_api_server.data_models.phone_number_index import PhoneNumberIndexStatsResponse
+
+E164_MAX_DIGITS = 15
+E164_NUMBER_PATTERN = re.compile(r"^\+\d{1,15}$")
+# Digit d is stored as d + 1, so the 0 padding of a short number sorts before every digit
+KEY_BASE = 11
+# Writes wait in small sorted lists until this many are merged into the array at once
+MERGE_THRESHOLD = 65536
+
+
+def encode_phone_number(phone_number: str) -> Optional[int]:
+    """Pack an E.164 number into one 64-bit key, in the lexicographic order of the numbers."""
+    if not E164_NUMBER_PATTERN.match(phone_number):
+        return None
+    key = 0
+    for digit in phone_number[1:]:
+        key = key * KEY_BASE + int(digit) + 1
+    padding: int = KEY_BASE ** (E164_MAX_DIGITS - len(phone_number) + 1)
+    return key * padding
+
+
+def decode_phone_number(key: int) -> str:
+    digits = []
+    for _ in range(E164_MAX_DIGITS):
+        key, digit = divmod(key, KEY_BASE)
+        if digit:
+            digits.append(str(digit - 1))
+    return "+" + "".join(reversed(digits))
+
+
+def get_prefix_range(digits: str) -> Optional[Tuple[int, int]]:
+    """The [lower, upper) range of the keys of the numbers starting with these digits."""
+    lower_key = encode_phone_number("+" + digits)
+    if lower_key is None:
+        return None
+    return lower_key, lower_key + KEY_BASE ** (E164_MAX_DIGITS - len(digits))
+
+
+class PhoneNumberIndexLoader:
+    """Builds the sorted keys of an index from batches of phone numbers."""
+
+    def __init__(self, phone_number_index: "PhoneNumberIndex") -> None:
+        self.__phone_number_index = phone_number_index
+        self.__keys = array("Q")
+        self.__is_sorted = True
+        self.__started_at = time.perf_counter()
+
+    def add_batch(self, phone_numbers: Iterable[str]) -> None:
+        for phone_number in phone_numbers:
+            key = encode_phone_number(phone_number)
+            if key is None:
+                continue
+            if self.__keys and key < self.__keys[-1]:
+                self.__is_sorted = False
+            self.__keys.append(key)
+
+    def finish(self) -> None:
+        keys = self.__keys if self.__is_sorted else array("Q", sorted(self.__keys))
+        self.__phone_number_index.replace(keys, time.perf_counter() - self.__started_at)
+
+
+class PhoneNumberIndex:
+    """Every phone number as a 64-bit key in one sorted array, 8 bytes per number.
+
+    Writes go to sorted lists of additions and removals, merged into a new array in bulk by a
+    background thread, so a write never shifts nor copies the whole array. The writes made
+    while a merge or a load runs are logged and replayed on the array it swaps in.
+    """
+
+    def __init__(self, merge_threshold: int = MERGE_THRESHOLD) -> None:
+        self.merge_threshold = merge_threshold
+        self.__lock = threading.Lock()
+        self.__keys = array("Q")
+        self.__added: List[int] = []
+        self.__removed: List[int] = []
+        # (key, added) of the writes made since a merge or a load started, None when idle
+        self.__merge_log: Optional[List[Tuple[int, bool]]] = None
+        self.__load_log: Optional[List[Tuple[int, bool]]] = None
+        self.__merge_thread: Optional[threading.Thread] = None
+        self.loaded = False
+        self.load_seconds: Optional[float] = None
+
+    def start_load(self) -> PhoneNumberIndexLoader:
+        with self.__lock:
+            self.__load_log = []
+        return PhoneNumberIndexLoader(self)
+
+    def replace(self, keys: "array[int]", load_seconds: float) -> None:
+        with self.__lock:
+            self.__keys = keys
+            self.__added = []
+            self.__removed = []
+            # The writes made during the load may or may not be in the loaded keys
+            for key, added in self.__load_log or ():
+                self.__apply(key, added)
+            self.__load_log = None
+            self.loaded = True
+            self.load_seconds = load_seconds
+
+    def add(self, *phone_numbers: str) -> None:
+        self.__write(phone_numbers, added=True)
+
+    def remove(self, *phone_numbers: str) -> None:
+        self.__write(phone_numbers, added=False)
+
+    def merge(self) -> None:
+        """Merge the pending writes into a new array, swapped in once it is built."""
+        with self.__lock:
+            if self.__merge_log is not None:
+                return
+            keys, added, removed = self.__keys, list(self.__added), list(self.__removed)
+            self.__merge_log = []
+        merged_keys = merge_keys(keys, added, removed)
+        with self.__lock:
+            # A load replacing the keys meanwhile makes this merge moot
+            if self.__keys is keys:
+                self.__keys = merged_keys
+                self.__added = []
+                self.__removed = []
+                for key, key_added in self.__merge_log:
+                    self.__apply(key, key_added)
+            self.__merge_log = None
+
+    def wait_for_merge(self, timeout: Optional[float] = None) -> None:
+        merge_thread = self.__merge_thread
+        if merge_thread is not None:
+            merge_thread.join(timeout)
+
+    def search(self, digits: str, limit: int) -> Tuple[List[str], int]:
+        """The first phone numbers starting with these digits, and how many there are."""
+        prefix_range = get_prefix_range(digits)
+        if prefix_range is None:
+            return [], 0
+        lower_key, upper_key = prefix_range
+        with self.__lock:
+            start = bisect_left(self.__keys, lower_key)
+            end = bisect_left(self.__keys, upper_key)
+            added_start = bisect_left(self.__added, lower_key)
+            added_end = bisect_left(self.__added, upper_key)
+            removed_count = bisect_left(self.__removed, upper_key) - bisect_left(
+                self.__removed, lower_key
+            )
+            total = end - start - removed_count + added_end - added_start
+            keys = self.__first_keys(start, end, added_start, added_end, limit)
+        return [decode_phone_number(key) for key in keys], total
+
+    def stats(self) -> PhoneNumberIndexStatsResponse:
+        with self.__lock:
+            size = len(self.__keys) - len(self.__removed) + len(self.__added)
+            memory_bytes = (
+                sys.getsizeof(self.__keys)
+                + sys.getsizeof(self.__added)
+                + sum(sys.getsizeof(key) for key in self.__added)
+                + sys.getsizeof(self.__removed)
+                + sum(sys.getsizeof(key) for key in self.__removed)
+            )
+            return PhoneNumberIndexStatsResponse(
+                loaded=self.loaded,
+                size=size,
+                memory_bytes=memory_bytes,
+                bytes_per_number=memory_bytes / size if size else None,
+                pending_writes=len(self.__added) + len(self.__removed),
+                load_seconds=self.load_seconds,
+            )
+
+    def __write(self, phone_numbers: Iterable[str], added: bool) -> None:
+        with self.__lock:
+            for phone_number in phone_numbers:
+                key = encode_phone_number(phone_number)
+                if key is None:
+                    continue
+                self.__apply(key, added)
+                for write_log in (self.__merge_log, self.__load_log):
+                    if write_log is not None:
+                        write_log.append((key, added))
+            if (
+                len(self.__added) + len(self.__removed) >= self.merge_threshold
+                and self.__merge_log is None
+                and self.__load_log is None
+            ):
+                self.__merge_thread = threading.Thread(
+                    target=self.merge, name="phone-number-index-merge", daemon=True
+                )
+                self.__merge_thread.start()
+
+    def __apply(self, key: int, added: bool) -> None:
+        if added:
+            if _sorted_contains(self.__removed, key):
+                _sorted_discard(self.__removed, key)
+            elif not _sorted_contains(self.__added, key) and not _sorted_contains(self.__keys, key):
+                insort(self.__added, key)
+        elif _sorted_contains(self.__added, key):
+            _sorted_discard(self.__added, key)
+        elif _sorted_contains(self.__keys, key) and not _sorted_contains(self.__removed, key):
+            insort(self.__removed, key)
+
+    def __first_keys(
+        self, start: int, end: int, added_start: int, added_end: int, limit: int
+    ) -> List[int]:
+        keys: List[int] = []
+        while len(keys) < limit and (start < end or added_start < added_end):
+            if added_start < added_end and (
+                start >= end or self.__added[added_start] < self.__keys[start]
+            ):
+                keys.append(self.__added[added_start])
+                added_start += 1
+                continue
+            key = self.__keys[start]
+            start += 1
+            if not _sorted_contains(self.__removed, key):
+                keys.append(key)
+        return keys
+
+
+def _sorted_contains(keys: Sequence[int], key: int) -> bool:
+    position = bisect_left(keys, key)
+    return position < len(keys) and keys[position] == key
+
+
+def _sorted_discard(keys: List[int], key: int) -> None:
+    del keys[bisect_left(keys, key)]
+
+
+def merge_keys(keys: "array[int]", added: List[int], removed: List[int]) -> "array[int]":
+    """The sorted keys without the removed ones and with the added ones, both sorted."""
+    # Copy the runs between the changed positions with C-speed slices
+    kept_keys = array("Q")
+    position = 0
+    for removed_key in removed:
+        removed_position = bisect_left(keys, removed_key, position)
+        kept_keys.extend(keys[position:removed_position])
+        position = removed_position + 1
+    kept_keys.extend(keys[position:])
+    merged_keys = array("Q")
+    position = 0
+    for added_key in added:
+        added_position = bisect_left(kept_keys, added_key, position)
+        merged_keys.extend(kept_keys[position:added_position])
+        merged_keys.append(added_key)
+        position = added_position
+    merged_keys.extend(kept_keys[position:])
+    return merged_keys
@@ -0,0 +1,152 @@
+"""Connection pool configuration and metrics shared by the PostgreSQL clients."""
+
+import os
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional, cast
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from phone_book_api_server.data_models.pool import PoolStatusResponse
+
+DEFAULT_POOL_CONFIG: Dict[str, Any] = {
+    "size": 5,
+    "max_overflow": 10,
+    "timeout": 30,
+    "pre_ping": False,
+    "recycle": -1,
+}
+
+
+def get_engine_pool_options(pool_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Translate the `database.pool` config section into `create_engine` keyword arguments."""
+    options = {**DEFAULT_POOL_CONFIG, **(pool_config or {})}
+    return {
+        "pool_size": int(options["size"]),
+        "max_overflow": int(options["max_overflow"]),
+        "pool_timeout": float(options["timeout"]),
+        "pool_pre_ping": bool(options["pre_ping"]),
+        "pool_recycle": int(options["recycle"]),
+    }
+
+
+class PoolMetrics:
+    """Thread safe counters fed by SQLAlchemy pool events."""
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.checkouts = 0
+        self.connections_opened = 0
+        self.invalidations = 0
+        self.waits = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.timeouts = 0
+
+    def on_connect(self, *_: Any) -> None:
+        with self.__lock:
+            self.connections_opened += 1
+
+    def on_checkout(self, *_: Any) -> None:
+        with self.__lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def on_checkin(self, *_: Any) -> None:
+        with self.__lock:
+            self.checked_out = max(self.checked_out - 1, 0)
+
+    def on_invalidate(self, *_: Any) -> None:
+        with self.__lock:
+            self.invalidations += 1
+
+    def record_wait(self, wait_time: float) -> None:
+        with self.__lock:
+            self.waits += 1
+            self.wait_time_total += wait_time
+            self.wait_time_max = max(self.wait_time_max, wait_time)
+
+    def record_timeout(self) -> None:
+        with self.__lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool: Pool) -> PoolStatusResponse:
+        with self.__lock:
+            return PoolStatusResponse(
+                pool_size=pool.size() if isinstance(pool, QueuePool) else 0,
+                checked_out=self.checked_out,
+                peak_checked_out=self.peak_checked_out,
+                overflow=pool.overflow() if isinstance(pool, QueuePool) else 0,
+                checkouts=self.checkouts,
+                connections_opened=self.connections_opened,
+                invalidations=self.invalidations,
+                wait_time_total=self.wait_time_total,
+                wait_time_max=self.wait_time_max,
+                wait_time_avg=self.wait_time_total / self.waits if self.waits else 0.0,
+                timeouts=self.timeouts,
+            )
+
+
+class _TimedPoolMixin:
+    """Measures how long each checkout waits for a free connection."""
+
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self) -> Any:
+        start_time = time.perf_counter()
+        try:
+            return super()._do_get()  # type: ignore[misc]
+        except exc.TimeoutError:
+            if self.metrics:
+                self.metrics.record_timeout()
+            raise
+        finally:
+            if self.metrics:
+                self.metrics.record_wait(time.perf_counter() - start_time)
+
+    def recreate(self) -> QueuePool:
+        pool = super().recreate()  # type: ignore[misc]
+        pool.metrics = self.metrics
+        return cast(QueuePool, pool)
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    """QueuePool recording checkout wait times and timeouts."""
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool recording checkout wait times and timeouts."""
+
+
+def instrument_engine(engine: Engine, metrics: PoolMetrics) -> None:
+    """Feed `metrics` from the pool events of a (sync) engine."""
+    if isinstance(engine.pool, _TimedPoolMixin):
+        engine.pool.metrics = metrics
+    event.listen(engine, "connect", metrics.on_connect)
+    event.listen(engine, "checkout", metrics.on_checkout)
+    event.listen(engine, "checkin", metrics.on_checkin)
+    event.listen(engine, "invalidate", metrics.on_invalidate)
+
+
+def dispose_after_fork(engine: Engine) -> None:
+    """Give a forked worker a pool of its own, instead of the connections of its parent.
+
+    The pooled connections are dropped in the child without being closed, so the sockets
+    the parent keeps using stay open; the child opens new ones on demand.
+    """
+    if not hasattr(os, "register_at_fork"):
+        return
+    engine_reference = weakref.ref(engine)
+
+    def reset_pool() -> None:
+        forked_engine = engine_reference()
+        if forked_engine is not None:
+            forked_engine.dispose(close=False)
+
+    os.register_at_fork(after_in_child=reset_pool)
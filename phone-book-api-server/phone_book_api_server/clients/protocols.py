@@ -0,0 +1,88 @@
+"""The database client each contact service reads and writes through, one per flavour."""
+
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Protocol, Sequence
+
+from sqlalchemy import Row
+
+from phone_book_api_server.data_models.contacts import (
+    ContactResponse,
+    ContactSearchQuery,
+    ContactsSort,
+)
+from phone_book_api_server.database.models import Contacts
+
+
+class ContactsDBClient(Protocol):
+    """The blocking client of ContactService, served from the threadpool."""
+
+    def insert_contact(self, new_contact: Contacts) -> ContactResponse: ...
+
+    def insert_contacts(self, new_contacts: List[Dict[str, Any]]) -> List[str]: ...
+
+    def get_contacts(
+        self,
+        limit_contacts_list: int,
+        sort: ContactsSort = ContactsSort.PHONE_NUMBER,
+        after: Optional[Sequence[str]] = None,
+    ) -> Sequence[Row[Any]]: ...
+
+    def get_contacts_changes(
+        self, after: int, limit: int, settle_seconds: float, include_deleted: bool = True
+    ) -> Sequence[Row[Any]]: ...
+
+    def search_contacts(
+        self, search_query: ContactSearchQuery, limit: int, offset: int = 0
+    ) -> Sequence[Row[Any]]: ...
+
+    def get_contacts_by_phone_numbers(self, phone_numbers: Sequence[str]) -> Sequence[Row[Any]]: ...
+
+    def stream_contacts(self, batch_size: int) -> Iterator[Sequence[Row[Any]]]: ...
+
+    def stream_phone_numbers(self, batch_size: int) -> Iterator[Sequence[str]]: ...
+
+    def get_contact(self, contact_phone_number: str) -> ContactResponse: ...
+
+    def update_contact(
+        self, contact_phone_number: str, contact_values: Dict[str, Any]
+    ) -> ContactResponse: ...
+
+    def delete_contact(self, contact_phone_number: str) -> bool: ...
+
+
+class AsyncContactsDBClient(Protocol):
+    """The asyncio client of AsyncContactService, awaited on the event loop."""
+
+    async def insert_contact(self, new_contact: Contacts) -> ContactResponse: ...
+
+    async def insert_contacts(self, new_contacts: List[Dict[str, Any]]) -> List[str]: ...
+
+    async def get_contacts(
+        self,
+        limit_contacts_list: int,
+        sort: ContactsSort = ContactsSort.PHONE_NUMBER,
+        after: Optional[Sequence[str]] = None,
+    ) -> Sequence[Row[Any]]: ...
+
+    async def get_contacts_changes(
+        self, after: int, limit: int, settle_seconds: float, include_deleted: bool = True
+    ) -> Sequence[Row[Any]]: ...
+
+    async def search_contacts(
+        self, search_query: ContactSearchQuery, limit: int, offset: int = 0
+    ) -> Sequence[Row[Any]]: ...
+
+    async def get_contacts_by_phone_numbers(
+        self, phone_numbers: Sequence[str]
+    ) -> Sequence[Row[Any]]: ...
+
+    def stream_contacts(self, batch_size: int) -> AsyncIterator[Sequence[Row[Any]]]: ...
+
+    def stream_phone_numbers(self, batch_size: int) -> AsyncIterator[Sequence[str]]: ...
+
+    async def get_contact(self, contact_phone_number: str) -> ContactResponse: ...
+
+    async def update_contact(
+        self, contact_phone_number: str, contact_values: Dict[str, Any]
+    ) -> ContactResponse: ...
+
+    async def delete_contact(self, contact_phone_number: str) -> bool: ...
@@ -0,0 +1,185 @@
+"""Contact cache shared by every worker through a Redis server."""
+
+import json
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import redis
+from pydantic.json import pydantic_encoder
+
+from phone_book_api_server.clients.contact_cache import ContactCache
+from phone_book_api_server.data_models.cache import CacheStatsResponse
+from phone_book_api_server.data_models.contacts import ContactResponse
+
+
+def encode_contact(contact: ContactResponse) -> str:
+    """The JSON of a cached contact, with the version fields left out of its responses."""
+    return json.dumps(
+        {**contact.dict(), "version": contact.version, "updated_at": contact.updated_at},
+        default=pydantic_encoder,
+    )
+
+
+class RedisContactCache(ContactCache):
+    """Contacts cached as JSON in Redis, expired by the server after the time to live.
+
+    A Redis outage degrades to cache misses instead of failing the lookups.
+    """
+
+    is_remote = True
+
+    def __init__(
+        self, redis_client: redis.Redis, ttl: float = 60, key_prefix: str = "contact:"
+    ) -> None:
+        self.__logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.__redis = redis_client
+        self.ttl = ttl
+        self.key_prefix = key_prefix
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, phone_number: str) -> Optional[ContactResponse]:
+        try:
+            cached_contact = self.__redis.get(self.key_prefix + phone_number)
+        except redis.RedisError as error:
+            self.__logger.warning(f"Failed to read contact {phone_number} from redis: {error}")
+            cached_contact = None
+        with self.__lock:
+            if cached_contact is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        contact: ContactResponse = ContactResponse.parse_raw(cached_contact)
+        return contact
+
+    def get_many(self, phone_numbers: Iterable[str]) -> Dict[str, ContactResponse]:
+        # One MGET round-trip for the whole batch
+        phone_numbers = list(phone_numbers)
+        if not phone_numbers:
+            return {}
+        try:
+            cached_contacts = self.__redis.mget(
+                [self.key_prefix + phone_number for phone_number in phone_numbers]
+            )
+        except redis.RedisError as error:
+            self.__logger.warning(
+                f"Failed to read {len(phone_numbers)} contacts from redis: {error}"
+            )
+            cached_contacts = [None] * len(phone_numbers)
+        contacts = {
+            phone_number: ContactResponse.parse_raw(cached_contact)
+            for phone_number, cached_contact in zip(phone_numbers, cached_contacts)
+            if cached_contact is not None
+        }
+        with self.__lock:
+            self.hits += len(contacts)
+            self.misses += len(phone_numbers) - len(contacts)
+        return contacts
+
+    def get_generations(self, phone_numbers: Iterable[str]) -> Dict[str, int]:
+        phone_numbers = list(phone_numbers)
+        if not phone_numbers:
+            return {}
+        try:
+            generations = self.__redis.mget(self.__generation_keys(phone_numbers))
+        except redis.RedisError as error:
+            self.__logger.warning(
+                f"Failed to read the generations of {len(phone_numbers)} contacts: {error}"
+            )
+            # Matches no stored generation, so the contacts read now are not cached
+            return dict.fromkeys(phone_numbers, -1)
+        return {
+            phone_number: int(generation or 0)
+            for phone_number, generation in zip(phone_numbers, generations)
+        }
+
+    def set(
+        self, phone_number: str, contact: ContactResponse, generation: Optional[int] = None
+    ) -> None:
+        if generation is not None:
+            self.set_many({phone_number: contact}, {phone_number: generation})
+            return
+        try:
+            self.__redis.set(
+                self.key_prefix + phone_number, encode_contact(contact), px=int(self.ttl * 1000)
+            )
+        except redis.RedisError as error:
+            self.__logger.warning(f"Failed to cache contact {phone_number} in redis: {error}")
+
+    def set_many(
+        self, contacts: Dict[str, ContactResponse], generations: Optional[Dict[str, int]] = None
+    ) -> None:
+        if not contacts:
+            return
+        try:
+            with self.__redis.pipeline() as pipeline:
+                if generations is not None:
+                    contacts = self.__watch_unchanged(pipeline, contacts, generations)
+                    pipeline.multi()
+                for phone_number, contact in contacts.items():
+                    pipeline.set(
+                        self.key_prefix + phone_number,
+                        encode_contact(contact),
+                        px=int(self.ttl * 1000),
+                    )
+                pipeline.execute()
+        except redis.WatchError:
+            # A write invalidated one of the contacts after we compared the generations
+            return
+        except redis.RedisError as error:
+            self.__logger.warning(f"Failed to cache {len(contacts)} contacts in redis: {error}")
+
+    def delete(self, *phone_numbers: str) -> None:
+        if not phone_numbers:
+            return
+        # Bumping the generations in the same transaction stops the reads in flight caching
+        # the rows this write replaced
+        pipeline = self.__redis.pipeline()
+        pipeline.delete(*(self.key_prefix + phone_number for phone_number in phone_numbers))
+        for generation_key in self.__generation_keys(phone_numbers):
+            pipeline.incr(generation_key)
+            pipeline.pexpire(generation_key, int(self.ttl * 1000))
+        try:
+            deleted, *_ = pipeline.execute()
+        except redis.RedisError as error:
+            self.__logger.error(f"Failed to invalidate contacts {phone_numbers} in redis: {error}")
+            return
+        with self.__lock:
+            self.invalidations += deleted
+
+    def stats(self) -> CacheStatsResponse:
+        # Size, evictions and expirations are tracked by the redis server itself
+        with self.__lock:
+            return CacheStatsResponse(
+                ttl=self.ttl,
+                hits=self.hits,
+                misses=self.misses,
+                invalidations=self.invalidations,
+            )
+
+    def close(self) -> None:
+        self.__redis.close()
+
+    def __generation_keys(self, phone_numbers: Iterable[str]) -> List[str]:
+        return [f"{self.key_prefix}generation:{phone_number}" for phone_number in phone_numbers]
+
+    def __watch_unchanged(
+        self,
+        pipeline: redis.client.Pipeline,
+        contacts: Dict[str, ContactResponse],
+        generations: Dict[str, int],
+    ) -> Dict[str, ContactResponse]:
+        """Watch the generations of the contacts, and keep the ones no write invalidated."""
+        generation_keys = self.__generation_keys(contacts)
+        pipeline.watch(*generation_keys)  # type: ignore[no-untyped-call]
+        current_generations = pipeline.mget(generation_keys)
+        return {
+            phone_number: contact
+            for (phone_number, contact), current_generation in zip(
+                contacts.items(), current_generations
+            )
+            if int(current_generation or 0) == generations[phone_number]
+        }
@@ -13,5 +13,6 @@ class SETTINGS:
     ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
     CONFIG = get_from_env("CONFIG", os.path.join(ROOT_DIR, "config.yaml"))
     DATABASE_URL = os.getenv("DATABASE_URL")
+    ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
     NAME = "PHONE BOOK API SERVER"
     VERSION = "0.1.0"
@@ -1,9 +1,29 @@
+import importlib
 import logging.config
+from typing import Any, Callable
 
 from dependency_injector import containers, providers
 
+from phone_book_api_server.clients.contact_cache import InMemoryContactCache
 from phone_book_api_server.clients.db_client import PostgreSQLClient
+from phone_book_api_server.clients.phone_number_index import PhoneNumberIndex
+from phone_book_api_server.profiling import ProfileStore
+from phone_book_api_server.readiness import Readiness
 from phone_book_api_server.services.contact_service import ContactService
+from phone_book_api_server.services.single_flight import AsyncSingleFlight, SingleFlight
+
+
+def lazy(import_path: str) -> Callable[..., Any]:
+    """Call the class or function at `import_path`, importing its module on the first call.
+
+    Redis and the asyncio client are only imported by the workers configured to use them.
+    """
+
+    def create(*args: Any, **kwargs: Any) -> Any:
+        module_name, _, name = import_path.rpartition(".")
+        return getattr(importlib.import_module(module_name), name)(*args, **kwargs)
+
+    return create
 
 
 class Container(containers.DeclarativeContainer):
@@ -13,5 +33,103 @@ class Container(containers.DeclarativeContainer):
         logging.config.dictConfig,
         config=config.logging,
     )
-    db_client = providers.Singleton(PostgreSQLClient)
-    contact_service = providers.Singleton(ContactService, db_client)
+    db_client = providers.Selector(
+        config.database.client,
+        sync=providers.Singleton(PostgreSQLClient, pool_config=config.database.pool),
+        asyncio=providers.Singleton(
+            lazy("phone_book_api_server.clients.async_db_client.AsyncPostgreSQLClient"),
+            pool_config=config.database.pool,
+        ),
+    )
+    redis_client = providers.Singleton(lazy("redis.Redis.from_url"), config.cache.redis.url)
+    backend_contact_cache = providers.Selector(
+        config.cache.backend,
+        memory=providers.Singleton(
+            InMemoryContactCache,
+            max_size=config.cache.max_size.as_int(),
+            ttl=config.cache.ttl.as_float(),
+        ),
+        redis=providers.Singleton(
+            lazy("phone_book_api_server.clients.redis_contact_cache.RedisContactCache"),
+            redis_client,
+            ttl=config.cache.ttl.as_float(),
+            key_prefix=config.cache.redis.key_prefix,
+        ),
+    )
+    cache_invalidation_broker = providers.Selector(
+        config.cache.invalidation,
+        local=providers.Singleton(
+            lazy("phone_book_api_server.clients.cache_invalidation.InProcessInvalidationBroker")
+        ),
+        redis=providers.Singleton(
+            lazy("phone_book_api_server.clients.cache_invalidation.RedisInvalidationBroker"),
+            redis_client,
+            channel=config.cache.redis.channel,
+        ),
+    )
+    contact_cache = providers.Selector(
+        config.cache.invalidation,
+        none=backend_contact_cache,
+        local=providers.Singleton(
+            lazy("phone_book_api_server.clients.cache_invalidation.BroadcastContactCache"),
+            backend_contact_cache,
+            cache_invalidation_broker,
+        ),
+        redis=providers.Singleton(
+            lazy("phone_book_api_server.clients.cache_invalidation.BroadcastContactCache"),
+            backend_contact_cache,
+            cache_invalidation_broker,
+        ),
+    )
+    local_phone_number_index = providers.Singleton(PhoneNumberIndex)
+    phone_number_index = providers.Selector(
+        config.autocomplete.index,
+        none=providers.Object(None),
+        memory=providers.Selector(
+            config.cache.invalidation,
+            none=local_phone_number_index,
+            # A process has a single index, its writes already reach it
+            local=local_phone_number_index,
+            # On a channel of its own, the cache invalidations do not tell adds from removes
+            redis=providers.Singleton(
+                lazy("phone_book_api_server.clients.cache_invalidation.BroadcastPhoneNumberIndex"),
+                local_phone_number_index,
+                providers.Singleton(
+                    lazy(
+                        "phone_book_api_server.clients.cache_invalidation"
+                        ".RedisInvalidationBroker"
+                    ),
+                    redis_client,
+                    channel=config.cache.redis.phone_numbers_channel,
+                ),
+            ),
+        ),
+    )
+    contact_lookups = providers.Selector(
+        config.database.client,
+        sync=providers.Singleton(SingleFlight),
+        asyncio=providers.Singleton(AsyncSingleFlight),
+    )
+    readiness = providers.Singleton(Readiness)
+    profile_store = providers.Singleton(
+        ProfileStore, max_profiles=config.profiling.max_profiles.as_int()
+    )
+    contact_service = providers.Selector(
+        config.database.client,
+        sync=providers.Singleton(
+            ContactService,
+            db_client,
+            contact_cache,
+            phone_number_index,
+            contact_lookups,
+            fast_serialization=config.serialization.fast_json,
+        ),
+        asyncio=providers.Singleton(
+            lazy("phone_book_api_server.services.async_contact_service.AsyncContactService"),
+            db_client,
+            contact_cache,
+            phone_number_index,
+            contact_lookups,
+            fast_serialization=config.serialization.fast_json,
+        ),
+    )
@@ -0,0 +1,20 @@
+from typing import Optional
+
+from pydantic import Field
+
+from phone_book_api_server.data_models.base import SharedBaseModel
+
+
+class CacheStatsResponse(SharedBaseModel):
+    size: Optional[int] = Field(description="The number of cached contacts, if known")
+    max_size: Optional[int] = Field(description="The most contacts the cache holds, if bounded")
+    ttl: float = Field(description="The seconds a cached contact stays fresh")
+    hits: int = Field(description="The lookups served from the cache")
+    misses: int = Field(description="The lookups that went to the database")
+    evictions: Optional[int] = Field(
+        description="The least recently used contacts dropped for space, if known"
+    )
+    expirations: Optional[int] = Field(
+        description="The contacts dropped after their time to live, if known"
+    )
+    invalidations: int = Field(description="The contacts dropped because they were changed")
@@ -1,4 +1,6 @@
-from typing import Optional
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional, Type
 
 from pydantic import Field
 
@@ -20,13 +22,98 @@ class ContactResponse(SharedBaseModel):
     last_name: str = Field(description="The last name of the contact")
     phone_number: str = Field(description="The phone number of the contact")
     email_address: Optional[str] = Field(description="The mail adress of the contact")
+    # Sent as the ETag and Last-Modified headers, not in the body
+    version: Optional[int] = Field(None, exclude=True, description="Bumped by every update")
+    updated_at: Optional[datetime] = Field(None, exclude=True, description="The last update")
 
     class Config:
         orm_mode = True
 
+        @staticmethod
+        def schema_extra(schema: Dict[str, Any], _: Type["ContactResponse"]) -> None:
+            for excluded_field in ("version", "updatedAt"):
+                schema["properties"].pop(excluded_field, None)
+
 
 class UpdateContactRequest(SharedBaseModel):
     first_name: Optional[str] = Field(description="The first name of the contact")
     last_name: Optional[str] = Field(description="The last name of the contact")
     phone_number: Optional[str] = Field(description="The phone number of the contact")
     email_address: Optional[str] = Field(description="The mail adress of the contact")
+
+
+class ImportRowStatus(str, Enum):
+    ACCEPTED = "accepted"
+    REJECTED = "rejected"
+    DUPLICATE = "duplicate"
+
+
+class ImportRowResult(SharedBaseModel):
+    row: int = Field(description="The 1-based position of the row in the payload")
+    phone_number: Optional[str] = Field(description="The phone number of the row, if any")
+    status: ImportRowStatus = Field(description="What happened to the row")
+    detail: Optional[str] = Field(description="Why the row was rejected")
+
+
+class ImportContactsResponse(SharedBaseModel):
+    accepted: int = Field(description="The number of contacts inserted")
+    rejected: int = Field(description="The number of rows that failed validation")
+    duplicates: int = Field(description="The number of rows whose phone number already exists")
+    rows: List[ImportRowResult] = Field(description="The outcome of every row, in payload order")
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+    MSGPACK = "msgpack"
+
+
+class ContactsSort(str, Enum):
+    PHONE_NUMBER = "phone_number"
+    NAME = "name"
+
+
+class ContactSearchQuery(SharedBaseModel):
+    phone_prefix: Optional[str] = Field(description="The E.164 prefix of the phone numbers")
+    name: Optional[str] = Field(description="The prefix of a first or last name")
+    fuzzy: bool = Field(False, description="Whether to also match similarly spelled names")
+
+
+class ContactsPageResponse(SharedBaseModel):
+    contacts: List[ContactResponse] = Field(description="The contacts of this page")
+    next_cursor: Optional[str] = Field(
+        description="Pass as `cursor` to get the next page, null on the last page"
+    )
+
+
+class ContactsChangesResponse(SharedBaseModel):
+    contacts: List[ContactResponse] = Field(
+        description="The contacts inserted or updated since the token, in change order"
+    )
+    deleted: List[str] = Field(description="The phone numbers deleted since the token")
+    next_token: str = Field(description="Pass as `since` to get the changes after this page")
+    has_more: bool = Field(description="Whether more changes wait past this page")
+
+
+class ContactsSearchResponse(SharedBaseModel):
+    contacts: List[ContactResponse] = Field(description="The matching contacts, best first")
+    next_offset: Optional[int] = Field(
+        description="Pass as `offset` to get the next page, null on the last page"
+    )
+
+
+class AutocompleteResponse(SharedBaseModel):
+    phone_numbers: List[str] = Field(description="The first phone numbers with the prefix")
+    total: int = Field(description="How many phone numbers have the prefix")
+
+
+class LookupContactsRequest(SharedBaseModel):
+    phone_numbers: List[str] = Field(description="The phone numbers to resolve")
+
+
+class LookupContactsResponse(SharedBaseModel):
+    contacts: Dict[str, ContactResponse] = Field(
+        description="The contacts found, keyed by the phone numbers as they were requested"
+    )
+    missing: List[str] = Field(description="The valid phone numbers of no contact")
+    invalid: List[str] = Field(description="The requested strings that are not phone numbers")
@@ -1,5 +1,17 @@
+from typing import List
+
+from pydantic import Field
+
 from phone_book_api_server.data_models.base import SharedBaseModel
 
 
 class DeleteContactResponse(SharedBaseModel):
     detail: str
+
+
+class PhoneNumberBackfillReport(SharedBaseModel):
+    normalized: int = Field(description="The phone numbers rewritten to their E.164 form")
+    conflicts: List[str] = Field(
+        description="The phone numbers left as is, since their E.164 form is another contact"
+    )
+    invalid: List[str] = Field(description="The phone numbers left as is, since they are invalid")
@@ -0,0 +1,14 @@
+from typing import Optional
+
+from pydantic import Field
+
+from phone_book_api_server.data_models.base import SharedBaseModel
+
+
+class PhoneNumberIndexStatsResponse(SharedBaseModel):
+    loaded: bool = Field(description="Whether the phone numbers were loaded from the db")
+    size: int = Field(description="The number of indexed phone numbers")
+    memory_bytes: int = Field(description="The memory the index takes")
+    bytes_per_number: Optional[float] = Field(description="The memory per indexed phone number")
+    pending_writes: int = Field(description="The writes not yet merged into the sorted array")
+    load_seconds: Optional[float] = Field(description="How long loading the phone numbers took")
@@ -0,0 +1,17 @@
+from pydantic import Field
+
+from phone_book_api_server.data_models.base import SharedBaseModel
+
+
+class PoolStatusResponse(SharedBaseModel):
+    pool_size: int = Field(description="The number of connections kept open by the pool")
+    checked_out: int = Field(description="The connections currently in use")
+    peak_checked_out: int = Field(description="The most connections ever in use at once")
+    overflow: int = Field(description="The current overflow beyond the pool size")
+    checkouts: int = Field(description="The total number of connection checkouts")
+    connections_opened: int = Field(description="The total number of DBAPI connections opened")
+    invalidations: int = Field(description="The total number of invalidated connections")
+    wait_time_total: float = Field(description="The total seconds spent waiting for a connection")
+    wait_time_max: float = Field(description="The longest wait for a connection, in seconds")
+    wait_time_avg: float = Field(description="The average wait for a connection, in seconds")
+    timeouts: int = Field(description="The checkouts that gave up after the pool timeout")
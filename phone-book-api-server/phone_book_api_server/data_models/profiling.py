@@ -0,0 +1,34 @@
+from datetime import datetime
+from typing import Dict, List
+
+from pydantic import Field
+
+from phone_book_api_server.data_models.base import SharedBaseModel
+
+
+class SqlStatementTiming(SharedBaseModel):
+    statement: str = Field(description="The SQL statement sent to the database")
+    seconds: float = Field(description="How long the statement took, waiting included")
+
+
+class ProfileSummaryResponse(SharedBaseModel):
+    id: str = Field(description="The id of the profile, sent back in the X-Profile-ID header")
+    method: str = Field(description="The HTTP method of the profiled request")
+    path: str = Field(description="The path of the profiled request")
+    status_code: int = Field(description="The status of the response")
+    seconds: float = Field(description="How long the request took")
+    created_at: datetime = Field(description="When the request was served")
+
+
+class ProfileResponse(ProfileSummaryResponse):
+    packages: Dict[str, float] = Field(
+        description="Seconds spent in the code of each package, not counting its calls to others"
+    )
+    sql_seconds: float = Field(description="The total time of the SQL statements")
+    sql_statements: List[SqlStatementTiming] = Field(
+        description="The first SQL statements of the request, in order"
+    )
+    sql_statements_count: int = Field(description="The number of SQL statements")
+    stats: str = Field(
+        description="The slowest functions by cumulative time, as pstats prints them"
+    )
@@ -0,0 +1,11 @@
+from typing import Optional
+
+from pydantic import Field
+
+from phone_book_api_server.data_models.base import SharedBaseModel
+
+
+class ReadinessResponse(SharedBaseModel):
+    ready: bool = Field(description="Whether the worker is warmed up and can serve traffic")
+    detail: str = Field(description="The warm-up step the worker is at, or why it is not ready")
+    startup_seconds: Optional[float] = Field(description="How long the worker took to get ready")
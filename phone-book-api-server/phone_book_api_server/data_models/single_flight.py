@@ -0,0 +1,9 @@
+from pydantic import Field
+
+from phone_book_api_server.data_models.base import SharedBaseModel
+
+
+class SingleFlightStatsResponse(SharedBaseModel):
+    in_flight: int = Field(description="The lookups running right now")
+    executions: int = Field(description="The lookups that queried the database")
+    coalesced: int = Field(description="The lookups that shared the result of a running one")
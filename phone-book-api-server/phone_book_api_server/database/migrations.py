@@ -0,0 +1,179 @@
+"""Schema and data migrations of an existing database, run outside the API server.
+
+Run them with `python -m phone_book_api_server.database.migrations`.
+"""
+
+import logging
+import sys
+from typing import Dict, List, Optional
+
+import sqlalchemy
+from sqlalchemy import bindparam, inspect, select, text, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateColumn
+
+from phone_book_api_server import SETTINGS
+from phone_book_api_server.data_models.db import PhoneNumberBackfillReport
+from phone_book_api_server.database.models import (
+    E164_PATTERN,
+    PHONE_NUMBER_CHECK_NAME,
+    Base,
+    Contacts,
+    ContactTombstones,
+)
+from phone_book_api_server.exceptions.contact import InvalidContactNumber
+from phone_book_api_server.services.contact_validation import normalize_phone_number
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def _backfill_batch(
+    connection: Connection, phone_numbers: List[str], report: PhoneNumberBackfillReport
+) -> None:
+    renames: Dict[str, str] = {}
+    for phone_number in phone_numbers:
+        try:
+            normalized_phone_number = normalize_phone_number(phone_number)
+        except InvalidContactNumber:
+            report.invalid.append(phone_number)
+            continue
+        if normalized_phone_number != phone_number:
+            renames[phone_number] = normalized_phone_number
+    if not renames:
+        return
+    existing_phone_numbers = set(
+        connection.scalars(
+            select(Contacts.phone_number).where(Contacts.phone_number.in_(renames.values()))
+        )
+    )
+    updates = []
+    for phone_number, normalized_phone_number in renames.items():
+        # Two spellings of one number are left for a person to merge, nothing is deleted
+        if normalized_phone_number in existing_phone_numbers:
+            report.conflicts.append(phone_number)
+            continue
+        existing_phone_numbers.add(normalized_phone_number)
+        updates.append(
+            {"old_phone_number": phone_number, "new_phone_number": normalized_phone_number}
+        )
+    if updates:
+        connection.execute(
+            update(Contacts)
+            .where(Contacts.phone_number == bindparam("old_phone_number"))
+            .values(phone_number=bindparam("new_phone_number")),
+            updates,
+        )
+        report.normalized += len(updates)
+
+
+def backfill_phone_numbers(
+    engine: Engine, batch_size: int = BACKFILL_BATCH_SIZE
+) -> PhoneNumberBackfillReport:
+    """Rewrite the phone numbers stored before normalization to their E.164 form.
+
+    Rows are walked in primary key order, one short transaction per batch, so the API can
+    keep serving while it runs. Running it again is a no-op.
+    """
+    report = PhoneNumberBackfillReport(normalized=0, conflicts=[], invalid=[])
+    after: Optional[str] = None
+    while True:
+        with engine.begin() as connection:
+            statement = select(Contacts.phone_number).order_by(Contacts.phone_number)
+            if after is not None:
+                statement = statement.where(Contacts.phone_number > after)
+            phone_numbers = list(connection.scalars(statement.limit(batch_size)))
+            if not phone_numbers:
+                return report
+            _backfill_batch(connection, phone_numbers, report)
+        after = phone_numbers[-1]
+
+
+def add_phone_number_check(engine: Engine, validate: bool = True) -> None:
+    """Add the E.164 check constraint to a contacts table created before it existed.
+
+    The constraint is added NOT VALID, so it guards new writes right away, and validated
+    against the existing rows only when asked to, once the backfill left none behind.
+    """
+    check_names = {
+        check_constraint["name"]
+        for check_constraint in inspect(engine).get_check_constraints(Contacts.__tablename__)
+    }
+    with engine.begin() as connection:
+        if PHONE_NUMBER_CHECK_NAME not in check_names:
+            connection.execute(
+                text(
+                    f"ALTER TABLE {Contacts.__tablename__} "
+                    f"ADD CONSTRAINT {PHONE_NUMBER_CHECK_NAME} "
+                    f"CHECK (phone_number ~ '{E164_PATTERN}') NOT VALID"
+                )
+            )
+        if validate:
+            connection.execute(
+                text(
+                    f"ALTER TABLE {Contacts.__tablename__} "
+                    f"VALIDATE CONSTRAINT {PHONE_NUMBER_CHECK_NAME}"
+                )
+            )
+
+
+def add_missing_columns(engine: Engine) -> List[str]:
+    """Add the columns of the contacts and tombstones tables added after they were created.
+
+    The existing rows get the server default of the column, as the first version of a contact.
+    """
+    added_column_names = []
+    with engine.begin() as connection:
+        for table in (Contacts.__table__, ContactTombstones.__table__):
+            column_names = {
+                column["name"] for column in inspect(connection).get_columns(table.name)
+            }
+            for column in table.columns:
+                if column.name not in column_names:
+                    create_column = CreateColumn(column)  # type: ignore[no-untyped-call]
+                    column_definition = create_column.compile(dialect=engine.dialect)
+                    connection.execute(
+                        text(f"ALTER TABLE {table.name} ADD COLUMN {column_definition}")
+                    )
+                    added_column_names.append(f"{table.name}.{column.name}")
+    return added_column_names
+
+
+def create_missing_indexes(engine: Engine) -> List[str]:
+    """Create the indexes of the contacts table added after the table was created."""
+    index_names = {index["name"] for index in inspect(engine).get_indexes(Contacts.__tablename__)}
+    created_index_names = []
+    with engine.begin() as connection:
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        for index in Contacts.__table__.indexes:
+            if index.name not in index_names:
+                index.create(connection)
+                created_index_names.append(index.name)
+    return created_index_names
+
+
+def migrate(engine: Engine) -> PhoneNumberBackfillReport:
+    """Bring an existing database up to the current schema."""
+    logger = logging.getLogger(__name__)
+    Base.metadata.create_all(engine)
+    for column_name in add_missing_columns(engine):
+        logger.info(f"Added column {column_name}")
+    for index_name in create_missing_indexes(engine):
+        logger.info(f"Created index {index_name}")
+    report = backfill_phone_numbers(engine)
+    logger.info(
+        f"Normalized {report.normalized} phone numbers, left {len(report.conflicts)} "
+        f"conflicting and {len(report.invalid)} invalid ones as is"
+    )
+    for phone_number in report.conflicts:
+        logger.warning(f"Phone number {phone_number} is another spelling of an existing contact")
+    for phone_number in report.invalid:
+        logger.warning(f"Phone number {phone_number} is not a valid phone number")
+    add_phone_number_check(engine, validate=not report.conflicts and not report.invalid)
+    return report
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if not SETTINGS.DATABASE_URL:
+        sys.exit("Set DATABASE_URL to the database to migrate")
+    migrate(sqlalchemy.create_engine(SETTINGS.DATABASE_URL))
@@ -1,13 +1,111 @@
-from sqlalchemy import Column, String
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    CheckConstraint,
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    Sequence,
+    String,
+    cast,
+    event,
+    func,
+)
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
 
+# The shape of an E.164 number, the canonical form the service stores phone numbers in
+E164_PATTERN = r"^\+[1-9][0-9]{1,14}$"
+PHONE_NUMBER_CHECK_NAME = "ck_contacts_phone_number_e164"
+# Orders every insert, update and delete of a contact, the position of the changes feed
+CHANGE_SEQUENCE = Sequence("contacts_change_seq", metadata=Base.metadata)
+# The 64-bit id of the writing transaction, which never wraps around like the xmin of a row
+CURRENT_TRANSACTION_ID = cast(cast(func.pg_current_xact_id(), String), BigInteger)
+
 
 class Contacts(Base):
     __tablename__ = "contacts"
 
+    # The canonical E.164 key, so a lookup in any input format is one primary key hit
     phone_number = Column("phone_number", String, primary_key=True)
     first_name = Column("first_name", String, nullable=False)
     last_name = Column("last_name", String, nullable=False)
     email_address = Column("email_address", String, nullable=True)
+    # Bumped by every update, the ETag and Last-Modified of conditional GETs
+    version = Column("version", Integer, nullable=False, server_default="1")
+    updated_at = Column(
+        "updated_at", DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    change_seq = Column(
+        "change_seq", BigInteger, nullable=False, server_default=CHANGE_SEQUENCE.next_value()
+    )
+    change_xid = Column(
+        "change_xid", BigInteger, nullable=False, server_default=CURRENT_TRANSACTION_ID
+    )
+
+    __table_args__ = (
+        CheckConstraint(f"phone_number ~ '{E164_PATTERN}'", name=PHONE_NUMBER_CHECK_NAME),
+        # Serves the changes feed
+        Index("ix_contacts_change_seq", "change_seq"),
+        # Serves keyset pagination in name order
+        Index("ix_contacts_name_order", "last_name", "first_name", "phone_number"),
+        # Serve prefix search, text_pattern_ops compares characters whatever the collation
+        Index(
+            "ix_contacts_phone_number_prefix",
+            "phone_number",
+            postgresql_ops={"phone_number": "text_pattern_ops"},
+        ),
+        Index(
+            "ix_contacts_first_name_prefix",
+            func.lower(first_name).label("lower_first_name"),
+            postgresql_ops={"lower_first_name": "text_pattern_ops"},
+        ),
+        Index(
+            "ix_contacts_last_name_prefix",
+            func.lower(last_name).label("lower_last_name"),
+            postgresql_ops={"lower_last_name": "text_pattern_ops"},
+        ),
+        # Serve fuzzy name search, trigrams are case insensitive
+        Index(
+            "ix_contacts_first_name_trgm",
+            "first_name",
+            postgresql_using="gin",
+            postgresql_ops={"first_name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_contacts_last_name_trgm",
+            "last_name",
+            postgresql_using="gin",
+            postgresql_ops={"last_name": "gin_trgm_ops"},
+        ),
+    )
+
+
+class ContactTombstones(Base):
+    """The deleted phone numbers, so the changes feed tells devices to drop them."""
+
+    __tablename__ = "contact_tombstones"
+
+    phone_number = Column("phone_number", String, primary_key=True)
+    deleted_at = Column(
+        "deleted_at", DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    change_seq = Column(
+        "change_seq", BigInteger, nullable=False, server_default=CHANGE_SEQUENCE.next_value()
+    )
+    change_xid = Column(
+        "change_xid", BigInteger, nullable=False, server_default=CURRENT_TRANSACTION_ID
+    )
+
+    __table_args__ = (Index("ix_contact_tombstones_change_seq", "change_seq"),)
+
+
+event.listen(
+    Contacts.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(  # type: ignore[no-untyped-call]
+        dialect="postgresql"
+    ),
+)
@@ -0,0 +1,249 @@
+"""SQL statements shared by the sync and asyncio PostgreSQL clients."""
+
+from datetime import timedelta
+from typing import Any, Dict, Optional, Sequence
+
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    Insert,
+    Select,
+    String,
+    Update,
+    and_,
+    any_,
+    bindparam,
+    cast,
+    delete,
+    false,
+    func,
+    insert,
+    literal,
+    null,
+    or_,
+    select,
+    true,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects import postgresql
+
+from phone_book_api_server.data_models.contacts import ContactSearchQuery, ContactsSort
+from phone_book_api_server.database.models import (
+    CHANGE_SEQUENCE,
+    CURRENT_TRANSACTION_ID,
+    Contacts,
+    ContactTombstones,
+)
+
+CONTACT_COLUMNS = tuple(Contacts.__table__.columns)
+# The columns a client writes, the version columns are maintained by the database
+CONTACT_DATA_COLUMNS = tuple(
+    column
+    for column in CONTACT_COLUMNS
+    if column.key not in ("version", "updated_at", "change_seq", "change_xid")
+)
+
+# Every sort ends with the primary key, so the keys are unique and pages never overlap
+CONTACT_SORT_COLUMNS = {
+    ContactsSort.PHONE_NUMBER: (Contacts.phone_number,),
+    ContactsSort.NAME: (Contacts.last_name, Contacts.first_name, Contacts.phone_number),
+}
+
+
+def insert_contact_statement(new_contact: Contacts) -> Insert:
+    """INSERT ... RETURNING the stored row, so no read-back query is needed."""
+    values = {column.key: getattr(new_contact, column.key) for column in CONTACT_DATA_COLUMNS}
+    return insert(Contacts).values(**values).returning(*CONTACT_COLUMNS)
+
+
+def update_contact_statement(contact_phone_number: str, contact_values: Dict[str, Any]) -> Update:
+    """UPDATE ... RETURNING the updated row, matching no row when the contact is missing.
+
+    Every update bumps the version of the contact, so clients holding the old one refetch it.
+    """
+    return (
+        update(Contacts)
+        .where(Contacts.phone_number == contact_phone_number)
+        .values(
+            **contact_values,
+            version=Contacts.version + 1,
+            updated_at=func.now(),
+            change_seq=CHANGE_SEQUENCE.next_value(),
+            change_xid=CURRENT_TRANSACTION_ID,
+        )
+        .returning(*CONTACT_COLUMNS)
+    )
+
+
+def insert_tombstones_statement(deleted_phone_numbers: Select[Any]) -> Insert:
+    """Record deleted phone numbers, one deleted again moves to the end of the changes feed."""
+    return (
+        postgresql.insert(ContactTombstones)
+        .from_select(["phone_number"], deleted_phone_numbers)
+        .on_conflict_do_update(
+            index_elements=[ContactTombstones.phone_number],
+            set_={
+                "deleted_at": func.now(),
+                "change_seq": CHANGE_SEQUENCE.next_value(),
+                "change_xid": CURRENT_TRANSACTION_ID,
+            },
+        )
+    )
+
+
+def insert_tombstone_statement(phone_number: str) -> Insert:
+    return insert_tombstones_statement(select(literal(phone_number, String)))
+
+
+def delete_contact_statement(contact_phone_number: str) -> Insert:
+    """DELETE the contact and record its tombstone in the same statement."""
+    deleted_contacts = (
+        delete(Contacts)
+        .where(Contacts.phone_number == contact_phone_number)
+        .returning(Contacts.phone_number)
+        .cte("deleted_contacts")
+    )
+    return insert_tombstones_statement(select(deleted_contacts.c.phone_number))
+
+
+def insert_contacts_statement() -> Insert:
+    """Multi-row INSERT skipping existing phone numbers, RETURNING the ones actually stored.
+
+    Executed with a list of parameter sets, SQLAlchemy batches it into multi-row VALUES
+    ("insertmanyvalues") on both psycopg2 and asyncpg.
+    """
+    contacts_table = Contacts.__table__
+    return (
+        postgresql.insert(contacts_table)
+        .on_conflict_do_nothing(index_elements=[contacts_table.c.phone_number])
+        .returning(contacts_table.c.phone_number)
+    )
+
+
+def select_contacts_page_statement(
+    limit: int, sort: ContactsSort, after: Optional[Sequence[str]] = None
+) -> Select[Any]:
+    """Keyset pagination: seek past the last key of the previous page through the index."""
+    sort_columns = CONTACT_SORT_COLUMNS[sort]
+    statement = select(*CONTACT_COLUMNS).order_by(*sort_columns).limit(limit)
+    if after is not None:
+        statement = statement.where(
+            tuple_(*sort_columns) > tuple_(*(literal(value) for value in after))
+        )
+    return statement
+
+
+def select_contacts_by_phone_numbers_statement(phone_numbers: Sequence[str]) -> Select[Any]:
+    """`WHERE phone_number = ANY(:phone_numbers)`, one array parameter for any batch size.
+
+    Unlike IN with a parameter per number, the statement text is the same for every batch,
+    so it is prepared once.
+    """
+    phone_numbers_parameter = bindparam(
+        "phone_numbers", list(phone_numbers), type_=postgresql.ARRAY(String)
+    )
+    return select(*CONTACT_COLUMNS).where(Contacts.phone_number == any_(phone_numbers_parameter))
+
+
+def select_phone_numbers_statement() -> Select[Any]:
+    """All phone numbers in byte order, the order of the in-memory phone number index."""
+    return select(Contacts.phone_number).order_by(Contacts.phone_number.collate("C"))
+
+
+def select_contacts_statement() -> Select[Any]:
+    """All contacts in primary key order, so exports are stable and walk the index."""
+    return select(*CONTACT_COLUMNS).order_by(Contacts.phone_number)
+
+
+def select_contacts_changes_statement(
+    after: int, limit: int, settle_seconds: float, include_deleted: bool = True
+) -> Select[Any]:
+    """The contacts and tombstones changed after a position of the feed, in change order.
+
+    Both tables are read through their change_seq index and merged, tombstones have null
+    contact fields and `deleted` set. `settling` flags the changes a transaction still in
+    flight may commit an earlier position before: the changes written at or after the oldest
+    running transaction, and as a backstop the ones younger than `settle_seconds`, as a
+    transaction draws its position just before its id.
+    """
+    oldest_running_xid = cast(
+        cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), String), BigInteger
+    )
+    settle_time = func.now() - timedelta(seconds=settle_seconds)
+    contact_settling = or_(
+        Contacts.change_xid >= oldest_running_xid, Contacts.updated_at > settle_time
+    )
+    changed_contacts = (
+        select(*CONTACT_COLUMNS, false().label("deleted"), contact_settling.label("settling"))
+        .where(Contacts.change_seq > after)
+        .order_by(Contacts.change_seq)
+        .limit(limit)
+    )
+    if not include_deleted:
+        return changed_contacts
+    tombstone_columns: Dict[str, ColumnElement[Any]] = {
+        "phone_number": ContactTombstones.phone_number,
+        "updated_at": ContactTombstones.deleted_at,
+        "change_seq": ContactTombstones.change_seq,
+        "change_xid": ContactTombstones.change_xid,
+    }
+    tombstone_settling = or_(
+        ContactTombstones.change_xid >= oldest_running_xid,
+        ContactTombstones.deleted_at > settle_time,
+    )
+    deleted_contacts = (
+        select(
+            *(
+                tombstone_columns.get(column.key, cast(null(), column.type)).label(column.key)
+                for column in CONTACT_COLUMNS
+            ),
+            true().label("deleted"),
+            tombstone_settling.label("settling"),
+        )
+        .where(ContactTombstones.change_seq > after)
+        .order_by(ContactTombstones.change_seq)
+        .limit(limit)
+    )
+    changes = union_all(changed_contacts, deleted_contacts).subquery("changes")
+    return select(changes).order_by(changes.c.change_seq).limit(limit)
+
+
+def _prefix_range(expression: Any, prefix: str) -> ColumnElement[bool]:
+    """`expression LIKE 'prefix%'` as the range of the text_pattern_ops operators.
+
+    Unlike LIKE, the range can use the text_pattern_ops B-tree for a bound parameter, so it
+    keeps using the index under the generic plans of prepared statements.
+    """
+    upper_bound = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return and_(expression.op("~>=~")(prefix), expression.op("~<~")(upper_bound))
+
+
+def search_contacts_statement(
+    search_query: ContactSearchQuery, limit: int, offset: int
+) -> Select[Any]:
+    """Contacts matching a phone number prefix, or a name prefix or fuzzy name, best first.
+
+    Name prefix matches rank first, then contacts by their closest trigram similarity.
+    """
+    statement = select(*CONTACT_COLUMNS).limit(limit).offset(offset)
+    if search_query.phone_prefix is not None:
+        return statement.where(
+            _prefix_range(Contacts.phone_number, search_query.phone_prefix)
+        ).order_by(Contacts.phone_number)
+    name = (search_query.name or "").lower()
+    prefix_match = or_(
+        _prefix_range(func.lower(Contacts.first_name), name),
+        _prefix_range(func.lower(Contacts.last_name), name),
+    )
+    if not search_query.fuzzy:
+        return statement.where(prefix_match).order_by(
+            Contacts.last_name, Contacts.first_name, Contacts.phone_number
+        )
+    similarity = func.greatest(
+        func.similarity(Contacts.first_name, name), func.similarity(Contacts.last_name, name)
+    )
+    return statement.where(
+        or_(prefix_match, Contacts.first_name.op("%")(name), Contacts.last_name.op("%")(name))
+    ).order_by(prefix_match.desc(), similarity.desc(), Contacts.phone_number)
@@ -6,6 +6,10 @@ class ContactAlreadyExist(Exception):
     """Contact Already Exist in db."""
 
 
+class PhoneNumberIndexUnavailable(Exception):
+    """Phone Number Index Disabled Or Not Loaded Yet."""
+
+
 class InvalidContactParams(Exception):
     """Invalid Contact Parameters."""
 
@@ -29,3 +33,38 @@ class InvalidContactEmail(InvalidContactParams):
 
     def __init__(self, detail: str):
         super().__init__(detail)
+
+
+class InvalidContactImport(InvalidContactParams):
+    """Malformed Contacts Import Payload."""
+
+    def __init__(self, detail: str):
+        super().__init__(detail)
+
+
+class UnsupportedContactImportFormat(InvalidContactParams):
+    """Unsupported Contacts Import Media Type."""
+
+    def __init__(self, detail: str):
+        super().__init__(detail)
+
+
+class InvalidPageCursor(InvalidContactParams):
+    """Invalid Contacts Page Cursor."""
+
+    def __init__(self, detail: str):
+        super().__init__(detail)
+
+
+class InvalidSearchQuery(InvalidContactParams):
+    """Invalid Contacts Search Query."""
+
+    def __init__(self, detail: str):
+        super().__init__(detail)
+
+
+class InvalidContactsLookup(InvalidContactParams):
+    """Invalid Contacts Lookup Request."""
+
+    def __init__(self, detail: str):
+        super().__init__(detail)
@@ -0,0 +1,92 @@
+"""Production launcher: uvicorn with its worker processes and a tuned event loop."""
+
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+import uvicorn
+from dependency_injector import providers
+
+from phone_book_api_server.constants import SETTINGS
+
+DEFAULT_SERVER_CONFIG: Dict[str, Any] = {
+    "host": "0.0.0.0",
+    "port": 8000,
+    "workers": 1,
+    "loop": "uvloop",
+    "http": "httptools",
+    "backlog": 2048,
+    "timeout_keep_alive": 5,
+    "limit_concurrency": 0,
+    "limit_max_requests": 0,
+}
+
+
+def get_server_options(server_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Translate the `server` config section into `uvicorn.run` keyword arguments."""
+    options = {**DEFAULT_SERVER_CONFIG, **(server_config or {})}
+    return {
+        "host": str(options["host"]),
+        "port": int(options["port"]),
+        "workers": int(options["workers"]) or os.cpu_count() or 1,
+        "loop": str(options["loop"]),
+        "http": str(options["http"]),
+        "backlog": int(options["backlog"]),
+        "timeout_keep_alive": int(options["timeout_keep_alive"]),
+        "limit_concurrency": int(options["limit_concurrency"]) or None,
+        "limit_max_requests": int(options["limit_max_requests"]) or None,
+        # AccessLogMiddleware already logs every request
+        "access_log": False,
+    }
+
+
+def check_worker_caches(config: Dict[str, Any], workers: int) -> None:
+    """Refuse several workers that each cache contacts in memory without redis invalidation.
+
+    A write only drops the contact from the cache of the worker that served it, so the
+    other workers would answer the old contact, and 304s to its old ETag, until the ttl.
+    """
+    cache_config = config.get("cache") or {}
+    if (
+        workers > 1
+        and cache_config.get("backend", "memory") == "memory"
+        and int(cache_config.get("max_size", 0))
+        and cache_config.get("invalidation") != "redis"
+    ):
+        raise ValueError(
+            f"{workers} workers cannot each cache contacts in memory without redis "
+            f'invalidation: set cache.invalidation to "redis", cache.backend to "redis", '
+            f"cache.max_size to 0 or server.workers to 1"
+        )
+
+
+def get_worker_state_warnings(config: Dict[str, Any], workers: int) -> List[str]:
+    """The per-worker state that goes stale across several workers without redis invalidation.
+
+    Each worker keeps its own phone number index; only the "redis" invalidation tells the
+    other workers about a write.
+    """
+    cache_config = config.get("cache") or {}
+    if workers <= 1 or cache_config.get("invalidation") == "redis":
+        return []
+    if (config.get("autocomplete") or {}).get("index") == "memory":
+        return [
+            f"{workers} workers keep a phone number index without redis invalidation: the "
+            f"writes of a worker only reach the other workers' indexes when they restart"
+        ]
+    return []
+
+
+def run(app: str, factory: bool = False) -> None:
+    """Serve the app of an import string, which every worker imports after it is forked.
+
+    On SIGTERM or SIGINT each worker stops accepting connections, serves the requests in
+    flight, then runs the shutdown of the app, which closes its database connections.
+    """
+    config = providers.Configuration()
+    config.from_yaml(SETTINGS.CONFIG, required=True, envs_required=True)
+    server_options = get_server_options(config.server())
+    check_worker_caches(config(), server_options["workers"])
+    for warning in get_worker_state_warnings(config(), server_options["workers"]):
+        logging.getLogger(__name__).warning(warning)
+    uvicorn.run(app, factory=factory, **server_options)
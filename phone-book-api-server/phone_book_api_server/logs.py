@@ -0,0 +1,108 @@
+"""Low-overhead logging: JSON lines written by a background thread, sampled per request."""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import IO, Any, Dict, Optional, Tuple
+
+# The attributes every LogRecord has, anything else was passed through `extra`
+RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+# The id of the request being served, and whether its success logs were sampled
+_request_context: ContextVar[Tuple[Optional[str], bool]] = ContextVar(
+    "request_context", default=(None, True)
+)
+
+
+def set_request_context(request_id: str, sampled: bool) -> Any:
+    """Tag the logs of the current request, returning the token to reset it with."""
+    return _request_context.set((request_id, sampled))
+
+
+def reset_request_context(token: Any) -> None:
+    _request_context.reset(token)
+
+
+class RequestContextFilter(logging.Filter):
+    """Add the request id to the records, and drop the success logs of unsampled requests.
+
+    Warnings and errors are always kept. A dropped record is never formatted.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        request_id, sampled = _request_context.get()
+        if not sampled and record.levelno < logging.WARNING:
+            return False
+        if request_id is not None:
+            record.request_id = request_id
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with the `extra` fields of the record as keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class QueueLogHandler(QueueHandler):
+    """Hand the records to a background thread that formats and writes them.
+
+    The request thread only puts the record on a queue. The listener thread starts with
+    the first record of each process, so forked workers each get their own.
+    """
+
+    def __init__(self, stream: Optional[IO[str]] = None) -> None:
+        super().__init__(queue.SimpleQueue())
+        self.stream_handler = logging.StreamHandler(stream or sys.stdout)
+        self.stream_handler.setFormatter(JsonFormatter())
+        self.__lock = threading.Lock()
+        self.__listener: Optional[QueueListener] = None
+        self.__listener_pid: Optional[int] = None
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Unlike the base class, leave the formatting to the listener thread
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.__listener_pid != os.getpid():
+            self.__start_listener()
+        super().enqueue(record)
+
+    def close(self) -> None:
+        with self.__lock:
+            if self.__listener is not None and self.__listener_pid == os.getpid():
+                self.__listener.stop()
+            self.__listener = None
+            self.__listener_pid = None
+        super().close()
+
+    def __start_listener(self) -> None:
+        with self.__lock:
+            if self.__listener_pid == os.getpid():
+                return
+            self.__listener = QueueListener(self.queue, self.stream_handler)
+            self.__listener.start()
+            self.__listener_pid = os.getpid()
+            # Flush what is still queued when the process exits
+            atexit.register(self.close)
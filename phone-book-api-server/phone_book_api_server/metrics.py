@@ -0,0 +1,266 @@
+"""Prometheus metrics with per-thread counters, so recording a value never takes a lock.
+
+Each thread writes to its own counters, the scrape sums them. Only the first value a thread
+records for a metric registers its counters under a lock.
+
+The counters live in the memory of one process. With several workers, a scrape of /metrics
+reaches one of them and reports only that worker's share of the traffic; run one worker per
+scraped target to see all of it.
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Sequence, Tuple, TypeVar, cast
+
+from pydantic import BaseModel
+from typing_extensions import ParamSpec
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Seconds, from a cached lookup to a slow bulk statement
+DEFAULT_BUCKETS = (
+    0.00001,
+    0.00005,
+    0.0001,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+M = TypeVar("M", bound="_Metric")
+P = ParamSpec("P")
+R = TypeVar("R")
+LabelValues = Tuple[str, ...]
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(label_names: Sequence[str], label_values: Sequence[str]) -> str:
+    if not label_names:
+        return ""
+    labels = ",".join(
+        f'{name}="{_escape_label_value(value)}"' for name, value in zip(label_names, label_values)
+    )
+    return "{" + labels + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.__local = threading.local()
+        self.__lock = threading.Lock()
+        self.__thread_values: List[Dict[LabelValues, List[float]]] = []
+
+    def _get_values(self, label_values: LabelValues) -> List[float]:
+        """The counters of this thread for these labels."""
+        try:
+            return cast(List[float], self.__local.values[label_values])
+        except (AttributeError, KeyError):
+            return self.__register_values(label_values)
+
+    def _sum_values(self) -> Dict[LabelValues, List[float]]:
+        with self.__lock:
+            thread_values = [dict(values) for values in self.__thread_values]
+        summed_values: Dict[LabelValues, List[float]] = {}
+        for values in thread_values:
+            for label_values, counters in values.items():
+                summed_counters = summed_values.setdefault(label_values, [0] * len(counters))
+                for position, counter in enumerate(counters):
+                    summed_counters[position] += counter
+        return summed_values
+
+    def _new_counters(self) -> List[float]:
+        raise NotImplementedError
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.metric_type}"
+        yield from self._render_samples(self._sum_values())
+
+    def _render_samples(self, summed_values: Dict[LabelValues, List[float]]) -> Iterator[str]:
+        raise NotImplementedError
+
+    def __register_values(self, label_values: LabelValues) -> List[float]:
+        if not hasattr(self.__local, "values"):
+            self.__local.values = {}
+            with self.__lock:
+                self.__thread_values.append(self.__local.values)
+        counters = self.__local.values[label_values] = self._new_counters()
+        return counters
+
+
+class Counter(_Metric):
+    """A total that only goes up, by label values."""
+
+    metric_type = "counter"
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        self._get_values(label_values)[0] += amount
+
+    def _new_counters(self) -> List[float]:
+        return [0]
+
+    def _render_samples(self, summed_values: Dict[LabelValues, List[float]]) -> Iterator[str]:
+        for label_values, (total,) in sorted(summed_values.items()):
+            labels = _format_labels(self.label_names, label_values)
+            yield f"{self.name}{labels} {_format_value(total)}"
+
+
+class Histogram(_Metric):
+    """Counts of observed values in fixed buckets, with their count and sum, by label values."""
+
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *label_values: str) -> None:
+        # The bucket of the value, the sum after the last bucket
+        counters = self._get_values(label_values)
+        counters[bisect_left(self.buckets, value)] += 1
+        counters[-1] += value
+
+    def time(self, *label_values: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+        """Decorate a function or coroutine function to observe how long each call takes."""
+
+        def decorator(function: Callable[P, R]) -> Callable[P, R]:
+            if asyncio.iscoroutinefunction(function):
+                coroutine_function = cast(Callable[P, Awaitable[Any]], function)
+
+                @functools.wraps(function)
+                async def timed_coroutine(*args: P.args, **kwargs: P.kwargs) -> Any:
+                    start_time = time.perf_counter()
+                    try:
+                        return await coroutine_function(*args, **kwargs)
+                    finally:
+                        self.observe(time.perf_counter() - start_time, *label_values)
+
+                # The coroutine function returns the same awaitable type R as the one it wraps
+                return cast(Callable[P, R], timed_coroutine)
+
+            @functools.wraps(function)
+            def timed_function(*args: P.args, **kwargs: P.kwargs) -> R:
+                start_time = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.observe(time.perf_counter() - start_time, *label_values)
+
+            return timed_function
+
+        return decorator
+
+    def _new_counters(self) -> List[float]:
+        # A count per bucket, one for the values above the last bucket, and the sum
+        return [0] * (len(self.buckets) + 2)
+
+    def _render_samples(self, summed_values: Dict[LabelValues, List[float]]) -> Iterator[str]:
+        bucket_names = self.label_names + ("le",)
+        for label_values, counters in sorted(summed_values.items()):
+            cumulative_count = 0
+            for bucket, bucket_count in zip(self.buckets + (float("inf"),), counters[:-1]):
+                cumulative_count += int(bucket_count)
+                bucket_labels = _format_labels(
+                    bucket_names, label_values + (_format_value(float(bucket)),)
+                )
+                yield f"{self.name}_bucket{bucket_labels} {cumulative_count}"
+            labels = _format_labels(self.label_names, label_values)
+            yield f"{self.name}_count{labels} {cumulative_count}"
+            yield f"{self.name}_sum{labels} {_format_value(counters[-1])}"
+
+
+class MetricsRegistry:
+    """The metrics of the process, rendered in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        self.__metrics: Dict[str, _Metric] = {}
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        return self.__register(Counter(name, documentation, label_names))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.__register(Histogram(name, documentation, label_names, buckets))
+
+    def render(self) -> str:
+        return "".join(
+            f"{line}\n" for metric in self.__metrics.values() for line in metric.render()
+        )
+
+    def __register(self, metric: M) -> M:
+        if metric.name in self.__metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.__metrics[metric.name] = metric
+        return metric
+
+
+def render_gauges(prefix: str, documentation: str, model: BaseModel) -> str:
+    """The numeric fields of a status model as gauges."""
+    lines = []
+    for field_name, value in model.dict().items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            name = f"{prefix}_{field_name}"
+            description = model.__fields__[field_name].field_info.description
+            lines += [
+                f"# HELP {name} {documentation}: {description}",
+                f"# TYPE {name} gauge",
+                f"{name} {_format_value(value)}",
+            ]
+    return "".join(f"{line}\n" for line in lines)
+
+
+REGISTRY = MetricsRegistry()
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "Time to serve a request, by route template",
+    ("method", "route"),
+)
+REQUESTS = REGISTRY.counter(
+    "http_requests_total",
+    "Requests served, by route template and status",
+    ("method", "route", "status"),
+)
+DB_QUERY_SECONDS = REGISTRY.histogram(
+    "db_query_duration_seconds", "Time spent in a PostgreSQL client method", ("method",)
+)
+VALIDATION_SECONDS = REGISTRY.histogram(
+    "contact_validation_duration_seconds", "Time spent validating a contact field", ("field",)
+)
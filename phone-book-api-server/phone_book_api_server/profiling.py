@@ -0,0 +1,238 @@
+"""Opt-in profiles of single requests, to see where the time of a slow endpoint goes.
+
+A profiled request runs under cProfile, in the event loop and in every threadpool call of
+the service, and times each SQL statement it sends. With profiling turned off in the config
+nothing here is installed; turned on, requests that are not profiled only pay for a context
+variable lookup per SQL statement and service call.
+"""
+
+import cProfile
+import functools
+import hmac
+import io
+import os
+import pstats
+import re
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from phone_book_api_server.data_models.profiling import (
+    ProfileResponse,
+    ProfileSummaryResponse,
+    SqlStatementTiming,
+)
+
+MAX_PROFILES = 20
+MAX_STATEMENTS = 100
+STATS_LINES = 40
+SQL_START_TIMES_KEY = "profiling_sql_start_times"
+# The module of a C function, as in "<method 'execute' of 'psycopg2.extensions.cursor' objects>"
+BUILTIN_MODULE_PATTERN = re.compile(r"of '(\w+)|built-in method (\w+)\.")
+PACKAGE_FOLDERS = ("site-packages", "dist-packages")
+
+_current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar(
+    "current_profile", default=None
+)
+# cProfile hooks a whole thread, so two requests profiled at once would blend into each other
+_profiling_lock = threading.Lock()
+_sql_timing_lock = threading.Lock()
+_sql_timing_installed = False
+
+
+def get_package(filename: str, function_name: str) -> str:
+    """The top-level package of the code of a profiled function."""
+    if filename == "~":
+        match = BUILTIN_MODULE_PATTERN.search(function_name)
+        return (match.group(1) or match.group(2)) if match else "builtins"
+    parts = filename.split(os.sep)
+    for position, part in enumerate(parts[:-1]):
+        if part in PACKAGE_FOLDERS or part == "phone_book_api_server":
+            package = part if part == "phone_book_api_server" else parts[position + 1]
+            return package[: -len(".py")] if package.endswith(".py") else package
+    return "python"
+
+
+class RequestProfile:
+    """The cProfile stats and SQL timings collected while one request is served."""
+
+    def __init__(self, method: str, path: str, max_statements: int = MAX_STATEMENTS) -> None:
+        self.id = os.urandom(6).hex()
+        self.method = method
+        self.path = path
+        self.max_statements = max_statements
+        self.created_at = datetime.now(timezone.utc)
+        self.__lock = threading.Lock()
+        self.__profiler = cProfile.Profile()
+        self.__thread_profilers: List[cProfile.Profile] = []
+        self.__statements: List[SqlStatementTiming] = []
+        self.__statements_count = 0
+        self.__sql_seconds = 0.0
+        self.__start_time = 0.0
+
+    def start(self) -> None:
+        self.__start_time = time.perf_counter()
+        self.__profiler.enable()
+
+    def stop(self) -> float:
+        self.__profiler.disable()
+        return time.perf_counter() - self.__start_time
+
+    def add_thread_profiler(self, profiler: cProfile.Profile) -> None:
+        with self.__lock:
+            self.__thread_profilers.append(profiler)
+
+    def add_statement(self, statement: str, seconds: float) -> None:
+        with self.__lock:
+            self.__statements_count += 1
+            self.__sql_seconds += seconds
+            if len(self.__statements) < self.max_statements:
+                self.__statements.append(SqlStatementTiming(statement=statement, seconds=seconds))
+
+    def finish(self, status_code: int, seconds: float) -> ProfileResponse:
+        stats = pstats.Stats(self.__profiler)
+        with self.__lock:
+            for thread_profiler in self.__thread_profilers:
+                stats.add(thread_profiler)
+            packages: Dict[str, float] = {}
+            for (filename, _, function_name), function_stats in stats.stats.items():  # type: ignore
+                package = get_package(filename, function_name)
+                packages[package] = packages.get(package, 0.0) + function_stats[2]
+            stats_output = io.StringIO()
+            stats.stream = stats_output  # type: ignore
+            stats.strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(STATS_LINES)
+            return ProfileResponse(
+                id=self.id,
+                method=self.method,
+                path=self.path,
+                status_code=status_code,
+                seconds=seconds,
+                created_at=self.created_at,
+                packages=dict(sorted(packages.items(), key=lambda item: item[1], reverse=True)),
+                sql_seconds=self.__sql_seconds,
+                sql_statements=list(self.__statements),
+                sql_statements_count=self.__statements_count,
+                stats=stats_output.getvalue(),
+            )
+
+
+def is_profiling_token(value: Optional[str], token: Optional[str]) -> bool:
+    """Whether a request carries the configured profiling token, none configured allows none.
+
+    Profiles hold the SQL of other requests, only the holders of the token may ask for them.
+    """
+    if not token or not value:
+        return False
+    return hmac.compare_digest(value.encode(), str(token).encode())
+
+
+def start_request_profile(
+    method: str, path: str, max_statements: int = MAX_STATEMENTS
+) -> Optional[Tuple[RequestProfile, Any]]:
+    """Start profiling the current request, unless another request is being profiled.
+
+    Returns the profile and the context token `finish_request_profile` takes back.
+    """
+    if not _profiling_lock.acquire(blocking=False):
+        return None
+    profile = RequestProfile(method, path, max_statements)
+    try:
+        profile.start()
+    except ValueError:
+        # Another profiler, such as a debugger's, already hooks this interpreter
+        _profiling_lock.release()
+        return None
+    return profile, _current_profile.set(profile)
+
+
+def finish_request_profile(profile: RequestProfile, context_token: Any) -> float:
+    try:
+        return profile.stop()
+    finally:
+        _current_profile.reset(context_token)
+        _profiling_lock.release()
+
+
+def profile_thread(function: Callable[..., Any]) -> Callable[..., Any]:
+    """Profile `function` in the thread it runs in, when the current request is profiled.
+
+    cProfile only sees the thread it was enabled in, the service methods run in the
+    threadpool are profiled by their own profiler, merged into the request profile.
+    """
+    profile = _current_profile.get()
+    if profile is None:
+        return function
+
+    @functools.wraps(function)
+    def profiled_function(*args: Any, **kwargs: Any) -> Any:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ allows a single profiler at a time, which already sees this thread
+            return function(*args, **kwargs)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            profiler.disable()
+            profile.add_thread_profiler(profiler)
+
+    return profiled_function
+
+
+def _before_cursor_execute(connection: Any, *_: Any) -> None:
+    if _current_profile.get() is not None:
+        connection.info.setdefault(SQL_START_TIMES_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(connection: Any, _: Any, statement: str, *__: Any) -> None:
+    profile = _current_profile.get()
+    start_times = connection.info.get(SQL_START_TIMES_KEY)
+    if profile is not None and start_times:
+        profile.add_statement(statement, time.perf_counter() - start_times.pop())
+
+
+def install_sql_timing() -> None:
+    """Time the SQL statements of profiled requests, on every engine, sync and async."""
+    global _sql_timing_installed
+    with _sql_timing_lock:
+        if _sql_timing_installed:
+            return
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _sql_timing_installed = True
+
+
+class ProfileStore:
+    """The latest request profiles of this worker, the oldest dropped first."""
+
+    def __init__(self, max_profiles: int = MAX_PROFILES) -> None:
+        self.__lock = threading.Lock()
+        self.__profiles: Deque[ProfileResponse] = deque(maxlen=max_profiles)
+
+    def add(self, profile: ProfileResponse) -> None:
+        with self.__lock:
+            self.__profiles.append(profile)
+
+    def get(self, profile_id: str) -> Optional[ProfileResponse]:
+        with self.__lock:
+            for profile in self.__profiles:
+                if profile.id == profile_id:
+                    return profile
+        return None
+
+    def list(self) -> List[ProfileSummaryResponse]:
+        """The summaries of the stored profiles, the latest first."""
+        with self.__lock:
+            return [
+                ProfileSummaryResponse(
+                    **profile.dict(include=set(ProfileSummaryResponse.__fields__))
+                )
+                for profile in reversed(self.__profiles)
+            ]
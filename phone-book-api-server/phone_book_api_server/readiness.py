@@ -0,0 +1,41 @@
+"""Readiness of a worker to serve traffic, for the readiness probe of the orchestrator."""
+
+import threading
+import time
+from typing import Optional
+
+from phone_book_api_server.data_models.readiness import ReadinessResponse
+
+
+class Readiness:
+    """Whether the worker finished warming up: its database reachable and its index loaded.
+
+    The worker answers probes from the moment it starts, the readiness probe fails until
+    `set_ready` is called.
+    """
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__started_at = time.monotonic()
+        self.ready = False
+        self.detail = "Starting"
+        self.startup_seconds: Optional[float] = None
+
+    def set_not_ready(self, detail: str) -> None:
+        with self.__lock:
+            self.ready = False
+            self.detail = detail
+
+    def set_ready(self) -> None:
+        with self.__lock:
+            self.ready = True
+            self.detail = "Ready"
+            self.startup_seconds = time.monotonic() - self.__started_at
+
+    def status(self) -> ReadinessResponse:
+        with self.__lock:
+            return ReadinessResponse(
+                ready=self.ready,
+                detail=self.detail,
+                startup_seconds=self.startup_seconds,
+            )
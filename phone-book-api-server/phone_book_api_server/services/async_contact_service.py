@@ -0,0 +1,208 @@
+"""Asynchronous Contact Service."""
+
+import asyncio
+from typing import Any, AsyncIterator, Callable, List, Optional, Sequence, Set, TypeVar, cast
+
+from phone_book_api_server.clients.contact_cache import ContactCache
+from phone_book_api_server.clients.phone_number_index import PhoneNumberIndex
+from phone_book_api_server.clients.protocols import AsyncContactsDBClient
+from phone_book_api_server.data_models.contacts import (
+    ContactRequest,
+    ContactResponse,
+    ContactsChangesResponse,
+    ContactsPageResponse,
+    ContactsSearchResponse,
+    ContactsSort,
+    ExportFormat,
+    ImportContactsResponse,
+    LookupContactsResponse,
+    UpdateContactRequest,
+)
+from phone_book_api_server.data_models.db import DeleteContactResponse
+from phone_book_api_server.exceptions.contact import ContactNotFoundError
+from phone_book_api_server.services.contact_export import get_export_encoder, get_export_header
+from phone_book_api_server.services.contact_search import parse_search_query
+from phone_book_api_server.services.contact_service import (
+    CHANGES_SETTLE_SECONDS,
+    EXPORT_BATCH_SIZE,
+    IMPORT_BATCH_SIZE,
+    LOOKUP_MAX_SIZE,
+    PHONE_NUMBER_INDEX_BATCH_SIZE,
+    SEARCH_MAX_RESULTS,
+)
+from phone_book_api_server.services.contact_service_base import ContactServiceBase
+from phone_book_api_server.services.pagination import decode_changes_token, decode_page_cursor
+from phone_book_api_server.services.single_flight import AsyncSingleFlight
+
+T = TypeVar("T")
+
+
+class AsyncContactService(ContactServiceBase):
+    """Asynchronous Contact CRUD Class, with the validation rules of ContactService."""
+
+    def __init__(
+        self,
+        db_client: AsyncContactsDBClient,
+        contact_cache: Optional[ContactCache] = None,
+        phone_number_index: Optional[PhoneNumberIndex] = None,
+        single_flight: Optional[AsyncSingleFlight] = None,
+        fast_serialization: bool = False,
+    ) -> None:
+        super().__init__(contact_cache, phone_number_index, fast_serialization)
+        self.__db_client = db_client
+        self._single_flight = single_flight
+
+    async def load_phone_number_index(
+        self, batch_size: int = PHONE_NUMBER_INDEX_BATCH_SIZE
+    ) -> None:
+        if self._phone_number_index is None:
+            return
+        phone_number_index_loader = self._phone_number_index.start_load()
+        async for phone_numbers in self.__db_client.stream_phone_numbers(batch_size):
+            phone_number_index_loader.add_batch(phone_numbers)
+        phone_number_index_loader.finish()
+
+    async def insert_contact(self, contact_request: ContactRequest) -> ContactResponse:
+        new_contact = self._build_new_contact(contact_request)
+        contact_response = await self.__db_client.insert_contact(new_contact)
+        # The ORM columns are not typed as their values
+        self._index_phone_numbers(added=[cast(str, new_contact.phone_number)])
+        return contact_response
+
+    async def get_contacts_list(
+        self,
+        limit_contacts_list: int,
+        cursor: Optional[str] = None,
+        sort: ContactsSort = ContactsSort.PHONE_NUMBER,
+    ) -> ContactsPageResponse:
+        after = decode_page_cursor(cursor, sort) if cursor else None
+        contacts_list = await self.__db_client.get_contacts(limit_contacts_list + 1, sort, after)
+        return self._build_contacts_page(contacts_list, limit_contacts_list, sort)
+
+    async def get_contacts_changes(
+        self,
+        since: Optional[str],
+        limit: int,
+        settle_seconds: float = CHANGES_SETTLE_SECONDS,
+    ) -> ContactsChangesResponse:
+        after = decode_changes_token(since) if since else 0
+        changes = await self.__db_client.get_contacts_changes(
+            after, limit + 1, settle_seconds, include_deleted=since is not None
+        )
+        return self._build_changes_page(changes, limit, after)
+
+    async def search_contacts(
+        self,
+        query: str,
+        limit: int,
+        offset: int = 0,
+        max_results: int = SEARCH_MAX_RESULTS,
+    ) -> ContactsSearchResponse:
+        search_query = parse_search_query(query)
+        limit = min(limit, max_results - offset)
+        if limit <= 0:
+            return ContactsSearchResponse(contacts=[], next_offset=None)
+        contacts_list = await self.__db_client.search_contacts(search_query, limit + 1, offset)
+        return self._build_search_page(contacts_list, limit, offset, max_results)
+
+    async def lookup_contacts(
+        self, phone_numbers: Sequence[str], max_size: int = LOOKUP_MAX_SIZE
+    ) -> LookupContactsResponse:
+        requested_phone_numbers, invalid_phone_numbers = self._normalize_lookup(
+            phone_numbers, max_size
+        )
+        contacts = await self._call_cache(
+            self._get_cached_contacts, list(requested_phone_numbers.values())
+        )
+        uncached_phone_numbers = [
+            phone_number
+            for phone_number in dict.fromkeys(requested_phone_numbers.values())
+            if phone_number not in contacts
+        ]
+        if uncached_phone_numbers:
+            generations = await self._call_cache(
+                self._get_cache_generations, uncached_phone_numbers
+            )
+            found_contacts = {
+                contact.phone_number: ContactResponse.from_orm(contact)
+                for contact in await self.__db_client.get_contacts_by_phone_numbers(
+                    uncached_phone_numbers
+                )
+            }
+            await self._call_cache(self._cache_contacts, found_contacts, generations)
+            contacts.update(found_contacts)
+        return self._build_lookup_response(requested_phone_numbers, invalid_phone_numbers, contacts)
+
+    async def get_contact(self, contact_phone_number: str) -> ContactResponse:
+        return await self._get_contact(self._normalize_number(contact_phone_number))
+
+    async def update_contact(
+        self, contact_data_update_request: UpdateContactRequest, contact_phone_number: str
+    ) -> ContactResponse:
+        contact_values = self._build_update_values(contact_data_update_request)
+        phone_number = self._normalize_number(contact_phone_number)
+        if not contact_values:
+            return await self._get_contact(phone_number)
+        updated_contact = await self.__db_client.update_contact(phone_number, contact_values)
+        await self._call_cache(
+            self._invalidate_cached_contacts, phone_number, updated_contact.phone_number
+        )
+        if updated_contact.phone_number != phone_number:
+            self._index_phone_numbers(added=[updated_contact.phone_number], removed=[phone_number])
+        return updated_contact
+
+    async def import_contacts(
+        self, contact_rows: List[Any], batch_size: int = IMPORT_BATCH_SIZE
+    ) -> ImportContactsResponse:
+        # Validating a large payload is CPU bound, keep it off the event loop
+        rows_results, new_contacts = await asyncio.to_thread(
+            self._validate_import_rows, contact_rows
+        )
+        inserted_phone_numbers: Set[str] = set()
+        for batch_start in range(0, len(new_contacts), batch_size):
+            batch_end = batch_start + batch_size
+            inserted_phone_numbers.update(
+                await self.__db_client.insert_contacts(new_contacts[batch_start:batch_end])
+            )
+        self._index_phone_numbers(added=inserted_phone_numbers)
+        return self._build_import_report(rows_results, inserted_phone_numbers)
+
+    async def export_contacts(
+        self, export_format: ExportFormat, batch_size: int = EXPORT_BATCH_SIZE
+    ) -> AsyncIterator[bytes]:
+        encode_rows = get_export_encoder(export_format, self._fast_serialization)
+        yield get_export_header(export_format)
+        async for contacts_batch in self.__db_client.stream_contacts(batch_size):
+            yield encode_rows(contacts_batch)
+
+    async def delete_contact(self, contact_phone_number: str) -> DeleteContactResponse:
+        phone_number = self._normalize_number(contact_phone_number)
+        deleted = await self.__db_client.delete_contact(phone_number)
+        await self._call_cache(self._invalidate_cached_contacts, phone_number)
+        if not deleted:
+            raise ContactNotFoundError
+        self._index_phone_numbers(removed=[phone_number])
+        return DeleteContactResponse(
+            detail=f"Contact with phone number {phone_number} has been successfully deleted."
+        )
+
+    async def _get_contact(self, phone_number: str) -> ContactResponse:
+        cached_contact = await self._call_cache(self._get_cached_contact, phone_number)
+        if cached_contact is not None:
+            return cached_contact
+        if self._single_flight is None:
+            return await self._read_contact(phone_number)
+        return await self._single_flight.do(phone_number, self._read_contact, phone_number)
+
+    async def _read_contact(self, phone_number: str) -> ContactResponse:
+        generations = await self._call_cache(self._get_cache_generations, [phone_number])
+        contact_data = await self.__db_client.get_contact(phone_number)
+        contact_response = ContactResponse(**contact_data.__dict__)
+        await self._call_cache(self._cache_contact, phone_number, contact_response, generations)
+        return contact_response
+
+    async def _call_cache(self, cache_method: Callable[..., T], *args: Any) -> T:
+        # A shared cache is a network round-trip, keep it off the event loop
+        if self._contact_cache is not None and self._contact_cache.is_remote:
+            return await asyncio.to_thread(cache_method, *args)
+        return cache_method(*args)
@@ -0,0 +1,67 @@
+"""Encoding of streamed contact exports."""
+
+import csv
+import io
+import json
+from typing import Any, Callable, Dict, Iterable
+
+from phone_book_api_server.data_models.contacts import ExportFormat
+from phone_book_api_server.services.contact_import import CSV_MEDIA_TYPE, NDJSON_MEDIA_TYPES
+from phone_book_api_server.services.contact_serialization import (
+    CONTACT_FIELDS,
+    MSGPACK_MEDIA_TYPES,
+    contact_row_to_dict,
+    dump_json,
+    dump_msgpack,
+)
+
+# Exports use the same camelCase keys as the API
+EXPORT_COLUMNS = CONTACT_FIELDS
+
+EXPORT_MEDIA_TYPES: Dict[ExportFormat, str] = {
+    ExportFormat.NDJSON: NDJSON_MEDIA_TYPES[0],
+    ExportFormat.CSV: CSV_MEDIA_TYPE,
+    ExportFormat.MSGPACK: MSGPACK_MEDIA_TYPES[0],
+}
+
+
+def _encode_ndjson_rows(rows: Iterable[Any]) -> bytes:
+    return "".join(
+        json.dumps({alias: getattr(row, name) for name, alias in EXPORT_COLUMNS}) + "\n"
+        for row in rows
+    ).encode()
+
+
+def _dump_ndjson_rows(rows: Iterable[Any]) -> bytes:
+    # The same objects in orjson's compact form, without spaces after the separators
+    return b"".join(dump_json(contact_row_to_dict(row)) + b"\n" for row in rows)
+
+
+def _encode_msgpack_rows(rows: Iterable[Any]) -> bytes:
+    # A stream of MessagePack maps, one per contact, read back with msgpack.Unpacker
+    return b"".join(dump_msgpack(contact_row_to_dict(row)) for row in rows)
+
+
+def _encode_csv_rows(rows: Iterable[Any]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([getattr(row, name) for name, _ in EXPORT_COLUMNS] for row in rows)
+    return buffer.getvalue().encode()
+
+
+def get_export_header(export_format: ExportFormat) -> bytes:
+    if export_format == ExportFormat.CSV:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(alias for _, alias in EXPORT_COLUMNS)
+        return buffer.getvalue().encode()
+    return b""
+
+
+def get_export_encoder(
+    export_format: ExportFormat, fast_serialization: bool = False
+) -> Callable[[Iterable[Any]], bytes]:
+    """Return the function encoding a batch of contact rows into one response chunk."""
+    if export_format == ExportFormat.CSV:
+        return _encode_csv_rows
+    if export_format == ExportFormat.MSGPACK:
+        return _encode_msgpack_rows
+    return _dump_ndjson_rows if fast_serialization else _encode_ndjson_rows
@@ -0,0 +1,57 @@
+"""Parsing of bulk contact import payloads."""
+
+import csv
+import io
+import json
+from typing import Any, Callable, Dict, List
+
+from phone_book_api_server.exceptions.contact import (
+    InvalidContactImport,
+    UnsupportedContactImportFormat,
+)
+
+JSON_MEDIA_TYPE = "application/json"
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson")
+CSV_MEDIA_TYPE = "text/csv"
+
+
+def _parse_json(text: str) -> List[Any]:
+    rows = json.loads(text)
+    if not isinstance(rows, list):
+        raise InvalidContactImport(detail="A JSON import must be an array of contacts.")
+    return rows
+
+
+def _parse_ndjson(text: str) -> List[Any]:
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def _parse_csv(text: str) -> List[Dict[str, Any]]:
+    # Empty cells are missing values, so an empty email column stays optional
+    return [
+        {key: value or None for key, value in row.items() if key}
+        for row in csv.DictReader(io.StringIO(text))
+    ]
+
+
+def get_import_parser(content_type: str) -> Callable[[str], List[Any]]:
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type == JSON_MEDIA_TYPE:
+        return _parse_json
+    if media_type in NDJSON_MEDIA_TYPES:
+        return _parse_ndjson
+    if media_type == CSV_MEDIA_TYPE:
+        return _parse_csv
+    raise UnsupportedContactImportFormat(
+        detail=f"Unsupported import media type '{media_type}', "
+        f"use {JSON_MEDIA_TYPE}, {NDJSON_MEDIA_TYPES[0]} or {CSV_MEDIA_TYPE}."
+    )
+
+
+def parse_contact_rows(body: bytes, content_type: str) -> List[Any]:
+    """Decode a JSON array, NDJSON or CSV payload into one raw row per contact."""
+    parser = get_import_parser(content_type)
+    try:
+        return parser(body.decode("utf-8-sig"))
+    except (ValueError, csv.Error) as error:
+        raise InvalidContactImport(detail=f"Malformed import payload: {error}") from error
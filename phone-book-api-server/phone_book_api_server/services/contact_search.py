@@ -0,0 +1,30 @@
+"""Parsing of contact search queries."""
+
+import re
+
+from phone_book_api_server.data_models.contacts import ContactSearchQuery
+from phone_book_api_server.exceptions.contact import InvalidSearchQuery
+
+# Digits with the separators people type in phone numbers, optionally after a leading plus
+PHONE_QUERY_PATTERN = re.compile(r"^\+?[\d\s().-]*\d[\d\s().-]*$")
+NON_DIGITS_PATTERN = re.compile(r"\D")
+# Shorter names share too few trigrams with anything to match fuzzily
+FUZZY_SEARCH_MIN_LENGTH = 3
+
+
+def parse_phone_prefix(prefix: str) -> str:
+    """The digits of a phone number prefix, whatever separators it was typed with."""
+    prefix = prefix.strip()
+    if not PHONE_QUERY_PATTERN.match(prefix):
+        raise InvalidSearchQuery(detail="The prefix is not the start of a phone number.")
+    return NON_DIGITS_PATTERN.sub("", prefix)
+
+
+def parse_search_query(query: str) -> ContactSearchQuery:
+    """Search a phone number prefix when the query looks like one, a name otherwise."""
+    query = query.strip()
+    if not query:
+        raise InvalidSearchQuery(detail="The search query is empty.")
+    if PHONE_QUERY_PATTERN.match(query):
+        return ContactSearchQuery(phone_prefix="+" + NON_DIGITS_PATTERN.sub("", query))
+    return ContactSearchQuery(name=query, fuzzy=len(query) >= FUZZY_SEARCH_MIN_LENGTH)
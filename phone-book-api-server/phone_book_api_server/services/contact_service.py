@@ -1,115 +1,204 @@
 """"Contact Service."""
 
-import re
-from typing import List
+from typing import Any, Iterator, List, Optional, Sequence, Set, cast
 
-import phonenumbers
-
-from phone_book_api_server.clients.db_client import PostgreSQLClient
+from phone_book_api_server.clients.contact_cache import ContactCache
+from phone_book_api_server.clients.phone_number_index import PhoneNumberIndex
+from phone_book_api_server.clients.protocols import ContactsDBClient
 from phone_book_api_server.data_models.contacts import (
     ContactRequest,
     ContactResponse,
+    ContactsChangesResponse,
+    ContactsPageResponse,
+    ContactsSearchResponse,
+    ContactsSort,
+    ExportFormat,
+    ImportContactsResponse,
+    LookupContactsResponse,
     UpdateContactRequest,
 )
 from phone_book_api_server.data_models.db import DeleteContactResponse
-from phone_book_api_server.database.models import Contacts
-from phone_book_api_server.exceptions.contact import (
-    InvalidContactEmail,
-    InvalidContactName,
-    InvalidContactNumber,
-)
+from phone_book_api_server.exceptions.contact import ContactNotFoundError
+from phone_book_api_server.services.contact_export import get_export_encoder, get_export_header
+from phone_book_api_server.services.contact_search import parse_search_query
+from phone_book_api_server.services.contact_service_base import ContactServiceBase
+from phone_book_api_server.services.pagination import decode_changes_token, decode_page_cursor
+from phone_book_api_server.services.single_flight import SingleFlight
+
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 100
+SEARCH_PAGE_SIZE = 10
+MAX_SEARCH_PAGE_SIZE = 50
+# Searches are for typeahead, nobody pages past the first few hundred best matches
+SEARCH_MAX_RESULTS = 200
+AUTOCOMPLETE_SIZE = 10
+MAX_AUTOCOMPLETE_SIZE = 50
+PHONE_NUMBER_INDEX_BATCH_SIZE = 10000
+# Phone numbers resolved by one lookup request, in one query
+LOOKUP_MAX_SIZE = 1000
+IMPORT_BATCH_SIZE = 1000
+EXPORT_BATCH_SIZE = 1000
+CHANGES_PAGE_SIZE = 100
+MAX_CHANGES_PAGE_SIZE = 1000
+# Younger changes wait for the next sync, a slower transaction may still commit before them
+CHANGES_SETTLE_SECONDS = 1.0
 
 
-class ContactService:
+class ContactService(ContactServiceBase):
     """Contact CRUD Class."""
 
-    def __init__(self, db_client: PostgreSQLClient) -> None:
+    def __init__(
+        self,
+        db_client: ContactsDBClient,
+        contact_cache: Optional[ContactCache] = None,
+        phone_number_index: Optional[PhoneNumberIndex] = None,
+        single_flight: Optional[SingleFlight] = None,
+        fast_serialization: bool = False,
+    ) -> None:
+        super().__init__(contact_cache, phone_number_index, fast_serialization)
         self.__db_client = db_client
+        self._single_flight = single_flight
+
+    def load_phone_number_index(self, batch_size: int = PHONE_NUMBER_INDEX_BATCH_SIZE) -> None:
+        if self._phone_number_index is None:
+            return
+        phone_number_index_loader = self._phone_number_index.start_load()
+        for phone_numbers in self.__db_client.stream_phone_numbers(batch_size):
+            phone_number_index_loader.add_batch(phone_numbers)
+        phone_number_index_loader.finish()
 
     def insert_contact(self, contact_request: ContactRequest) -> ContactResponse:
-        if (
-            self._is_valid_number(contact_request.phone_number)
-            and self._is_valid_name(contact_request.first_name)
-            and self._is_valid_name(contact_request.last_name)
-        ):
-            new_contact = Contacts(
-                phone_number=contact_request.phone_number,
-                first_name=contact_request.first_name,
-                last_name=contact_request.last_name,
-            )
-            if contact_request.email_address and self._is_valid_email(
-                contact_request.email_address
-            ):
-                new_contact.email_address = contact_request.email_address
-            self.__db_client.insert_contact(new_contact)
-            contact_response = self.get_contact(contact_request.phone_number)
-            return contact_response
-
-    def get_contacts_list(self, limit_contacts_list: int) -> List[ContactResponse]:
-        contacts_list = self.__db_client.get_contacts(limit_contacts_list)
-        return contacts_list
+        new_contact = self._build_new_contact(contact_request)
+        contact_response = self.__db_client.insert_contact(new_contact)
+        # The ORM columns are not typed as their values
+        self._index_phone_numbers(added=[cast(str, new_contact.phone_number)])
+        return contact_response
+
+    def get_contacts_list(
+        self,
+        limit_contacts_list: int,
+        cursor: Optional[str] = None,
+        sort: ContactsSort = ContactsSort.PHONE_NUMBER,
+    ) -> ContactsPageResponse:
+        after = decode_page_cursor(cursor, sort) if cursor else None
+        # One extra row tells whether there is a next page
+        contacts_list = self.__db_client.get_contacts(limit_contacts_list + 1, sort, after)
+        return self._build_contacts_page(contacts_list, limit_contacts_list, sort)
+
+    def get_contacts_changes(
+        self,
+        since: Optional[str],
+        limit: int,
+        settle_seconds: float = CHANGES_SETTLE_SECONDS,
+    ) -> ContactsChangesResponse:
+        after = decode_changes_token(since) if since else 0
+        # One extra change tells whether there are more, a first sync has nothing to delete
+        changes = self.__db_client.get_contacts_changes(
+            after, limit + 1, settle_seconds, include_deleted=since is not None
+        )
+        return self._build_changes_page(changes, limit, after)
+
+    def search_contacts(
+        self,
+        query: str,
+        limit: int,
+        offset: int = 0,
+        max_results: int = SEARCH_MAX_RESULTS,
+    ) -> ContactsSearchResponse:
+        search_query = parse_search_query(query)
+        limit = min(limit, max_results - offset)
+        if limit <= 0:
+            return ContactsSearchResponse(contacts=[], next_offset=None)
+        # One extra row tells whether there is a next page
+        contacts_list = self.__db_client.search_contacts(search_query, limit + 1, offset)
+        return self._build_search_page(contacts_list, limit, offset, max_results)
+
+    def lookup_contacts(
+        self, phone_numbers: Sequence[str], max_size: int = LOOKUP_MAX_SIZE
+    ) -> LookupContactsResponse:
+        requested_phone_numbers, invalid_phone_numbers = self._normalize_lookup(
+            phone_numbers, max_size
+        )
+        contacts = self._get_cached_contacts(requested_phone_numbers.values())
+        uncached_phone_numbers = [
+            phone_number
+            for phone_number in dict.fromkeys(requested_phone_numbers.values())
+            if phone_number not in contacts
+        ]
+        if uncached_phone_numbers:
+            generations = self._get_cache_generations(uncached_phone_numbers)
+            found_contacts = {
+                contact.phone_number: ContactResponse.from_orm(contact)
+                for contact in self.__db_client.get_contacts_by_phone_numbers(
+                    uncached_phone_numbers
+                )
+            }
+            self._cache_contacts(found_contacts, generations)
+            contacts.update(found_contacts)
+        return self._build_lookup_response(requested_phone_numbers, invalid_phone_numbers, contacts)
 
     def get_contact(self, contact_phone_number: str) -> ContactResponse:
-        if self._is_valid_number(contact_phone_number):
-            contact_data = self.__db_client.get_contact(contact_phone_number)
-            contact_response = ContactResponse(**contact_data.__dict__)
-            return contact_response
-        raise InvalidContactNumber(detail="Invalid phone number.")
+        return self._get_contact(self._normalize_number(contact_phone_number))
 
     def update_contact(
         self, contact_data_update_request: UpdateContactRequest, contact_phone_number: str
     ) -> ContactResponse:
-        contact_request = self.get_contact(contact_phone_number)
-        contact_data = ContactResponse(**contact_request.__dict__)
-        if contact_data_update_request.phone_number and self._is_valid_number(
-            contact_data_update_request.phone_number
-        ):
-            contact_data.phone_number = contact_data_update_request.phone_number
-        if contact_data_update_request.first_name and self._is_valid_name(
-            contact_data_update_request.first_name
-        ):
-            contact_data.first_name = contact_data_update_request.first_name
-        if contact_data_update_request.last_name and self._is_valid_name(
-            contact_data_update_request.last_name
-        ):
-            contact_data.last_name = contact_data_update_request.last_name
-        if contact_data_update_request.email_address and self._is_valid_email(
-            contact_data_update_request.email_address
-        ):
-            contact_data.email_address = contact_data_update_request.email_address
-        self.__db_client.update_contact(contact_phone_number, contact_data)
-        updated_contact = self.get_contact(contact_data.phone_number)
+        contact_values = self._build_update_values(contact_data_update_request)
+        phone_number = self._normalize_number(contact_phone_number)
+        if not contact_values:
+            return self._get_contact(phone_number)
+        updated_contact = self.__db_client.update_contact(phone_number, contact_values)
+        self._invalidate_cached_contacts(phone_number, updated_contact.phone_number)
+        if updated_contact.phone_number != phone_number:
+            self._index_phone_numbers(added=[updated_contact.phone_number], removed=[phone_number])
         return updated_contact
 
-    def delete_contact(self, contact_phone_number: str) -> DeleteContactResponse:
-        if self._is_valid_number(contact_phone_number):
-            contact = self.get_contact(contact_phone_number)
-            if not contact:
-                return DeleteContactResponse(
-                    detail=f"The Contact with phone number {contact_phone_number} doesn't exist"
-                )
-            self.__db_client.delete_contact(contact_phone_number)
-            return DeleteContactResponse(
-                detail=f"Contact with phone number {contact_phone_number} has been successfully deleted."
+    def import_contacts(
+        self, contact_rows: List[Any], batch_size: int = IMPORT_BATCH_SIZE
+    ) -> ImportContactsResponse:
+        rows_results, new_contacts = self._validate_import_rows(contact_rows)
+        inserted_phone_numbers: Set[str] = set()
+        for batch_start in range(0, len(new_contacts), batch_size):
+            batch_end = batch_start + batch_size
+            inserted_phone_numbers.update(
+                self.__db_client.insert_contacts(new_contacts[batch_start:batch_end])
             )
-        raise InvalidContactNumber(detail=f"Invalid contact phone number.")
-
-    def _is_valid_number(self, phone_number: str) -> bool:
-        try:
-            parsed_number = phonenumbers.parse(phone_number, None)
-            if phonenumbers.is_valid_number(parsed_number):
-                return True
-            raise
-        except:
-            raise InvalidContactNumber(detail="Invalid phone number.")
-
-    def _is_valid_email(self, email: str) -> bool:
-        pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-        if not re.match(pattern, email):
-            raise InvalidContactEmail(detail="Invalid contact email address.")
-        return True
-
-    def _is_valid_name(self, name: str) -> bool:
-        if not name.isalpha():
-            raise InvalidContactName(detail="Invalid contact name.")
-        return True
+        self._index_phone_numbers(added=inserted_phone_numbers)
+        return self._build_import_report(rows_results, inserted_phone_numbers)
+
+    def export_contacts(
+        self, export_format: ExportFormat, batch_size: int = EXPORT_BATCH_SIZE
+    ) -> Iterator[bytes]:
+        encode_rows = get_export_encoder(export_format, self._fast_serialization)
+        yield get_export_header(export_format)
+        for contacts_batch in self.__db_client.stream_contacts(batch_size):
+            yield encode_rows(contacts_batch)
+
+    def delete_contact(self, contact_phone_number: str) -> DeleteContactResponse:
+        phone_number = self._normalize_number(contact_phone_number)
+        deleted = self.__db_client.delete_contact(phone_number)
+        # A cached copy of a contact deleted elsewhere is dropped too
+        self._invalidate_cached_contacts(phone_number)
+        if not deleted:
+            raise ContactNotFoundError
+        self._index_phone_numbers(removed=[phone_number])
+        return DeleteContactResponse(
+            detail=f"Contact with phone number {phone_number} has been successfully deleted."
+        )
+
+    def _get_contact(self, phone_number: str) -> ContactResponse:
+        """Get a contact by its already normalized phone number."""
+        cached_contact = self._get_cached_contact(phone_number)
+        if cached_contact is not None:
+            return cached_contact
+        # Concurrent misses on one number share a single query
+        if self._single_flight is None:
+            return self._read_contact(phone_number)
+        return self._single_flight.do(phone_number, self._read_contact, phone_number)
+
+    def _read_contact(self, phone_number: str) -> ContactResponse:
+        generations = self._get_cache_generations([phone_number])
+        contact_data = self.__db_client.get_contact(phone_number)
+        contact_response = ContactResponse(**contact_data.__dict__)
+        self._cache_contact(phone_number, contact_response, generations)
+        return contact_response
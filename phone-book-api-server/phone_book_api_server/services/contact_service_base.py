@@ -0,0 +1,342 @@
+"""Validation and response building shared by the sync and asyncio contact services."""
+
+from itertools import takewhile
+from typing import (
+    Any,
+    Counter,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    cast,
+)
+
+from pydantic import BaseModel, ValidationError
+
+from phone_book_api_server.clients.contact_cache import ContactCache
+from phone_book_api_server.clients.phone_number_index import PhoneNumberIndex
+from phone_book_api_server.data_models.contacts import (
+    AutocompleteResponse,
+    ContactRequest,
+    ContactResponse,
+    ContactsChangesResponse,
+    ContactsPageResponse,
+    ContactsSearchResponse,
+    ContactsSort,
+    ImportContactsResponse,
+    ImportRowResult,
+    ImportRowStatus,
+    LookupContactsResponse,
+    UpdateContactRequest,
+)
+from phone_book_api_server.database.models import Contacts
+from phone_book_api_server.exceptions.contact import (
+    InvalidContactNumber,
+    InvalidContactParams,
+    InvalidContactsLookup,
+    PhoneNumberIndexUnavailable,
+)
+from phone_book_api_server.metrics import VALIDATION_SECONDS
+from phone_book_api_server.services.contact_search import parse_phone_prefix
+from phone_book_api_server.services.contact_validation import (
+    normalize_phone_number,
+    validate_email,
+    validate_name,
+)
+from phone_book_api_server.services.pagination import encode_changes_token, get_next_page_cursor
+
+ResponseModel = TypeVar("ResponseModel", bound=BaseModel)
+
+
+def _get_row_phone_number(contact_row: Any) -> Optional[str]:
+    if not isinstance(contact_row, dict):
+        return None
+    phone_number = contact_row.get("phoneNumber", contact_row.get("phone_number"))
+    return str(phone_number) if phone_number is not None else None
+
+
+def _format_import_error(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(location) for location in row_error['loc'])}: {row_error['msg']}"
+            for row_error in error.errors()
+        )
+    return str(error)
+
+
+class ContactServiceBase:
+    """The part of the contact services that does not read or write the database.
+
+    ContactService and AsyncContactService each add the db reads and writes of their client.
+    """
+
+    def __init__(
+        self,
+        contact_cache: Optional[ContactCache] = None,
+        phone_number_index: Optional[PhoneNumberIndex] = None,
+        fast_serialization: bool = False,
+    ) -> None:
+        self._contact_cache = contact_cache
+        self._phone_number_index = phone_number_index
+        # List responses keep the database rows of their contacts, for FastJSONResponse
+        self._fast_serialization = fast_serialization
+
+    def autocomplete_phone_numbers(self, prefix: str, limit: int) -> AutocompleteResponse:
+        if self._phone_number_index is None or not self._phone_number_index.loaded:
+            raise PhoneNumberIndexUnavailable
+        phone_numbers, total = self._phone_number_index.search(parse_phone_prefix(prefix), limit)
+        return AutocompleteResponse(phone_numbers=phone_numbers, total=total)
+
+    def _get_cached_contact(self, contact_phone_number: str) -> Optional[ContactResponse]:
+        if self._contact_cache is None:
+            return None
+        return self._contact_cache.get(contact_phone_number)
+
+    def _get_cache_generations(self, phone_numbers: Iterable[str]) -> Dict[str, int]:
+        """Taken before a db read, so a write landing during the read keeps its rows uncached."""
+        if self._contact_cache is None:
+            return {}
+        return self._contact_cache.get_generations(phone_numbers)
+
+    def _cache_contact(
+        self, contact_phone_number: str, contact: ContactResponse, generations: Dict[str, int]
+    ) -> None:
+        if self._contact_cache is not None:
+            self._contact_cache.set(
+                contact_phone_number, contact, generations[contact_phone_number]
+            )
+
+    def _get_cached_contacts(self, phone_numbers: Iterable[str]) -> Dict[str, ContactResponse]:
+        if self._contact_cache is None:
+            return {}
+        return self._contact_cache.get_many(phone_numbers)
+
+    def _cache_contacts(
+        self, contacts: Dict[str, ContactResponse], generations: Dict[str, int]
+    ) -> None:
+        if self._contact_cache is not None:
+            self._contact_cache.set_many(contacts, generations)
+
+    def _invalidate_cached_contacts(self, *contact_phone_numbers: str) -> None:
+        """Drop the cached contacts a write changed, under their old and new numbers."""
+        if self._contact_cache is not None:
+            self._contact_cache.delete(*contact_phone_numbers)
+
+    def _index_phone_numbers(self, added: Iterable[str] = (), removed: Iterable[str] = ()) -> None:
+        """Keep the in-memory phone number index in step with the writes of this worker."""
+        if self._phone_number_index is not None:
+            self._phone_number_index.remove(*removed)
+            self._phone_number_index.add(*added)
+
+    def _contacts_from_rows(self, contacts_rows: Sequence[Any]) -> List[Any]:
+        if self._fast_serialization:
+            return list(contacts_rows)
+        return [ContactResponse.from_orm(contact) for contact in contacts_rows]
+
+    def _build_response(self, response_class: Type[ResponseModel], **fields: Any) -> ResponseModel:
+        """Build a list response, unvalidated when FastJSONResponse encodes it from the rows."""
+        if self._fast_serialization:
+            return response_class.construct(**fields)
+        return response_class(**fields)
+
+    def _build_contacts_page(
+        self, contacts_list: Sequence[Any], limit_contacts_list: int, sort: ContactsSort
+    ) -> ContactsPageResponse:
+        return self._build_response(
+            ContactsPageResponse,
+            contacts=self._contacts_from_rows(contacts_list[:limit_contacts_list]),
+            next_cursor=get_next_page_cursor(contacts_list, limit_contacts_list, sort),
+        )
+
+    def _build_changes_page(
+        self, changes: Sequence[Any], limit: int, after: int
+    ) -> ContactsChangesResponse:
+        # The feed stops before the first settling change, so no later token skips it
+        settled_changes = list(takewhile(lambda change: not change.settling, changes))
+        page = settled_changes[:limit]
+        # A number deleted then added again has a tombstone older than its contact
+        changed_phone_numbers = {change.phone_number for change in page if not change.deleted}
+        return self._build_response(
+            ContactsChangesResponse,
+            contacts=self._contacts_from_rows([change for change in page if not change.deleted]),
+            deleted=[
+                change.phone_number
+                for change in page
+                if change.deleted and change.phone_number not in changed_phone_numbers
+            ],
+            next_token=encode_changes_token(page[-1].change_seq if page else after),
+            has_more=len(settled_changes) > limit,
+        )
+
+    def _build_search_page(
+        self, contacts_list: Sequence[Any], limit: int, offset: int, max_results: int
+    ) -> ContactsSearchResponse:
+        next_offset = offset + limit
+        has_next_page = len(contacts_list) > limit and next_offset < max_results
+        return self._build_response(
+            ContactsSearchResponse,
+            contacts=self._contacts_from_rows(contacts_list[:limit]),
+            next_offset=next_offset if has_next_page else None,
+        )
+
+    def _normalize_lookup(
+        self, phone_numbers: Sequence[str], max_size: int
+    ) -> Tuple[Dict[str, str], List[str]]:
+        """Validate a lookup in one pass.
+
+        Return the E.164 form of each requested number, and the invalid ones.
+        """
+        if len(phone_numbers) > max_size:
+            raise InvalidContactsLookup(
+                detail=f"A lookup resolves at most {max_size} phone numbers."
+            )
+        requested_phone_numbers: Dict[str, str] = {}
+        invalid_phone_numbers: List[str] = []
+        for phone_number in dict.fromkeys(phone_numbers):
+            try:
+                requested_phone_numbers[phone_number] = self._normalize_number(phone_number)
+            except InvalidContactNumber:
+                invalid_phone_numbers.append(phone_number)
+        return requested_phone_numbers, invalid_phone_numbers
+
+    def _build_lookup_response(
+        self,
+        requested_phone_numbers: Dict[str, str],
+        invalid_phone_numbers: List[str],
+        contacts: Dict[str, ContactResponse],
+    ) -> LookupContactsResponse:
+        return self._build_response(
+            LookupContactsResponse,
+            contacts={
+                requested_phone_number: contacts[phone_number]
+                for requested_phone_number, phone_number in requested_phone_numbers.items()
+                if phone_number in contacts
+            },
+            missing=[
+                requested_phone_number
+                for requested_phone_number, phone_number in requested_phone_numbers.items()
+                if phone_number not in contacts
+            ],
+            invalid=invalid_phone_numbers,
+        )
+
+    def _build_new_contact(self, contact_request: ContactRequest) -> Contacts:
+        """Validate an insert request and build the row to store."""
+        return Contacts(**self._build_new_contact_values(contact_request))
+
+    def _build_new_contact_values(
+        self, contact_request: ContactRequest
+    ) -> Dict[str, Optional[str]]:
+        """Validate an insert request and return the column values to store."""
+        phone_number = self._normalize_number(contact_request.phone_number)
+        self._is_valid_name(contact_request.first_name)
+        self._is_valid_name(contact_request.last_name)
+        contact_values = {
+            "phone_number": phone_number,
+            "first_name": contact_request.first_name,
+            "last_name": contact_request.last_name,
+            "email_address": None,
+        }
+        if contact_request.email_address and self._is_valid_email(contact_request.email_address):
+            contact_values["email_address"] = contact_request.email_address
+        return contact_values
+
+    def _validate_import_rows(
+        self, contact_rows: List[Any]
+    ) -> Tuple[List[ImportRowResult], List[Dict[str, Optional[str]]]]:
+        """Validate every import row, returning the per-row results and the rows to insert.
+
+        A phone number repeated within the payload is only inserted once, later rows are
+        reported as duplicates.
+        """
+        rows_results = []
+        new_contacts = []
+        seen_phone_numbers: Set[str] = set()
+        for row_number, contact_row in enumerate(contact_rows, start=1):
+            try:
+                contact_values = self._build_new_contact_values(
+                    ContactRequest.parse_obj(contact_row)
+                )
+            except (ValidationError, InvalidContactParams) as error:
+                rows_results.append(
+                    ImportRowResult(
+                        row=row_number,
+                        phone_number=_get_row_phone_number(contact_row),
+                        status=ImportRowStatus.REJECTED,
+                        detail=_format_import_error(error),
+                    )
+                )
+                continue
+            phone_number = cast(str, contact_values["phone_number"])
+            if phone_number in seen_phone_numbers:
+                row_status = ImportRowStatus.DUPLICATE
+            else:
+                row_status = ImportRowStatus.ACCEPTED
+                seen_phone_numbers.add(phone_number)
+                new_contacts.append(contact_values)
+            rows_results.append(
+                ImportRowResult(row=row_number, phone_number=phone_number, status=row_status)
+            )
+        return rows_results, new_contacts
+
+    def _build_import_report(
+        self, rows_results: List[ImportRowResult], inserted_phone_numbers: Set[str]
+    ) -> ImportContactsResponse:
+        """Mark the valid rows the database skipped as duplicates and count the outcomes."""
+        status_counter: Counter[ImportRowStatus] = Counter()
+        for row_result in rows_results:
+            if (
+                row_result.status == ImportRowStatus.ACCEPTED
+                and row_result.phone_number not in inserted_phone_numbers
+            ):
+                row_result.status = ImportRowStatus.DUPLICATE
+            status_counter[row_result.status] += 1
+        return ImportContactsResponse(
+            accepted=status_counter[ImportRowStatus.ACCEPTED],
+            rejected=status_counter[ImportRowStatus.REJECTED],
+            duplicates=status_counter[ImportRowStatus.DUPLICATE],
+            rows=rows_results,
+        )
+
+    def _build_update_values(
+        self, contact_data_update_request: UpdateContactRequest
+    ) -> Dict[str, str]:
+        """Validate the fields of an update request and return the columns to change."""
+        contact_values = {}
+        if contact_data_update_request.phone_number:
+            contact_values["phone_number"] = self._normalize_number(
+                contact_data_update_request.phone_number
+            )
+        if contact_data_update_request.first_name and self._is_valid_name(
+            contact_data_update_request.first_name
+        ):
+            contact_values["first_name"] = contact_data_update_request.first_name
+        if contact_data_update_request.last_name and self._is_valid_name(
+            contact_data_update_request.last_name
+        ):
+            contact_values["last_name"] = contact_data_update_request.last_name
+        if contact_data_update_request.email_address and self._is_valid_email(
+            contact_data_update_request.email_address
+        ):
+            contact_values["email_address"] = contact_data_update_request.email_address
+        return contact_values
+
+    @VALIDATION_SECONDS.time("phone_number")
+    def _normalize_number(self, phone_number: str) -> str:
+        """Validate a phone number once per request and return its E.164 form."""
+        return normalize_phone_number(phone_number)
+
+    @VALIDATION_SECONDS.time("email_address")
+    def _is_valid_email(self, email: str) -> bool:
+        validate_email(email)
+        return True
+
+    @VALIDATION_SECONDS.time("name")
+    def _is_valid_name(self, name: str) -> bool:
+        validate_name(name)
+        return True
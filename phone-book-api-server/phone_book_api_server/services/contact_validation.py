@@ -0,0 +1,49 @@
+"""Validation of contact fields, shared by every request of the service."""
+
+import re
+from functools import lru_cache
+from typing import Optional
+
+import phonenumbers
+
+from phone_book_api_server.exceptions.contact import (
+    InvalidContactEmail,
+    InvalidContactName,
+    InvalidContactNumber,
+)
+
+EMAIL_PATTERN = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+# Distinct phone numbers whose parsing is remembered, the same few are looked up over and over
+PHONE_NUMBER_MEMO_SIZE = 65536
+
+
+@lru_cache(maxsize=PHONE_NUMBER_MEMO_SIZE)
+def _parse_phone_number(phone_number: str) -> Optional[str]:
+    # Invalid numbers are memoized as None so repeating them stays cheap too
+    try:
+        parsed_number = phonenumbers.parse(phone_number, None)
+    except phonenumbers.NumberParseException:
+        return None
+    if not phonenumbers.is_valid_number(parsed_number):
+        return None
+    return phonenumbers.format_number(parsed_number, phonenumbers.PhoneNumberFormat.E164)
+
+
+def normalize_phone_number(phone_number: str) -> str:
+    """Validate an international phone number and return it in E.164 format."""
+    normalized_phone_number = _parse_phone_number(phone_number)
+    if normalized_phone_number is None:
+        raise InvalidContactNumber(detail="Invalid phone number.")
+    return normalized_phone_number
+
+
+def validate_email(email: str) -> str:
+    if not EMAIL_PATTERN.match(email):
+        raise InvalidContactEmail(detail="Invalid contact email address.")
+    return email
+
+
+def validate_name(name: str) -> str:
+    if not name.isalpha():
+        raise InvalidContactName(detail="Invalid contact name.")
+    return name
@@ -0,0 +1,60 @@
+"""Opaque cursors for keyset pagination of contacts and of their changes feed."""
+
+import base64
+import json
+from typing import Any, List, Optional, Sequence
+
+from phone_book_api_server.data_models.contacts import ContactsSort
+from phone_book_api_server.database.statements import CONTACT_SORT_COLUMNS
+from phone_book_api_server.exceptions.contact import InvalidPageCursor
+
+CHANGES_TOKEN_KIND = "changes"
+
+
+def encode_page_cursor(sort: ContactsSort, last_row: Any) -> str:
+    """Encode the sort keys of the last row of a page."""
+    keys = [getattr(last_row, column.key) for column in CONTACT_SORT_COLUMNS[sort]]
+    payload = json.dumps([sort.value, *keys], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def decode_page_cursor(cursor: str, sort: ContactsSort) -> List[str]:
+    """Decode a cursor made by `encode_page_cursor` for the same sort."""
+    try:
+        padded_cursor = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, *keys = json.loads(base64.urlsafe_b64decode(padded_cursor))
+    except (ValueError, TypeError) as error:
+        raise InvalidPageCursor(detail="Invalid page cursor.") from error
+    if cursor_sort != sort.value or len(keys) != len(CONTACT_SORT_COLUMNS[sort]):
+        raise InvalidPageCursor(detail="The page cursor does not match the requested sort.")
+    if not all(isinstance(key, str) for key in keys):
+        raise InvalidPageCursor(detail="Invalid page cursor.")
+    page_keys: List[str] = keys
+    return page_keys
+
+
+def get_next_page_cursor(
+    contacts_rows: Sequence[Any], limit: int, sort: ContactsSort
+) -> Optional[str]:
+    """Return the cursor of the next page when more rows than `limit` were fetched."""
+    if len(contacts_rows) <= limit:
+        return None
+    return encode_page_cursor(sort, contacts_rows[limit - 1])
+
+
+def encode_changes_token(change_seq: int) -> str:
+    """Encode a position of the changes feed."""
+    payload = json.dumps([CHANGES_TOKEN_KIND, change_seq], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def decode_changes_token(token: str) -> int:
+    """Decode a token made by `encode_changes_token`."""
+    try:
+        padded_token = token + "=" * (-len(token) % 4)
+        token_kind, change_seq = json.loads(base64.urlsafe_b64decode(padded_token))
+    except (ValueError, TypeError) as error:
+        raise InvalidPageCursor(detail="Invalid changes token.") from error
+    if token_kind != CHANGES_TOKEN_KIND or not isinstance(change_seq, int) or change_seq < 0:
+        raise InvalidPageCursor(detail="Invalid changes token.")
+    return change_seq
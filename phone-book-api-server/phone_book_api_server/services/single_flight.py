@@ -0,0 +1,96 @@
+"""Coalescing of concurrent identical calls, so a burst on one key runs the call once."""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar, cast
+
+from phone_book_api_server.data_models.single_flight import SingleFlightStatsResponse
+
+T = TypeVar("T")
+
+
+class _Call:
+    """A running call, and its outcome once done."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Single-flight for the threadpool: callers of a running key wait for its result.
+
+    The first caller of a key runs the call, the callers arriving while it runs block
+    until it is done and get the same result or exception. Results are not kept after.
+    """
+
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__calls: Dict[Hashable, _Call] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, function: Callable[..., T], *args: Any) -> T:
+        with self.__lock:
+            running_call = self.__calls.get(key)
+            if running_call is None:
+                call = self.__calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+        if running_call is not None:
+            running_call.done.wait()
+            if running_call.error is not None:
+                raise running_call.error
+            return cast(T, running_call.result)
+        try:
+            result = call.result = function(*args)
+            return result
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self.__lock:
+                del self.__calls[key]
+            call.done.set()
+
+    def stats(self) -> SingleFlightStatsResponse:
+        with self.__lock:
+            return SingleFlightStatsResponse(
+                in_flight=len(self.__calls), executions=self.executions, coalesced=self.coalesced
+            )
+
+
+class AsyncSingleFlight:
+    """Single-flight for the event loop: callers of a running key await the same task.
+
+    The call runs in its own task, so a caller cancelled mid-way (a client hanging up) does
+    not cancel the call for the callers still waiting on it.
+    """
+
+    def __init__(self) -> None:
+        self.__calls: Dict[Hashable, "asyncio.Task[Any]"] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, function: Callable[..., Awaitable[T]], *args: Any) -> T:
+        call = self.__calls.get(key)
+        if call is None:
+            call = self.__calls[key] = asyncio.ensure_future(function(*args))
+            call.add_done_callback(lambda finished_call: self.__finish(key, finished_call))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(call)
+
+    def stats(self) -> SingleFlightStatsResponse:
+        return SingleFlightStatsResponse(
+            in_flight=len(self.__calls), executions=self.executions, coalesced=self.coalesced
+        )
+
+    def __finish(self, key: Hashable, call: "asyncio.Task[Any]") -> None:
+        del self.__calls[key]
+        # Mark the error as retrieved even when every caller was cancelled before it came
+        if not call.cancelled():
+            call.exception()
@@ -1,3 +1,6 @@
+from typing import Dict
+
+import fakeredis
 import pytest
 
 from phone_book_api_server.clients.db_client import PostgreSQLClient
@@ -35,10 +38,23 @@ def dummy_limit_pagination_feature() -> int:
 
 
 @pytest.fixture()
-def update_contact_data_response() -> ContactResponse:
+def update_contact_values() -> Dict[str, str]:
+    """Dummy Columns To Update."""
+    return {"phone_number": "+972546643567", "first_name": "updatedname"}
+
+
+@pytest.fixture()
+def fake_redis_server() -> fakeredis.FakeServer:
+    """In-process Redis server shared by the clients of one test."""
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture()
+def dummy_cached_contact() -> ContactResponse:
+    """Dummy Contact To Cache."""
     return ContactResponse(
         phone_number="+972546643567",
         first_name="dummyname",
         last_name="dummyname",
-        email_address="dummy@dummy.com",
+        email_address="dummy@mail.com",
     )
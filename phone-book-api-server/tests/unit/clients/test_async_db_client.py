@@ -0,0 +1,175 @@
+import asyncio
+from typing import Dict
+
+import pytest
+import testing.postgresql
+from sqlalchemy.engine import make_url
+
+from phone_book_api_server.clients.async_db_client import AsyncPostgreSQLClient
+from phone_book_api_server.data_models.contacts import ContactResponse
+from phone_book_api_server.database.models import Contacts
+from phone_book_api_server.exceptions.contact import ContactAlreadyExist, ContactNotFoundError
+
+
+def async_url(psql: testing.postgresql.Postgresql) -> str:
+    url = make_url(psql.url()).set(drivername="postgresql+asyncpg")
+    return url.render_as_string(hide_password=False)
+
+
+def test_insert_and_get_contact_async_client(dummy_contact_insert_request: Contacts) -> None:
+    """Test Insert And Get Contact Async Client."""
+
+    async def scenario() -> ContactResponse:
+        postgres_obj = AsyncPostgreSQLClient(async_url(psql))
+        await postgres_obj.create_schema()
+        inserted_contact = await postgres_obj.insert_contact(dummy_contact_insert_request)
+        assert inserted_contact.phone_number == dummy_contact_insert_request.phone_number
+        contact = await postgres_obj.get_contact(dummy_contact_insert_request.phone_number)
+        await postgres_obj.close()
+        return contact
+
+    with testing.postgresql.Postgresql(port=7654) as psql:
+        # Act
+        contact = asyncio.run(scenario())
+
+    # Assert
+    assert contact.first_name == dummy_contact_insert_request.first_name
+
+
+def test_insert_contact_async_client_error(dummy_contact_insert_request: Contacts) -> None:
+    """Test Insert Duplicate Contact Async Client."""
+
+    async def scenario() -> None:
+        postgres_obj = AsyncPostgreSQLClient(async_url(psql))
+        await postgres_obj.create_schema()
+        await postgres_obj.insert_contact(dummy_contact_insert_request)
+        try:
+            await postgres_obj.insert_contact(
+                Contacts(
+                    phone_number=dummy_contact_insert_request.phone_number,
+                    first_name="other",
+                    last_name="other",
+                )
+            )
+        finally:
+            await postgres_obj.close()
+
+    with testing.postgresql.Postgresql(port=7654) as psql:
+        # Act & Assert
+        with pytest.raises(ContactAlreadyExist):
+            asyncio.run(scenario())
+
+
+def test_get_contacts_list_async_client(
+    dummy_contact_insert_request: Contacts, dummy_limit_pagination_feature: int
+) -> None:
+    """Test Get Contacts List Async Client."""
+
+    async def scenario() -> list:
+        postgres_obj = AsyncPostgreSQLClient(async_url(psql))
+        await postgres_obj.create_schema()
+        await postgres_obj.insert_contact(dummy_contact_insert_request)
+        contacts_list = await postgres_obj.get_contacts(dummy_limit_pagination_feature)
+        await postgres_obj.close()
+        return contacts_list
+
+    with testing.postgresql.Postgresql(port=7654) as psql:
+        # Act
+        contacts_list = asyncio.run(scenario())
+
+    # Assert
+    assert len(contacts_list) == 1
+
+
+def test_update_and_delete_contact_async_client(
+    dummy_contact_insert_request: Contacts, update_contact_values: Dict[str, str]
+) -> None:
+    """Test Update And Delete Contact Async Client."""
+
+    async def scenario() -> None:
+        postgres_obj = AsyncPostgreSQLClient(async_url(psql))
+        await postgres_obj.create_schema()
+        await postgres_obj.insert_contact(dummy_contact_insert_request)
+        updated_contact = await postgres_obj.update_contact(
+            dummy_contact_insert_request.phone_number, update_contact_values
+        )
+        assert updated_contact.first_name == update_contact_values["first_name"]
+        assert await postgres_obj.delete_contact(updated_contact.phone_number)
+        assert not await postgres_obj.delete_contact(updated_contact.phone_number)
+        try:
+            await postgres_obj.get_contact(updated_contact.phone_number)
+        finally:
+            await postgres_obj.close()
+
+    with testing.postgresql.Postgresql(port=7654) as psql:
+        # Act & Assert
+        with pytest.raises(ContactNotFoundError):
+            asyncio.run(scenario())
+
+
+def test_stream_contacts_async_client(dummy_contact_insert_request: Contacts) -> None:
+    """Test Stream Contacts Async Client."""
+
+    async def scenario() -> list:
+        postgres_obj = AsyncPostgreSQLClient(async_url(psql))
+        await postgres_obj.create_schema()
+        await postgres_obj.insert_contact(dummy_contact_insert_request)
+        batches = [batch async for batch in postgres_obj.stream_contacts(batch_size=10)]
+        await postgres_obj.close()
+        return batches
+
+    with testing.postgresql.Postgresql(port=7654) as psql:
+        # Act
+        batches = asyncio.run(scenario())
+
+    # Assert
+    assert len(batches) == 1
+    assert batches[0][0].phone_number == dummy_contact_insert_request.phone_number
+
+
+def test_get_contacts_by_phone_numbers_async_client(
+    dummy_contact_insert_request: Contacts,
+) -> None:
+    """Test Get Contacts By Phone Numbers Async Client."""
+
+    async def scenario() -> list:
+        postgres_obj = AsyncPostgreSQLClient(async_url(psql))
+        await postgres_obj.create_schema()
+        await postgres_obj.insert_contact(dummy_contact_insert_request)
+        contacts_list = await postgres_obj.get_contacts_by_phone_numbers(
+            [dummy_contact_insert_request.phone_number, "+12025550100"]
+        )
+        await postgres_obj.close()
+        return contacts_list
+
+    with testing.postgresql.Postgresql(port=7654) as psql:
+        # Act
+        contacts_list = asyncio.run(scenario())
+
+    # Assert
+    assert [contact.phone_number for contact in contacts_list] == [
+        dummy_contact_insert_request.phone_number
+    ]
+
+
+def test_get_contacts_changes_async_client(dummy_contact_insert_request: Contacts) -> None:
+    """Test Get Contacts Changes Async Client Reports A Deleted Contact."""
+
+    async def scenario() -> list:
+        postgres_obj = AsyncPostgreSQLClient(async_url(psql))
+        await postgres_obj.create_schema()
+        try:
+            await postgres_obj.insert_contact(dummy_contact_insert_request)
+            await postgres_obj.delete_contact(dummy_contact_insert_request.phone_number)
+            return await postgres_obj.get_contacts_changes(0, 10, 0)
+        finally:
+            await postgres_obj.close()
+
+    with testing.postgresql.Postgresql(port=7654) as psql:
+        # Act
+        changes = asyncio.run(scenario())
+
+    # Assert
+    assert [(change.phone_number, change.deleted) for change in changes] == [
+        (dummy_contact_insert_request.phone_number, True)
+    ]
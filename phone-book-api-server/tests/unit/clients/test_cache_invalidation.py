@@ -0,0 +1,77 @@
+import time
+
+import fakeredis
+
+from phone_book_api_server.clients.cache_invalidation import (
+    BroadcastContactCache,
+    BroadcastPhoneNumberIndex,
+    InProcessInvalidationBroker,
+    RedisInvalidationBroker,
+)
+from phone_book_api_server.clients.contact_cache import InMemoryContactCache
+from phone_book_api_server.clients.phone_number_index import PhoneNumberIndex
+from phone_book_api_server.data_models.contacts import ContactResponse
+
+
+def test_broadcast_contact_cache_invalidates_other_workers(
+    dummy_cached_contact: ContactResponse,
+) -> None:
+    """Test A Write On One Worker Drops The Contact From The Other Workers' Caches."""
+    # Arrange
+    broker = InProcessInvalidationBroker()
+    first_worker_cache = BroadcastContactCache(InMemoryContactCache(), broker)
+    second_worker_cache = BroadcastContactCache(InMemoryContactCache(), broker)
+    second_worker_cache.set(dummy_cached_contact.phone_number, dummy_cached_contact)
+
+    # Act
+    first_worker_cache.delete(dummy_cached_contact.phone_number)
+
+    # Assert
+    assert second_worker_cache.get(dummy_cached_contact.phone_number) is None
+    assert second_worker_cache.stats().invalidations == 1
+
+
+def test_redis_invalidation_broker(
+    fake_redis_server: fakeredis.FakeServer, dummy_cached_contact: ContactResponse
+) -> None:
+    """Test Redis Invalidation Broker Delivers Writes Over Pub/Sub."""
+    # Arrange
+    first_worker_cache = BroadcastContactCache(
+        InMemoryContactCache(),
+        RedisInvalidationBroker(fakeredis.FakeRedis(server=fake_redis_server)),
+    )
+    second_worker_cache = BroadcastContactCache(
+        InMemoryContactCache(),
+        RedisInvalidationBroker(fakeredis.FakeRedis(server=fake_redis_server)),
+    )
+    second_worker_cache.set(dummy_cached_contact.phone_number, dummy_cached_contact)
+
+    # Act
+    first_worker_cache.delete(dummy_cached_contact.phone_number)
+    deadline = time.monotonic() + 5
+    while second_worker_cache.stats().size and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # Assert
+    try:
+        assert second_worker_cache.stats().size == 0
+    finally:
+        first_worker_cache.close()
+        second_worker_cache.close()
+
+
+def test_broadcast_phone_number_index_reaches_other_workers() -> None:
+    """Test A Write On One Worker Reaches The Phone Number Indexes Of The Other Workers."""
+    # Arrange
+    broker = InProcessInvalidationBroker()
+    first_worker_index = BroadcastPhoneNumberIndex(PhoneNumberIndex(), broker)
+    second_worker_index = BroadcastPhoneNumberIndex(PhoneNumberIndex(), broker)
+    second_worker_index.add("+972546643560")
+
+    # Act
+    first_worker_index.add("+972546643561", "+972546643562")
+    first_worker_index.remove("+972546643560")
+
+    # Assert
+    assert second_worker_index.search("972", limit=10) == (["+972546643561", "+972546643562"], 2)
+    assert first_worker_index.search("972", limit=10) == (["+972546643561", "+972546643562"], 2)
@@ -0,0 +1,108 @@
+from unittest import mock
+
+from phone_book_api_server.clients.contact_cache import InMemoryContactCache
+from phone_book_api_server.data_models.contacts import ContactResponse
+
+
+def _contact(phone_number: str) -> ContactResponse:
+    return ContactResponse(phone_number=phone_number, first_name="dummy", last_name="dummy")
+
+
+def test_contact_cache_hit_and_miss() -> None:
+    """Test Contact Cache Counts Hits And Misses."""
+    # Arrange
+    contact_cache = InMemoryContactCache(max_size=2, ttl=60)
+    contact = _contact("+972546643567")
+    contact_cache.set(contact.phone_number, contact)
+
+    # Act
+    cached_contact = contact_cache.get(contact.phone_number)
+    missing_contact = contact_cache.get("+972546643568")
+
+    # Assert
+    assert cached_contact == contact
+    assert missing_contact is None
+    stats = contact_cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+
+
+def test_contact_cache_evicts_least_recently_used() -> None:
+    """Test Contact Cache Evicts The Least Recently Used Contact When Full."""
+    # Arrange
+    contact_cache = InMemoryContactCache(max_size=2, ttl=60)
+    for phone_number in ("+972546643560", "+972546643561"):
+        contact_cache.set(phone_number, _contact(phone_number))
+    contact_cache.get("+972546643560")
+
+    # Act
+    contact_cache.set("+972546643562", _contact("+972546643562"))
+
+    # Assert
+    assert contact_cache.get("+972546643561") is None
+    assert contact_cache.get("+972546643560") is not None
+    assert contact_cache.stats().evictions == 1
+
+
+def test_contact_cache_expires_entries() -> None:
+    """Test Contact Cache Drops Contacts Older Than Their Time To Live."""
+    # Arrange
+    contact_cache = InMemoryContactCache(max_size=2, ttl=60)
+    with mock.patch("time.monotonic", return_value=100):
+        contact_cache.set("+972546643567", _contact("+972546643567"))
+
+    # Act
+    with mock.patch("time.monotonic", return_value=161):
+        cached_contact = contact_cache.get("+972546643567")
+
+    # Assert
+    assert cached_contact is None
+    stats = contact_cache.stats()
+    assert (stats.expirations, stats.misses, stats.size) == (1, 1, 0)
+
+
+def test_contact_cache_delete_and_disabled() -> None:
+    """Test Contact Cache Invalidation And A Cache Of Size Zero."""
+    # Arrange
+    contact_cache = InMemoryContactCache(max_size=2, ttl=60)
+    disabled_cache = InMemoryContactCache(max_size=0, ttl=60)
+    contact_cache.set("+972546643567", _contact("+972546643567"))
+    disabled_cache.set("+972546643567", _contact("+972546643567"))
+
+    # Act
+    contact_cache.delete("+972546643567", "+972546643568")
+
+    # Assert
+    assert contact_cache.get("+972546643567") is None
+    assert contact_cache.stats().invalidations == 1
+    assert disabled_cache.stats().size == 0
+
+
+def test_contact_cache_skips_contacts_invalidated_during_their_read() -> None:
+    """Test Contact Cache Leaves Out A Contact Read Before A Write Invalidated It."""
+    # Arrange
+    contact_cache = InMemoryContactCache(max_size=2, ttl=60)
+    generations = contact_cache.get_generations(["+972546643567", "+972546643568"])
+    contact_cache.delete("+972546643567")
+
+    # Act
+    contact_cache.set("+972546643567", _contact("+972546643567"), generations["+972546643567"])
+    contact_cache.set("+972546643568", _contact("+972546643568"), generations["+972546643568"])
+
+    # Assert
+    assert contact_cache.get("+972546643567") is None
+    assert contact_cache.get("+972546643568") is not None
+
+
+def test_contact_cache_skips_reads_older_than_its_invalidations_history() -> None:
+    """Test Contact Cache Leaves Out Reads It Can No Longer Tell Apart From Stale Ones."""
+    # Arrange
+    contact_cache = InMemoryContactCache(max_size=2, ttl=60)
+    generation = contact_cache.get_generations(["+972546643567"])["+972546643567"]
+
+    # Act
+    with mock.patch("phone_book_api_server.clients.contact_cache.INVALIDATIONS_HISTORY_SIZE", 1):
+        contact_cache.delete("+972546643568", "+972546643569")
+    contact_cache.set("+972546643567", _contact("+972546643567"), generation)
+
+    # Assert
+    assert contact_cache.get("+972546643567") is None
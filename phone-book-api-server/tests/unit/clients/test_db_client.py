@@ -1,11 +1,18 @@
+from typing import Dict, List
+
 import pytest
 import testing.postgresql
 from pytest_mock import MockerFixture
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker
 
 from phone_book_api_server.clients.db_client import PostgreSQLClient
-from phone_book_api_server.data_models.contacts import ContactResponse
+from phone_book_api_server.data_models.contacts import (
+    ContactResponse,
+    ContactSearchQuery,
+    ContactsSort,
+)
 from phone_book_api_server.database.models import Contacts
 from phone_book_api_server.exceptions.contact import ContactAlreadyExist, ContactNotFoundError
 
@@ -23,8 +30,17 @@ def test_insert_contact_client(
         mocker.patch("sqlalchemy.orm.sessionmaker", return_value=db)
         mocker.patch("sqlalchemy.create_engine", return_value=engine)
         postgres_obj = PostgreSQLClient()
+        postgres_obj.create_schema()
         # Act
-        postgres_obj.insert_contact(dummy_contact_insert_request)
+        contact_response = postgres_obj.insert_contact(dummy_contact_insert_request)
+
+    # Assert
+    assert contact_response == ContactResponse(
+        phone_number="+97252664887",
+        first_name="dummyname",
+        last_name="dummyname",
+        email_address="dummy@mail.com",
+    )
 
 
 def test_insert_contact_client_error(
@@ -39,9 +55,10 @@ def test_insert_contact_client_error(
         mocker.patch("sqlalchemy.orm.sessionmaker", return_value=db)
         mocker.patch("sqlalchemy.create_engine", return_value=engine)
         postgres_obj = PostgreSQLClient()
+        postgres_obj.create_schema()
         mock_session = mocker.Mock()
         mocker.patch.object(postgres_obj, "SessionLocal", return_value=mock_session)
-        mock_session.add.side_effect = Exception("Some error message")
+        mock_session.execute.side_effect = IntegrityError("INSERT", {}, Exception())
 
         # Act
         with pytest.raises(ContactAlreadyExist):
@@ -59,6 +76,7 @@ def test_get_contacts_list_client(
         mocker.patch("sqlalchemy.orm.sessionmaker", return_value=db)
         mocker.patch("sqlalchemy.create_engine", return_value=engine)
         postgres_obj = PostgreSQLClient()
+        postgres_obj.create_schema()
         # Act
         postgres_obj.get_contacts(dummy_limit_pagination_feature)
 
@@ -73,6 +91,7 @@ def test_get_contact_client(mocker: MockerFixture, dummy_phone_number: str) -> N
         mocker.patch("sqlalchemy.orm.sessionmaker", return_value=db)
         mocker.patch("sqlalchemy.create_engine", return_value=engine)
         postgres_obj = PostgreSQLClient()
+        postgres_obj.create_schema()
         mock_session = mocker.Mock()
         mocker.patch.object(postgres_obj, "SessionLocal", return_value=mock_session)
         mock_session.query.filter_by.one.return_value = None
@@ -90,6 +109,7 @@ def test_get_contact_client_error(mocker: MockerFixture, dummy_phone_number: str
         mocker.patch("sqlalchemy.orm.sessionmaker", return_value=db)
         mocker.patch("sqlalchemy.create_engine", return_value=engine)
         postgres_obj = PostgreSQLClient()
+        postgres_obj.create_schema()
         mock_session = mocker.Mock()
         mocker.patch.object(postgres_obj, "SessionLocal", return_value=mock_session)
         mock_session.query.side_effect = Exception
@@ -99,7 +119,9 @@ def test_get_contact_client_error(mocker: MockerFixture, dummy_phone_number: str
 
 
 def test_update_contact_client(
-    mocker: MockerFixture, dummy_phone_number: str, update_contact_data_response: ContactResponse
+    mocker: MockerFixture,
+    dummy_contact_insert_request: Contacts,
+    update_contact_values: Dict[str, str],
 ):
     """Test Update Contact Client."""
     # Arrange
@@ -110,15 +132,42 @@ def test_update_contact_client(
         mocker.patch("sqlalchemy.orm.sessionmaker", return_value=db)
         mocker.patch("sqlalchemy.create_engine", return_value=engine)
         postgres_obj = PostgreSQLClient()
-        mock_session = mocker.Mock()
-        mocker.patch.object(postgres_obj, "SessionLocal", return_value=mock_session)
-        mock_session.query.filter_by.update.return_value = None
+        postgres_obj.create_schema()
+        inserted_contact = postgres_obj.insert_contact(dummy_contact_insert_request)
         # Act
-        postgres_obj.update_contact(dummy_phone_number, update_contact_data_response)
+        contact_response = postgres_obj.update_contact(
+            dummy_contact_insert_request.phone_number, update_contact_values
+        )
+
+    # Assert
+    assert inserted_contact.version == 1
+    assert contact_response.version == 2
+    assert contact_response.updated_at >= inserted_contact.updated_at
+    assert contact_response.phone_number == update_contact_values["phone_number"]
+    assert contact_response.first_name == update_contact_values["first_name"]
+    assert contact_response.last_name == dummy_contact_insert_request.last_name
+
+
+def test_update_contact_client_not_found(
+    mocker: MockerFixture, dummy_phone_number: str, update_contact_values: Dict[str, str]
+):
+    """Test Update Missing Contact Client."""
+    # Arrange
+    with testing.postgresql.Postgresql(port=7654) as psql:
+        # Arrange
+        engine = create_engine(psql.url())
+        db = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        mocker.patch("sqlalchemy.orm.sessionmaker", return_value=db)
+        mocker.patch("sqlalchemy.create_engine", return_value=engine)
+        postgres_obj = PostgreSQLClient()
+        postgres_obj.create_schema()
+        # Act
+        with pytest.raises(ContactNotFoundError):
+            postgres_obj.update_contact(dummy_phone_number, update_contact_values)
 
 
 def test_update_contact_client_error(
-    mocker: MockerFixture, dummy_phone_number: str, update_contact_data_response: ContactResponse
+    mocker: MockerFixture, dummy_phone_number: str, update_contact_values: Dict[str, str]
 ):
     """Test Update Contact Client With Error."""
     # Arrange
@@ -129,17 +178,19 @@ def test_update_contact_client_error(
         mocker.patch("sqlalchemy.orm.sessionmaker", return_value=db)
         mocker.patch("sqlalchemy.create_engine", return_value=engine)
         postgres_obj = PostgreSQLClient()
+        postgres_obj.create_schema()
         mock_session = mocker.Mock()
         mocker.patch.object(postgres_obj, "SessionLocal", return_value=mock_session)
-        mock_session.query = Exception
+        mock_session.execute.side_effect = IntegrityError("UPDATE", {}, Exception())
         # Act
         with pytest.raises(ContactAlreadyExist):
-            postgres_obj.update_contact(dummy_phone_number, update_contact_data_response)
+            postgres_obj.update_contact(dummy_phone_number, update_contact_values)
 
 
-def test_delete_contact_client(mocker: MockerFixture, dummy_phone_number: str) -> None:
-    """Test Delete Contact Client."""
-    # Arrange
+def test_delete_contact_client(
+    mocker: MockerFixture, dummy_contact_insert_request: Contacts
+) -> None:
+    """Test Delete Contact Client Reports Whether The Contact Existed."""
     with testing.postgresql.Postgresql(port=7654) as psql:
         # Arrange
         engine = create_engine(psql.url())
@@ -147,8 +198,310 @@ def test_delete_contact_client(mocker: MockerFixture, dummy_phone_number: str) -
         mocker.patch("sqlalchemy.orm.sessionmaker", return_value=db)
         mocker.patch("sqlalchemy.create_engine", return_value=engine)
         postgres_obj = PostgreSQLClient()
-        mock_session = mocker.Mock()
-        mocker.patch.object(postgres_obj, "SessionLocal", return_value=mock_session)
-        mock_session.query.filter_by.delete.return_value = None
+        postgres_obj.create_schema()
+        postgres_obj.insert_contact(dummy_contact_insert_request)
+
+        # Act
+        deleted = postgres_obj.delete_contact(dummy_contact_insert_request.phone_number)
+        deleted_again = postgres_obj.delete_contact(dummy_contact_insert_request.phone_number)
+
+    # Assert
+    assert (deleted, deleted_again) == (True, False)
+
+
+def test_insert_contacts_client(mocker: MockerFixture) -> None:
+    """Test Bulk Insert Contacts Client Skips Existing Phone Numbers."""
+    with testing.postgresql.Postgresql(port=7654) as psql:
+        # Arrange
+        engine = create_engine(psql.url())
+        db = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        mocker.patch("sqlalchemy.orm.sessionmaker", return_value=db)
+        mocker.patch("sqlalchemy.create_engine", return_value=engine)
+        postgres_obj = PostgreSQLClient()
+        postgres_obj.create_schema()
+        new_contacts = [
+            {
+                "phone_number": f"+97254664356{digit}",
+                "first_name": "dummyname",
+                "last_name": "dummyname",
+                "email_address": None,
+            }
+            for digit in range(3)
+        ]
+        postgres_obj.insert_contacts(new_contacts[:1])
+
+        # Act
+        inserted_phone_numbers = postgres_obj.insert_contacts(new_contacts)
+
+    # Assert
+    assert sorted(inserted_phone_numbers) == ["+972546643561", "+972546643562"]
+
+
+def test_stream_contacts_client(mocker: MockerFixture) -> None:
+    """Test Stream Contacts Client Yields Every Contact In Batches."""
+    with testing.postgresql.Postgresql(port=7654) as psql:
+        # Arrange
+        engine = create_engine(psql.url())
+        db = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        mocker.patch("sqlalchemy.orm.sessionmaker", return_value=db)
+        mocker.patch("sqlalchemy.create_engine", return_value=engine)
+        postgres_obj = PostgreSQLClient()
+        postgres_obj.create_schema()
+        postgres_obj.insert_contacts(
+            [
+                {
+                    "phone_number": f"+97254664356{digit}",
+                    "first_name": "dummyname",
+                    "last_name": "dummyname",
+                    "email_address": None,
+                }
+                for digit in range(5)
+            ]
+        )
+
+        # Act
+        batches = list(postgres_obj.stream_contacts(batch_size=2))
+
+    # Assert
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert batches[0][0].phone_number == "+972546643560"
+
+
+def test_get_contacts_page_client(mocker: MockerFixture) -> None:
+    """Test Get Contacts Client Seeks Past The Previous Page In Name Order."""
+    with testing.postgresql.Postgresql(port=7654) as psql:
+        # Arrange
+        engine = create_engine(psql.url())
+        db = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        mocker.patch("sqlalchemy.orm.sessionmaker", return_value=db)
+        mocker.patch("sqlalchemy.create_engine", return_value=engine)
+        postgres_obj = PostgreSQLClient()
+        postgres_obj.create_schema()
+        postgres_obj.insert_contacts(
+            [
+                {
+                    "phone_number": f"+97254664356{digit}",
+                    "first_name": "dummyname",
+                    "last_name": last_name,
+                    "email_address": None,
+                }
+                for digit, last_name in enumerate(["c", "a", "b", "a"])
+            ]
+        )
+
+        # Act
+        contacts_list = postgres_obj.get_contacts(
+            2, ContactsSort.NAME, ["a", "dummyname", "+972546643561"]
+        )
+
+    # Assert
+    assert [contact.phone_number for contact in contacts_list] == [
+        "+972546643563",
+        "+972546643562",
+    ]
+
+
+@pytest.mark.parametrize(
+    "search_query, expected_phone_numbers",
+    [
+        pytest.param(
+            ContactSearchQuery(phone_prefix="+9725466435"),
+            ["+972546643560", "+972546643561", "+972546643562"],
+            id="phone_prefix",
+        ),
+        pytest.param(
+            ContactSearchQuery(name="Co"), ["+972546643560", "+972546643561"], id="name_prefix"
+        ),
+        pytest.param(
+            ContactSearchQuery(name="cohem", fuzzy=True),
+            ["+972546643560", "+972546643561"],
+            id="fuzzy_name",
+        ),
+    ],
+)
+def test_search_contacts_client(
+    mocker: MockerFixture, search_query: ContactSearchQuery, expected_phone_numbers: List[str]
+) -> None:
+    """Test Search Contacts Client By Phone Prefix, Name Prefix And Fuzzy Name."""
+    with testing.postgresql.Postgresql(port=7654) as psql:
+        # Arrange
+        engine = create_engine(psql.url())
+        db = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        mocker.patch("sqlalchemy.orm.sessionmaker", return_value=db)
+        mocker.patch("sqlalchemy.create_engine", return_value=engine)
+        postgres_obj = PostgreSQLClient()
+        postgres_obj.create_schema()
+        postgres_obj.insert_contacts(
+            [
+                {
+                    "phone_number": phone_number,
+                    "first_name": first_name,
+                    "last_name": last_name,
+                    "email_address": None,
+                }
+                for phone_number, first_name, last_name in [
+                    ("+972546643560", "Dana", "Cohen"),
+                    ("+972546643561", "Avi", "Cohn"),
+                    ("+972546643562", "Moshe", "Levi"),
+                    ("+12025550100", "John", "Smith"),
+                ]
+            ]
+        )
+
+        # Act
+        contacts_list = postgres_obj.search_contacts(search_query, limit=10)
+
+    # Assert
+    assert [contact.phone_number for contact in contacts_list] == expected_phone_numbers
+
+
+def test_stream_phone_numbers_client(mocker: MockerFixture) -> None:
+    """Test Stream Phone Numbers Client In Batches, In Phone Number Order."""
+    with testing.postgresql.Postgresql(port=7654) as psql:
+        # Arrange
+        engine = create_engine(psql.url())
+        db = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        mocker.patch("sqlalchemy.orm.sessionmaker", return_value=db)
+        mocker.patch("sqlalchemy.create_engine", return_value=engine)
+        postgres_obj = PostgreSQLClient()
+        postgres_obj.create_schema()
+        phone_numbers = ["+972546643562", "+12025550100", "+972546643560"]
+        postgres_obj.insert_contacts(
+            [
+                {
+                    "phone_number": phone_number,
+                    "first_name": "dummyname",
+                    "last_name": "dummyname",
+                    "email_address": None,
+                }
+                for phone_number in phone_numbers
+            ]
+        )
+
+        # Act
+        batches = list(postgres_obj.stream_phone_numbers(batch_size=2))
+
+    # Assert
+    assert batches == [["+12025550100", "+972546643560"], ["+972546643562"]]
+
+
+def test_get_contacts_by_phone_numbers_client(mocker: MockerFixture) -> None:
+    """Test Get Contacts By Phone Numbers Client In One Query."""
+    with testing.postgresql.Postgresql(port=7654) as psql:
+        # Arrange
+        engine = create_engine(psql.url())
+        db = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        mocker.patch("sqlalchemy.orm.sessionmaker", return_value=db)
+        mocker.patch("sqlalchemy.create_engine", return_value=engine)
+        postgres_obj = PostgreSQLClient()
+        postgres_obj.create_schema()
+        postgres_obj.insert_contacts(
+            [
+                {
+                    "phone_number": phone_number,
+                    "first_name": "dummyname",
+                    "last_name": "dummyname",
+                    "email_address": None,
+                }
+                for phone_number in ["+972546643560", "+972546643561", "+972546643562"]
+            ]
+        )
+
+        # Act
+        contacts_list = postgres_obj.get_contacts_by_phone_numbers(
+            ["+972546643562", "+972546643560", "+12025550100"]
+        )
+
+    # Assert
+    assert sorted(contact.phone_number for contact in contacts_list) == [
+        "+972546643560",
+        "+972546643562",
+    ]
+
+
+def test_get_contacts_changes_client(
+    mocker: MockerFixture,
+    dummy_contact_insert_request: Contacts,
+    update_contact_values: Dict[str, str],
+) -> None:
+    """Test Get Contacts Changes Client Merges Changed Contacts And Tombstones In Order."""
+    with testing.postgresql.Postgresql(port=7654) as psql:
+        # Arrange
+        engine = create_engine(psql.url())
+        db = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        mocker.patch("sqlalchemy.orm.sessionmaker", return_value=db)
+        mocker.patch("sqlalchemy.create_engine", return_value=engine)
+        postgres_obj = PostgreSQLClient()
+        postgres_obj.create_schema()
+        postgres_obj.insert_contacts(
+            [
+                {
+                    "phone_number": f"+97254664356{digit}",
+                    "first_name": "dummyname",
+                    "last_name": "dummyname",
+                    "email_address": None,
+                }
+                for digit in range(3)
+            ]
+        )
+        after = postgres_obj.get_contacts_changes(0, 10, 0)[-1].change_seq
+        postgres_obj.insert_contact(dummy_contact_insert_request)
+        postgres_obj.update_contact(
+            dummy_contact_insert_request.phone_number, update_contact_values
+        )
+        postgres_obj.delete_contact("+972546643560")
+
         # Act
-        postgres_obj.delete_contact(dummy_phone_number)
+        changes = postgres_obj.get_contacts_changes(after, 10, 0)
+        first_sync_changes = postgres_obj.get_contacts_changes(0, 10, 0, include_deleted=False)
+        settling_changes = postgres_obj.get_contacts_changes(after, 10, 3600)
+
+    # Assert
+    assert [(change.phone_number, change.deleted) for change in changes] == [
+        (update_contact_values["phone_number"], False),
+        (dummy_contact_insert_request.phone_number, True),
+        ("+972546643560", True),
+    ]
+    assert changes[0].version == 2
+    assert [change.change_seq for change in changes] == sorted(
+        change.change_seq for change in changes
+    )
+    assert not any(change.settling for change in changes)
+    assert all(change.settling for change in settling_changes)
+    assert {change.phone_number for change in first_sync_changes} == {
+        "+972546643561",
+        "+972546643562",
+        update_contact_values["phone_number"],
+    }
+
+
+def test_get_contacts_changes_client_holds_back_changes_after_running_transaction(
+    mocker: MockerFixture,
+    dummy_contact_insert_request: Contacts,
+    update_contact_values: Dict[str, str],
+) -> None:
+    """Test Get Contacts Changes Client Flags The Changes After A Transaction Still Running."""
+    with testing.postgresql.Postgresql(port=7654) as psql:
+        # Arrange
+        engine = create_engine(psql.url())
+        db = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        mocker.patch("sqlalchemy.orm.sessionmaker", return_value=db)
+        mocker.patch("sqlalchemy.create_engine", return_value=engine)
+        postgres_obj = PostgreSQLClient()
+        postgres_obj.create_schema()
+        postgres_obj.insert_contact(dummy_contact_insert_request)
+        with engine.connect() as running_connection:
+            # Holds a transaction id, as a long transaction that did not commit yet
+            running_connection.execute(text("SELECT pg_current_xact_id()"))
+            postgres_obj.update_contact(
+                dummy_contact_insert_request.phone_number, update_contact_values
+            )
+
+            # Act
+            running_changes = postgres_obj.get_contacts_changes(0, 10, 0)
+            running_connection.rollback()
+        changes = postgres_obj.get_contacts_changes(0, 10, 0)
+
+    # Assert
+    assert [change.settling for change in running_changes] == [True, True]
+    assert not any(change.settling for change in changes)
@@ -0,0 +1,131 @@
+import random
+from array import array
+from typing import List
+from unittest import mock
+
+from phone_book_api_server.clients.phone_number_index import (
+    PhoneNumberIndex,
+    decode_phone_number,
+    encode_phone_number,
+    merge_keys,
+)
+
+
+def _loaded_index(phone_numbers, merge_threshold: int = 65536) -> PhoneNumberIndex:
+    phone_number_index = PhoneNumberIndex(merge_threshold=merge_threshold)
+    phone_number_index_loader = phone_number_index.start_load()
+    phone_number_index_loader.add_batch(phone_numbers)
+    phone_number_index_loader.finish()
+    return phone_number_index
+
+
+def test_phone_number_keys_keep_phone_number_order() -> None:
+    """Test Phone Number Keys Sort Like The Phone Numbers And Decode Back."""
+    # Arrange
+    phone_numbers = ["+1", "+10", "+12025550100", "+2", "+972546643567", "+999999999999999"]
+
+    # Act
+    keys = [encode_phone_number(phone_number) for phone_number in phone_numbers]
+
+    # Assert
+    assert keys == sorted(keys)
+    assert [decode_phone_number(key) for key in keys] == phone_numbers
+    assert max(keys) < 2**64
+    assert encode_phone_number("0546643567") is None
+
+
+def test_phone_number_index_search() -> None:
+    """Test Phone Number Index Returns The First Matches Of A Prefix And Their Count."""
+    # Arrange
+    phone_number_index = _loaded_index(
+        ["+972546643562", "+12025550100", "+972546643560", "+972546643561", "+97254"]
+    )
+
+    # Act
+    phone_numbers, total = phone_number_index.search("9725466435", limit=2)
+
+    # Assert
+    assert phone_numbers == ["+972546643560", "+972546643561"]
+    assert total == 3
+    assert phone_number_index.search("44", limit=2) == ([], 0)
+    assert phone_number_index.stats().size == 5
+
+
+def test_phone_number_index_add_and_remove() -> None:
+    """Test Phone Number Index Searches Through Writes Before And After They Are Merged."""
+    # Arrange
+    phone_number_index = _loaded_index(["+972546643560", "+972546643562"], merge_threshold=3)
+
+    # Act
+    phone_number_index.add("+972546643561", "+972546643562")
+    phone_number_index.remove("+972546643560")
+    pending_search = phone_number_index.search("972", limit=10)
+    pending_writes = phone_number_index.stats().pending_writes
+    phone_number_index.add("+972546643563")
+    phone_number_index.wait_for_merge(timeout=5)
+    merged_search = phone_number_index.search("972", limit=10)
+
+    # Assert
+    assert pending_search == (["+972546643561", "+972546643562"], 2)
+    assert pending_writes == 2
+    assert merged_search == (["+972546643561", "+972546643562", "+972546643563"], 3)
+    assert phone_number_index.stats().pending_writes == 0
+
+
+def test_phone_number_index_keeps_writes_during_merge_and_load() -> None:
+    """Test Writes Made While A Merge Or A Load Runs Survive The Array It Swaps In."""
+    # Arrange
+    phone_number_index = _loaded_index(["+972546643560", "+972546643561"])
+    phone_number_index.remove("+972546643560")
+    phone_number_index_loader = phone_number_index.start_load()
+    phone_number_index_loader.add_batch(["+972546643561", "+972546643562"])
+
+    # Act
+    phone_number_index.add("+972546643563")
+    phone_number_index.remove("+972546643562")
+    phone_number_index_loader.finish()
+    loaded_search = phone_number_index.search("972", limit=10)
+    phone_number_index.merge()
+
+    # Assert
+    assert loaded_search == (["+972546643561", "+972546643563"], 2)
+    assert phone_number_index.search("972", limit=10) == loaded_search
+    assert phone_number_index.stats().pending_writes == 0
+
+
+def test_phone_number_index_merges_off_the_writes() -> None:
+    """Test Writes Go On While A Merge Builds The New Array, And Are Replayed On It."""
+    # Arrange
+    phone_number_index = _loaded_index(["+972546643560"])
+    phone_number_index.add("+972546643561")
+
+    def merge_keys_during_writes(keys: array, added: List[int], removed: List[int]) -> array:
+        phone_number_index.add("+972546643562")
+        phone_number_index.remove("+972546643561")
+        return merge_keys(keys, added, removed)
+
+    # Act
+    with mock.patch(
+        "phone_book_api_server.clients.phone_number_index.merge_keys",
+        side_effect=merge_keys_during_writes,
+    ):
+        phone_number_index.merge()
+
+    # Assert
+    assert phone_number_index.search("972", limit=10) == (["+972546643560", "+972546643562"], 2)
+    assert phone_number_index.stats().pending_writes == 2
+
+
+def test_phone_number_index_memory() -> None:
+    """Test Phone Number Index Takes About 8 Bytes A Phone Number."""
+    # Arrange
+    random_numbers = random.Random(0)
+    phone_numbers = [f"+97254{random_numbers.randrange(10**7):07d}" for _ in range(100000)]
+
+    # Act
+    stats = _loaded_index(phone_numbers).stats()
+
+    # Assert
+    assert stats.loaded
+    assert stats.bytes_per_number < 9
+    assert stats.load_seconds is not None
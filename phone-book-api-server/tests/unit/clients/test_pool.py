@@ -0,0 +1,99 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine, exc
+
+from phone_book_api_server.clients.pool import (
+    PoolMetrics,
+    TimedQueuePool,
+    dispose_after_fork,
+    get_engine_pool_options,
+    instrument_engine,
+)
+
+
+def test_get_engine_pool_options_defaults() -> None:
+    # Act
+    options = get_engine_pool_options(None)
+
+    # Assert
+    assert options == {
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30.0,
+        "pool_pre_ping": False,
+        "pool_recycle": -1,
+    }
+
+
+def test_get_engine_pool_options_from_config() -> None:
+    # Act
+    options = get_engine_pool_options({"size": 20, "pre_ping": True, "recycle": 1800})
+
+    # Assert
+    assert options["pool_size"] == 20
+    assert options["max_overflow"] == 10
+    assert options["pool_pre_ping"] is True
+    assert options["pool_recycle"] == 1800
+
+
+def test_pool_metrics_checkouts_and_timeouts() -> None:
+    # Arrange
+    engine = create_engine(
+        "sqlite://", poolclass=TimedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.01
+    )
+    metrics = PoolMetrics()
+    instrument_engine(engine, metrics)
+
+    # Act
+    connection = engine.connect()
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    in_use_status = metrics.snapshot(engine.pool)
+    connection.close()
+    status = metrics.snapshot(engine.pool)
+
+    # Assert
+    assert in_use_status.checked_out == 1
+    assert status.checked_out == 0
+    assert status.peak_checked_out == 1
+    assert status.checkouts == 1
+    assert status.connections_opened == 1
+    assert status.timeouts == 1
+    assert status.wait_time_max >= 0.01
+    assert status.pool_size == 1
+
+
+def test_pool_metrics_survive_dispose() -> None:
+    # Arrange
+    engine = create_engine("sqlite://", poolclass=TimedQueuePool)
+    metrics = PoolMetrics()
+    instrument_engine(engine, metrics)
+
+    # Act
+    engine.dispose()
+    engine.connect().close()
+
+    # Assert
+    assert engine.pool.metrics is metrics
+    assert metrics.snapshot(engine.pool).checkouts == 1
+
+
+def test_dispose_after_fork_gives_the_child_a_new_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Arrange
+    fork_handlers = []
+    monkeypatch.setattr(
+        os, "register_at_fork", lambda after_in_child: fork_handlers.append(after_in_child)
+    )
+    engine = create_engine("sqlite://", poolclass=TimedQueuePool)
+    parent_pool = engine.pool
+    parent_connection = engine.connect()
+
+    # Act
+    dispose_after_fork(engine)
+    fork_handlers[0]()
+
+    # Assert
+    assert engine.pool is not parent_pool
+    assert not parent_connection.closed
+    parent_connection.close()
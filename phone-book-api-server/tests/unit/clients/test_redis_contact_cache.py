@@ -0,0 +1,126 @@
+from datetime import datetime, timezone
+from unittest import mock
+
+import fakeredis
+import redis
+
+from phone_book_api_server.clients.redis_contact_cache import RedisContactCache
+from phone_book_api_server.data_models.contacts import ContactResponse
+
+
+def test_redis_contact_cache_shared_between_workers(
+    fake_redis_server: fakeredis.FakeServer, dummy_cached_contact: ContactResponse
+) -> None:
+    """Test Redis Contact Cache Serves One Worker's Contacts To Another."""
+    # Arrange
+    first_worker_cache = RedisContactCache(fakeredis.FakeRedis(server=fake_redis_server), ttl=60)
+    second_worker_cache = RedisContactCache(fakeredis.FakeRedis(server=fake_redis_server), ttl=60)
+    first_worker_cache.set(dummy_cached_contact.phone_number, dummy_cached_contact)
+
+    # Act
+    cached_contact = second_worker_cache.get(dummy_cached_contact.phone_number)
+    first_worker_cache.delete(dummy_cached_contact.phone_number)
+    deleted_contact = second_worker_cache.get(dummy_cached_contact.phone_number)
+
+    # Assert
+    assert cached_contact == dummy_cached_contact
+    assert deleted_contact is None
+    assert (second_worker_cache.stats().hits, second_worker_cache.stats().misses) == (1, 1)
+    assert first_worker_cache.stats().invalidations == 1
+
+
+def test_redis_contact_cache_expires_entries(
+    fake_redis_server: fakeredis.FakeServer, dummy_cached_contact: ContactResponse
+) -> None:
+    """Test Redis Contact Cache Sets The Time To Live On The Server."""
+    # Arrange
+    redis_client = fakeredis.FakeRedis(server=fake_redis_server)
+    contact_cache = RedisContactCache(redis_client, ttl=1.5, key_prefix="dummy:")
+
+    # Act
+    contact_cache.set(dummy_cached_contact.phone_number, dummy_cached_contact)
+
+    # Assert
+    assert 0 < redis_client.pttl(f"dummy:{dummy_cached_contact.phone_number}") <= 1500
+
+
+def test_redis_contact_cache_outage_is_a_miss(dummy_cached_contact: ContactResponse) -> None:
+    """Test Redis Contact Cache Falls Back To The Database When Redis Is Down."""
+    # Arrange
+    redis_client = mock.Mock(spec=redis.Redis)
+    redis_client.get.side_effect = redis.ConnectionError
+    redis_client.set.side_effect = redis.ConnectionError
+    contact_cache = RedisContactCache(redis_client)
+
+    # Act
+    contact_cache.set(dummy_cached_contact.phone_number, dummy_cached_contact)
+    cached_contact = contact_cache.get(dummy_cached_contact.phone_number)
+
+    # Assert
+    assert cached_contact is None
+    assert contact_cache.stats().misses == 1
+
+
+def test_redis_contact_cache_many(
+    fake_redis_server: fakeredis.FakeServer, dummy_cached_contact: ContactResponse
+) -> None:
+    """Test Redis Contact Cache Reads And Writes A Batch Of Contacts At Once."""
+    # Arrange
+    contact_cache = RedisContactCache(fakeredis.FakeRedis(server=fake_redis_server), ttl=60)
+    contact_cache.set_many({dummy_cached_contact.phone_number: dummy_cached_contact})
+
+    # Act
+    cached_contacts = contact_cache.get_many([dummy_cached_contact.phone_number, "+972546643568"])
+
+    # Assert
+    assert cached_contacts == {dummy_cached_contact.phone_number: dummy_cached_contact}
+    assert (contact_cache.stats().hits, contact_cache.stats().misses) == (1, 1)
+
+
+def test_redis_contact_cache_keeps_version(
+    fake_redis_server: fakeredis.FakeServer, dummy_cached_contact: ContactResponse
+) -> None:
+    """Test Redis Contact Cache Keeps The Version Left Out Of Contact Responses."""
+    # Arrange
+    cache = RedisContactCache(fakeredis.FakeRedis(server=fake_redis_server), ttl=60)
+    dummy_cached_contact.version = 3
+    dummy_cached_contact.updated_at = datetime(2024, 1, 1, 12, 30, tzinfo=timezone.utc)
+
+    # Act
+    cache.set(dummy_cached_contact.phone_number, dummy_cached_contact)
+    cached_contact = cache.get(dummy_cached_contact.phone_number)
+
+    # Assert
+    assert cached_contact is not None
+    assert cached_contact.version == 3
+    assert cached_contact.updated_at == dummy_cached_contact.updated_at
+
+
+def test_redis_contact_cache_skips_contacts_invalidated_during_their_read(
+    fake_redis_server: fakeredis.FakeServer, dummy_cached_contact: ContactResponse
+) -> None:
+    """Test Redis Contact Cache Leaves Out A Contact Another Worker Invalidated Meanwhile."""
+    # Arrange
+    first_worker_cache = RedisContactCache(fakeredis.FakeRedis(server=fake_redis_server), ttl=60)
+    second_worker_cache = RedisContactCache(fakeredis.FakeRedis(server=fake_redis_server), ttl=60)
+    phone_number = dummy_cached_contact.phone_number
+    other_contact = ContactResponse(
+        phone_number="+972546643568", first_name="dummyname", last_name="dummyname"
+    )
+    generations = first_worker_cache.get_generations([phone_number, other_contact.phone_number])
+    second_worker_cache.delete(phone_number)
+
+    # Act
+    first_worker_cache.set(phone_number, dummy_cached_contact, generations[phone_number])
+    first_worker_cache.set_many({other_contact.phone_number: other_contact}, generations)
+    stale_contact = first_worker_cache.get(phone_number)
+    fresh_generations = first_worker_cache.get_generations([phone_number])
+    first_worker_cache.set(phone_number, dummy_cached_contact, fresh_generations[phone_number])
+
+    # Assert
+    assert stale_contact is None
+    assert fresh_generations == {phone_number: 1}
+    assert first_worker_cache.get_many([phone_number, other_contact.phone_number]) == {
+        phone_number: dummy_cached_contact,
+        other_contact.phone_number: other_contact,
+    }
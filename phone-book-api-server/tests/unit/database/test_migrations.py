@@ -0,0 +1,67 @@
+import pytest
+import testing.postgresql
+from sqlalchemy import create_engine, insert, inspect, select, text
+from sqlalchemy.exc import IntegrityError
+
+from phone_book_api_server.database.migrations import migrate
+from phone_book_api_server.database.models import PHONE_NUMBER_CHECK_NAME, Base, Contacts
+
+
+def test_migrate_normalizes_phone_numbers() -> None:
+    """Test Migrate Backfills E.164 Phone Numbers And Adds The Missing Constraint And Indexes."""
+    with testing.postgresql.Postgresql(port=7654) as psql:
+        # Arrange
+        engine = create_engine(psql.url())
+        Base.metadata.create_all(engine)
+        with engine.begin() as connection:
+            connection.execute(
+                text(f"ALTER TABLE contacts DROP CONSTRAINT {PHONE_NUMBER_CHECK_NAME}")
+            )
+            connection.execute(text("DROP INDEX ix_contacts_first_name_trgm"))
+            connection.execute(text("ALTER TABLE contacts DROP COLUMN version"))
+            connection.execute(text("ALTER TABLE contacts DROP COLUMN change_seq"))
+            connection.execute(text("ALTER TABLE contacts DROP COLUMN change_xid"))
+            connection.execute(text("DROP TABLE contact_tombstones"))
+            connection.execute(
+                insert(Contacts),
+                [
+                    {"phone_number": phone_number, "first_name": "dummy", "last_name": "dummy"}
+                    for phone_number in (
+                        "+972 54-664-3567",
+                        "+972546643568",
+                        "+972-54-664-3568",
+                        "0546643569",
+                    )
+                ],
+            )
+
+        # Act
+        report = migrate(engine)
+        second_report = migrate(engine)
+
+        # Assert
+        with engine.begin() as connection:
+            phone_numbers = sorted(connection.scalars(select(Contacts.phone_number)))
+            versions = set(connection.scalars(select(Contacts.version)))
+            change_seqs = set(connection.scalars(select(Contacts.change_seq)))
+            change_xids = set(connection.scalars(select(Contacts.change_xid)))
+        index_names = {index["name"] for index in inspect(engine).get_indexes("contacts")}
+        with pytest.raises(IntegrityError):
+            with engine.begin() as connection:
+                connection.execute(
+                    insert(Contacts).values(
+                        phone_number="+972 54-664-3560", first_name="dummy", last_name="dummy"
+                    )
+                )
+        engine.dispose()
+
+    assert report.normalized == 1
+    assert report.conflicts == ["+972-54-664-3568"]
+    assert report.invalid == ["0546643569"]
+    assert second_report.normalized == 0
+    assert "ix_contacts_first_name_trgm" in index_names
+    assert versions == {1}
+    assert len(change_seqs) == 4
+    assert len(change_xids) == 1
+    assert "ix_contacts_change_seq" in index_names
+    assert phone_numbers == ["+972-54-664-3568", "+972546643567", "+972546643568", "0546643569"]
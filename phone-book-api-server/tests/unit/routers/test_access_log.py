@@ -0,0 +1,41 @@
+import logging
+
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+
+from phone_book_api_server.api.access_log import AccessLogMiddleware
+from phone_book_api_server.logs import RequestContextFilter
+
+
+def _create_app(sample_rate: float) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(AccessLogMiddleware, sample_rate=sample_rate)
+
+    @app.get("/dummy")
+    def dummy() -> dict:
+        # Sync routes run in the threadpool, the request context has to follow them there
+        record = logging.makeLogRecord({"levelno": logging.INFO})
+        return {"kept": RequestContextFilter().filter(record)}
+
+    return app
+
+
+def test_access_log_headers(api_client: TestClient) -> None:
+    # Act
+    response = api_client.get("/internal/cache", headers={"X-Request-ID": "dummy-id"})
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["X-Request-ID"] == "dummy-id"
+    assert float(response.headers["X-Process-Time"]) >= 0
+
+
+def test_access_log_samples_success_logs() -> None:
+    # Act
+    sampled_response = TestClient(_create_app(sample_rate=1.0)).get("/dummy")
+    unsampled_response = TestClient(_create_app(sample_rate=0.0)).get("/dummy")
+
+    # Assert
+    assert sampled_response.json() == {"kept": True}
+    assert unsampled_response.json() == {"kept": False}
+    assert len(unsampled_response.headers["X-Request-ID"]) == 8
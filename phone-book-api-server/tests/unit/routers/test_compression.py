@@ -0,0 +1,148 @@
+import asyncio
+import gzip
+import zlib
+from typing import Iterator, List
+
+import pytest
+from fastapi import FastAPI, status
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from starlette.types import Message
+
+from phone_book_api_server.api.compression import CompressionMiddleware, select_encoding
+
+LARGE_BODY = '{"firstName":"dummyname","lastName":"dummyname"}' * 100
+
+
+def _create_app(minimum_size: int = 1024) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, encodings=["gzip"], minimum_size=minimum_size)
+
+    @app.get("/large")
+    def large() -> PlainTextResponse:
+        return PlainTextResponse(LARGE_BODY, media_type="application/json")
+
+    @app.get("/small")
+    def small() -> dict:
+        return {"firstName": "dummyname"}
+
+    @app.get("/stream")
+    def stream() -> StreamingResponse:
+        return StreamingResponse(iter([b"first\n", b"second\n"]), media_type="application/x-ndjson")
+
+    return app
+
+
+def _decompress_stream(chunks: List[bytes]) -> Iterator[bytes]:
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        yield decompressor.decompress(chunk)
+
+
+def test_compression_large_response() -> None:
+    # Act
+    response = TestClient(_create_app()).get(
+        "/large", headers={"Accept-Encoding": "br;q=1, gzip;q=0.5"}
+    )
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert int(response.headers["Content-Length"]) < len(LARGE_BODY)
+    assert response.text == LARGE_BODY
+
+
+@pytest.mark.parametrize(
+    "path, accept_encoding",
+    [
+        ("/small", "gzip"),
+        ("/stream", "gzip"),
+        ("/large", "identity"),
+        ("/large", "gzip;q=0"),
+    ],
+)
+def test_compression_skipped(path: str, accept_encoding: str) -> None:
+    # Act
+    response = TestClient(_create_app()).get(path, headers={"Accept-Encoding": accept_encoding})
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["Vary"] == "Accept-Encoding"
+
+
+def test_compression_streaming_response() -> None:
+    """Test A Streamed Response Is Compressed Past The Minimum Size, Chunk By Chunk."""
+    # Arrange
+    messages: List[Message] = []
+    middleware = _create_app(minimum_size=8)
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/stream",
+        "raw_path": b"/stream",
+        "root_path": "",
+        "scheme": "http",
+        "query_string": b"",
+        "headers": [(b"accept-encoding", b"gzip")],
+        "server": ("testserver", 80),
+    }
+
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive() -> Message:
+        if requests:
+            return requests.pop()
+        # The client stays connected, until the response is streamed
+        await asyncio.sleep(60)
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    # Act
+    asyncio.run(middleware(scope, receive, send))
+
+    # Assert
+    headers = dict(messages[0]["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+    chunks = [message["body"] for message in messages[1:]]
+    # The first chunk is buffered until the minimum size, the second is flushed with it
+    assert list(_decompress_stream(chunks))[0] == b"first\nsecond\n"
+    assert gzip.decompress(b"".join(chunks)) == b"first\nsecond\n"
+    assert messages[-1].get("more_body", False) is False
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected_encoding",
+    [
+        ("gzip, br", "br"),
+        ("gzip, br;q=0", "gzip"),
+        ("*", "zstd"),
+        ("deflate", None),
+        ("", None),
+    ],
+)
+def test_select_encoding(accept_encoding: str, expected_encoding: str) -> None:
+    # Act & Assert
+    assert select_encoding(accept_encoding, ["zstd", "br", "gzip"]) == expected_encoding
+
+
+def test_compression_skips_uninstalled_encodings() -> None:
+    # Act
+    middleware = CompressionMiddleware(FastAPI(), encodings=["dummy", "gzip"])
+
+    # Assert
+    assert middleware.encodings == ["gzip"]
+
+
+def test_compression_app_responses(api_client: TestClient) -> None:
+    # Act
+    response = api_client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.json()["paths"]
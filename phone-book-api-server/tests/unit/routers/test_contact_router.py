@@ -1,23 +1,49 @@
 """Phone Book API Router Unit Tests."""
 
+import json
+from datetime import datetime, timezone
 from typing import Dict, List
+from unittest import mock
 from unittest.mock import Mock
 
+import msgpack
 import pytest
 from fastapi import status
 from fastapi.testclient import TestClient
+from httpx import Response
 
 from phone_book_api_server.api.server import app
-from phone_book_api_server.data_models.contacts import ContactResponse
+from phone_book_api_server.clients.contact_cache import InMemoryContactCache
+from phone_book_api_server.data_models.contacts import (
+    AutocompleteResponse,
+    ContactResponse,
+    ContactsChangesResponse,
+    ContactsPageResponse,
+    ContactsSearchResponse,
+    ContactsSort,
+    ExportFormat,
+    ImportContactsResponse,
+    LookupContactsResponse,
+)
 from phone_book_api_server.data_models.db import DeleteContactResponse
 from phone_book_api_server.exceptions.contact import (
     ContactAlreadyExist,
     ContactNotFoundError,
     InvalidContactParams,
+    InvalidContactsLookup,
+    InvalidPageCursor,
+    InvalidSearchQuery,
+    PhoneNumberIndexUnavailable,
 )
+from phone_book_api_server.services.async_contact_service import AsyncContactService
+from phone_book_api_server.services.contact_serialization import dump_json
 from phone_book_api_server.services.contact_service import ContactService
 
 
+def _vary(response: Response) -> List[str]:
+    return [value.strip() for value in response.headers["Vary"].split(",")]
+
+
 def test_create_contact_router(
     api_client: TestClient,
     dummy_contact_data: ContactResponse,
@@ -92,6 +118,99 @@ def test_get_contact_router(
     assert response.status_code == 200
 
 
+def test_get_contact_router_msgpack(
+    api_client: TestClient,
+    mock_contact_service: ContactService,
+    dummy_contact_data: ContactResponse,
+) -> None:
+    """Test Get Contact Router Sends MessagePack To Clients That Accept It."""
+    # Arrange
+    dummy_contact_data.version = 1
+    dummy_contact_data.updated_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    mock_contact_service.get_contact.return_value = dummy_contact_data
+
+    # Act
+    with app.extra["container"].contact_service.override(mock_contact_service):
+        response = api_client.get("/contacts/dummy_phone_number")
+        msgpack_response = api_client.get(
+            "/contacts/dummy_phone_number", headers={"Accept": "application/msgpack"}
+        )
+        json_response = api_client.get(
+            "/contacts/dummy_phone_number",
+            headers={"Accept": "application/msgpack;q=0.5, application/json"},
+        )
+
+    # Assert
+    assert msgpack_response.status_code == 200
+    assert msgpack_response.headers["content-type"] == "application/msgpack"
+    assert msgpack_response.headers["ETag"] == response.headers["ETag"]
+    assert "Accept" in _vary(msgpack_response)
+    assert msgpack.unpackb(msgpack_response.content) == response.json()
+    assert json_response.headers["content-type"] == "application/json"
+    assert "Accept" in _vary(json_response)
+
+
+def test_get_contact_router_conditional(
+    api_client: TestClient,
+    mock_contact_service: ContactService,
+    dummy_contact_data: ContactResponse,
+) -> None:
+    """Test Get Contact Router Answers 304 While The Client's ETag Is Current."""
+    # Arrange
+    dummy_contact_data.version = 1
+    dummy_contact_data.updated_at = datetime(2024, 1, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    mock_contact_service.get_contact.return_value = dummy_contact_data
+
+    # Act
+    with app.extra["container"].contact_service.override(mock_contact_service):
+        response = api_client.get("/contacts/dummy_phone_number")
+        not_modified_response = api_client.get(
+            "/contacts/dummy_phone_number", headers={"If-None-Match": response.headers["ETag"]}
+        )
+        stale_response = api_client.get(
+            "/contacts/dummy_phone_number", headers={"If-None-Match": 'W/"0-0", "1-0"'}
+        )
+        modified_since_response = api_client.get(
+            "/contacts/dummy_phone_number",
+            headers={"If-Modified-Since": response.headers["Last-Modified"]},
+        )
+
+    # Assert
+    assert response.status_code == 200
+    assert response.headers["ETag"].startswith('W/"1-')
+    assert response.headers["Last-Modified"] == "Mon, 01 Jan 2024 12:30:15 GMT"
+    assert "version" not in response.json()
+    assert not_modified_response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not_modified_response.content == b""
+    assert not_modified_response.headers["ETag"] == response.headers["ETag"]
+    assert stale_response.status_code == 200
+    assert modified_since_response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_get_contact_router_not_modified_from_cache(
+    api_client: TestClient, dummy_contact_data: ContactResponse
+) -> None:
+    """Test Get Contact Router Revalidates A Cached Contact Without Reading The Database."""
+    # Arrange
+    dummy_contact_data.version = 2
+    dummy_contact_data.updated_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    mock_db_client = Mock()
+    mock_db_client.get_contact.return_value = dummy_contact_data
+    contact_service = ContactService(mock_db_client, InMemoryContactCache())
+
+    # Act
+    with app.extra["container"].contact_service.override(contact_service):
+        response = api_client.get(f"/contacts/{dummy_contact_data.phone_number}")
+        not_modified_response = api_client.get(
+            f"/contacts/{dummy_contact_data.phone_number}",
+            headers={"If-None-Match": response.headers["ETag"]},
+        )
+
+    # Assert
+    assert not_modified_response.status_code == status.HTTP_304_NOT_MODIFIED
+    mock_db_client.get_contact.assert_called_once_with(dummy_contact_data.phone_number)
+
+
 @pytest.mark.parametrize(
     "error, expected_status_code",
     [
@@ -139,14 +258,88 @@ def test_get_contacts_list_router(
 ) -> None:
     """Test Get Contacts List Router."""
     # Arrange
-    mock_contact_service.get_contacts_list.return_value = dummy_contacts_list
+    mock_contact_service.get_contacts_list.return_value = ContactsPageResponse(
+        contacts=dummy_contacts_list, next_cursor="dummy_next_cursor"
+    )
 
     # Act
     with app.extra["container"].contact_service.override(mock_contact_service):
-        response = api_client.get("/contacts")
+        response = api_client.get(
+            "/contacts", params={"limit": 500, "cursor": "dummy_cursor", "sort": "name"}
+        )
 
     # Assert
     assert response.status_code == 200
+    assert response.json()["nextCursor"] == "dummy_next_cursor"
+    mock_contact_service.get_contacts_list.assert_called_once_with(
+        100, "dummy_cursor", ContactsSort.NAME
+    )
+
+
+def test_get_contacts_list_router_fast_json(
+    api_client: TestClient, dummy_contacts_list: List[ContactResponse]
+) -> None:
+    """Test Get Contacts List Router Sends The Same JSON Through The Fast Serialization."""
+    # Arrange
+    mock_db_client = Mock()
+    mock_db_client.get_contacts.return_value = dummy_contacts_list
+    container = app.extra["container"]
+
+    # Act
+    with container.contact_service.override(ContactService(mock_db_client)):
+        response = api_client.get("/contacts", params={"limit": 2})
+    with (
+        container.contact_service.override(ContactService(mock_db_client, fast_serialization=True)),
+        container.config.serialization.fast_json.override(True),
+        mock.patch(
+            "phone_book_api_server.api.responses.dump_json", wraps=dump_json
+        ) as spy_dump_json,
+    ):
+        fast_response = api_client.get("/contacts", params={"limit": 2})
+
+    # Assert
+    spy_dump_json.assert_called_once()
+    assert fast_response.status_code == 200
+    assert fast_response.headers["content-type"] == "application/json"
+    assert fast_response.content == response.content
+
+
+def test_get_contacts_list_router_msgpack(
+    api_client: TestClient, mock_contact_service: Mock, dummy_contacts_list: List[ContactResponse]
+) -> None:
+    """Test Get Contacts List Router Sends MessagePack To Clients That Accept It."""
+    # Arrange
+    mock_contact_service.get_contacts_list.return_value = ContactsPageResponse(
+        contacts=dummy_contacts_list, next_cursor="dummy_next_cursor"
+    )
+
+    # Act
+    with app.extra["container"].contact_service.override(mock_contact_service):
+        response = api_client.get("/contacts")
+        msgpack_response = api_client.get(
+            "/contacts", headers={"Accept": "application/x-msgpack, */*;q=0.1"}
+        )
+
+    # Assert
+    assert msgpack_response.status_code == 200
+    assert msgpack_response.headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(msgpack_response.content) == response.json()
+
+
+def test_get_contacts_list_router_invalid_cursor(
+    api_client: TestClient,
+    mock_contact_service: Mock,
+) -> None:
+    """Test Get Contacts List Router With An Invalid Cursor."""
+    # Arrange
+    mock_contact_service.get_contacts_list.side_effect = InvalidPageCursor("Invalid page cursor.")
+
+    # Act
+    with app.extra["container"].contact_service.override(mock_contact_service):
+        response = api_client.get("/contacts", params={"cursor": "dummy_cursor"})
+
+    # Assert
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
 
 
 def test_get_contacts_metadata_route_error(
@@ -285,3 +478,340 @@ def test_delete_contact_router_error(
 
     # Assert
     assert response.status_code == expected_status_code
+
+
+def test_get_contact_router_with_async_service(
+    api_client: TestClient,
+    dummy_contact_data: ContactResponse,
+) -> None:
+    """Test Get Contact Router With The Async Service."""
+    # Arrange
+    mock_async_contact_service = Mock(spec=AsyncContactService)
+    mock_async_contact_service.get_contact.return_value = dummy_contact_data
+
+    # Act
+    with app.extra["container"].contact_service.override(mock_async_contact_service):
+        response = api_client.get("/contacts/dummy_phone_number")
+
+    # Assert
+    assert response.status_code == 200
+    mock_async_contact_service.get_contact.assert_awaited_once_with("dummy_phone_number")
+
+
+def test_import_contacts_router(
+    api_client: TestClient,
+    mock_contact_service: Mock,
+    contact_route_create_request: Dict[str, str],
+) -> None:
+    """Test Import Contacts Router."""
+    # Arrange
+    mock_contact_service.import_contacts.return_value = ImportContactsResponse(
+        accepted=1, rejected=0, duplicates=0, rows=[]
+    )
+
+    # Act
+    with app.extra["container"].contact_service.override(mock_contact_service):
+        response = api_client.post(
+            "/contacts/bulk",
+            content=json.dumps([contact_route_create_request]),
+            headers={"Content-Type": "application/json"},
+        )
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    mock_contact_service.import_contacts.assert_called_once_with(
+        [contact_route_create_request], 1000
+    )
+
+
+@pytest.mark.parametrize(
+    "body, content_type, expected_status_code",
+    [
+        pytest.param(b"<contacts/>", "application/xml", 415, id="Unsupported Media Type [415]"),
+        pytest.param(b"[{", "application/json", 400, id="Bad Request [400]"),
+    ],
+)
+def test_import_contacts_router_error(
+    api_client: TestClient,
+    mock_contact_service: Mock,
+    body: bytes,
+    content_type: str,
+    expected_status_code: int,
+) -> None:
+    """Test Import Contacts Router With An Unreadable Payload."""
+    # Act
+    with app.extra["container"].contact_service.override(mock_contact_service):
+        response = api_client.post(
+            "/contacts/bulk", content=body, headers={"Content-Type": content_type}
+        )
+
+    # Assert
+    assert response.status_code == expected_status_code
+    mock_contact_service.import_contacts.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "export_format, expected_media_type",
+    [("ndjson", "application/x-ndjson"), ("csv", "text/csv; charset=utf-8")],
+)
+def test_export_contacts_router(
+    api_client: TestClient,
+    mock_contact_service: Mock,
+    export_format: str,
+    expected_media_type: str,
+) -> None:
+    """Test Export Contacts Router Streams The Service Chunks."""
+    # Arrange
+    mock_contact_service.export_contacts.return_value = iter([b"first\n", b"second\n"])
+
+    # Act
+    with app.extra["container"].contact_service.override(mock_contact_service):
+        response = api_client.get("/contacts/export", params={"format": export_format})
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == expected_media_type
+    assert response.content == b"first\nsecond\n"
+    mock_contact_service.export_contacts.assert_called_once_with(ExportFormat(export_format), 1000)
+
+
+@pytest.mark.parametrize(
+    "accept, expected_format",
+    [
+        ("application/msgpack", ExportFormat.MSGPACK),
+        ("*/*", ExportFormat.NDJSON),
+    ],
+)
+def test_export_contacts_router_negotiated_format(
+    api_client: TestClient,
+    mock_contact_service: Mock,
+    accept: str,
+    expected_format: ExportFormat,
+) -> None:
+    """Test Export Contacts Router Picks The Format From Accept Without A Format Query."""
+    # Arrange
+    mock_contact_service.export_contacts.return_value = iter([b"contacts"])
+
+    # Act
+    with app.extra["container"].contact_service.override(mock_contact_service):
+        response = api_client.get("/contacts/export", headers={"Accept": accept})
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert "Accept" in _vary(response)
+    assert response.headers["content-disposition"].endswith(f'.{expected_format.value}"')
+    mock_contact_service.export_contacts.assert_called_once_with(expected_format, 1000)
+
+
+def test_search_contacts_router(
+    api_client: TestClient,
+    mock_contact_service: Mock,
+    dummy_contacts_list: List[ContactResponse],
+) -> None:
+    """Test Search Contacts Router."""
+    # Arrange
+    mock_contact_service.search_contacts.return_value = ContactsSearchResponse(
+        contacts=dummy_contacts_list, next_offset=20
+    )
+
+    # Act
+    with app.extra["container"].contact_service.override(mock_contact_service):
+        response = api_client.get(
+            "/contacts/search", params={"q": "dummy", "limit": 500, "offset": 10}
+        )
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["nextOffset"] == 20
+    mock_contact_service.search_contacts.assert_called_once_with("dummy", 50, 10, 200)
+
+
+@pytest.mark.parametrize(
+    "params, expected_status_code",
+    [
+        pytest.param({}, status.HTTP_422_UNPROCESSABLE_ENTITY, id="Missing Query [422]"),
+        pytest.param({"q": " "}, status.HTTP_400_BAD_REQUEST, id="Bad Request [400]"),
+    ],
+)
+def test_search_contacts_router_error(
+    api_client: TestClient,
+    mock_contact_service: Mock,
+    params: Dict[str, str],
+    expected_status_code: int,
+) -> None:
+    """Test Search Contacts Router Without A Query."""
+    # Arrange
+    mock_contact_service.search_contacts.side_effect = InvalidSearchQuery(
+        "The search query is empty."
+    )
+
+    # Act
+    with app.extra["container"].contact_service.override(mock_contact_service):
+        response = api_client.get("/contacts/search", params=params)
+
+    # Assert
+    assert response.status_code == expected_status_code
+
+
+def test_get_contacts_changes_router(
+    api_client: TestClient, mock_contact_service: Mock, dummy_contact_data: ContactResponse
+) -> None:
+    """Test Get Contacts Changes Router."""
+    # Arrange
+    mock_contact_service.get_contacts_changes.return_value = ContactsChangesResponse(
+        contacts=[dummy_contact_data],
+        deleted=["+972546643568"],
+        next_token="WyJjaGFuZ2VzIiw3XQ",
+        has_more=False,
+    )
+
+    # Act
+    with app.extra["container"].contact_service.override(mock_contact_service):
+        response = api_client.get(
+            "/contacts/changes", params={"since": "WyJjaGFuZ2VzIiwzXQ", "limit": 5000}
+        )
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["deleted"] == ["+972546643568"]
+    assert response.json()["nextToken"] == "WyJjaGFuZ2VzIiw3XQ"
+    mock_contact_service.get_contacts_changes.assert_called_once_with("WyJjaGFuZ2VzIiwzXQ", 1000, 0)
+
+
+def test_get_contacts_changes_router_invalid_token(
+    api_client: TestClient, mock_contact_service: Mock
+) -> None:
+    """Test Get Contacts Changes Router With An Invalid Token."""
+    # Arrange
+    mock_contact_service.get_contacts_changes.side_effect = InvalidPageCursor(
+        detail="Invalid changes token."
+    )
+
+    # Act
+    with app.extra["container"].contact_service.override(mock_contact_service):
+        response = api_client.get("/contacts/changes", params={"since": "not-a-token"})
+
+    # Assert
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_autocomplete_phone_numbers_router(
+    api_client: TestClient, mock_contact_service: Mock
+) -> None:
+    """Test Autocomplete Phone Numbers Router."""
+    # Arrange
+    mock_contact_service.autocomplete_phone_numbers.return_value = AutocompleteResponse(
+        phone_numbers=["+972546643567"], total=1
+    )
+
+    # Act
+    with app.extra["container"].contact_service.override(mock_contact_service):
+        response = api_client.get(
+            "/contacts/autocomplete", params={"prefix": "+97254", "limit": 500}
+        )
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"phoneNumbers": ["+972546643567"], "total": 1}
+    mock_contact_service.autocomplete_phone_numbers.assert_called_once_with("+97254", 50)
+
+
+@pytest.mark.parametrize(
+    "side_effect, expected_status_code",
+    [
+        pytest.param(
+            InvalidSearchQuery("The prefix is not the start of a phone number."),
+            status.HTTP_400_BAD_REQUEST,
+            id="Bad Request [400]",
+        ),
+        pytest.param(
+            PhoneNumberIndexUnavailable(),
+            status.HTTP_503_SERVICE_UNAVAILABLE,
+            id="Service Unavailable [503]",
+        ),
+    ],
+)
+def test_autocomplete_phone_numbers_router_error(
+    api_client: TestClient,
+    mock_contact_service: Mock,
+    side_effect: Exception,
+    expected_status_code: int,
+) -> None:
+    """Test Autocomplete Phone Numbers Router Errors."""
+    # Arrange
+    mock_contact_service.autocomplete_phone_numbers.side_effect = side_effect
+
+    # Act
+    with app.extra["container"].contact_service.override(mock_contact_service):
+        response = api_client.get("/contacts/autocomplete", params={"prefix": "+97254"})
+
+    # Assert
+    assert response.status_code == expected_status_code
+
+
+def test_lookup_contacts_router(
+    api_client: TestClient, mock_contact_service: Mock, dummy_contact_data: ContactResponse
+) -> None:
+    """Test Lookup Contacts Router."""
+    # Arrange
+    mock_contact_service.lookup_contacts.return_value = LookupContactsResponse(
+        contacts={dummy_contact_data.phone_number: dummy_contact_data},
+        missing=["+972546643568"],
+        invalid=[],
+    )
+    phone_numbers = [dummy_contact_data.phone_number, "+972546643568"]
+
+    # Act
+    with app.extra["container"].contact_service.override(mock_contact_service):
+        response = api_client.post("/contacts/lookup", json={"phoneNumbers": phone_numbers})
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["contacts"][dummy_contact_data.phone_number]["firstName"] == (
+        dummy_contact_data.first_name
+    )
+    assert response.json()["missing"] == ["+972546643568"]
+    mock_contact_service.lookup_contacts.assert_called_once_with(phone_numbers, 1000)
+
+
+def test_lookup_contacts_router_msgpack(
+    api_client: TestClient, mock_contact_service: Mock, dummy_contact_data: ContactResponse
+) -> None:
+    """Test Lookup Contacts Router Sends MessagePack To Clients That Accept It."""
+    # Arrange
+    mock_contact_service.lookup_contacts.return_value = LookupContactsResponse(
+        contacts={dummy_contact_data.phone_number: dummy_contact_data}, missing=[], invalid=[]
+    )
+
+    # Act
+    with app.extra["container"].contact_service.override(mock_contact_service):
+        response = api_client.post(
+            "/contacts/lookup",
+            json={"phoneNumbers": [dummy_contact_data.phone_number]},
+            headers={"Accept": "application/msgpack"},
+        )
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert msgpack.unpackb(response.content) == {
+        "contacts": {
+            dummy_contact_data.phone_number: json.loads(dummy_contact_data.json(by_alias=True))
+        },
+        "missing": [],
+        "invalid": [],
+    }
+
+
+def test_lookup_contacts_router_error(api_client: TestClient, mock_contact_service: Mock) -> None:
+    """Test Lookup Contacts Router With Too Many Phone Numbers."""
+    # Arrange
+    mock_contact_service.lookup_contacts.side_effect = InvalidContactsLookup(
+        "A lookup resolves at most 1000 phone numbers."
+    )
+
+    # Act
+    with app.extra["container"].contact_service.override(mock_contact_service):
+        response = api_client.post("/contacts/lookup", json={"phoneNumbers": ["+972546643568"]})
+
+    # Assert
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
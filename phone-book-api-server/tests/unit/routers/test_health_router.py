@@ -0,0 +1,48 @@
+from unittest.mock import Mock
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from phone_book_api_server.api import server
+from phone_book_api_server.api.server import app
+from phone_book_api_server.clients.db_client import PostgreSQLClient
+from phone_book_api_server.readiness import Readiness
+
+
+def test_not_ready_while_warming_up(api_client: TestClient) -> None:
+    # Arrange
+    readiness = Readiness()
+
+    # Act
+    with app.extra["container"].readiness.override(readiness):
+        live_response = api_client.get("/health/live")
+        ready_response = api_client.get("/health/ready")
+
+    # Assert
+    assert live_response.status_code == status.HTTP_200_OK
+    assert ready_response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert ready_response.json()["detail"] == "Starting"
+
+
+def test_ready_once_warmed_up(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Arrange
+    monkeypatch.setattr(server, "WARM_UP_RETRY_SECONDS", 0)
+    readiness = Readiness()
+    mock_db_client = Mock(spec=PostgreSQLClient)
+    mock_db_client.ping.side_effect = [ConnectionError("dummy"), None]
+    container = app.extra["container"]
+
+    # Act
+    with container.readiness.override(readiness), container.db_client.override(mock_db_client):
+        with TestClient(app) as client:
+            for _ in range(100):
+                response = client.get("/health/ready")
+                if response.status_code == status.HTTP_200_OK:
+                    break
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["ready"] is True
+    assert mock_db_client.ping.call_count == 2
+    mock_db_client.close.assert_called_once()
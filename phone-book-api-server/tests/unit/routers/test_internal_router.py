@@ -0,0 +1,88 @@
+from unittest.mock import Mock
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from phone_book_api_server.api.server import app
+from phone_book_api_server.clients.contact_cache import InMemoryContactCache
+from phone_book_api_server.clients.db_client import PostgreSQLClient
+from phone_book_api_server.clients.phone_number_index import PhoneNumberIndex
+from phone_book_api_server.data_models.contacts import ContactResponse
+from phone_book_api_server.data_models.pool import PoolStatusResponse
+from phone_book_api_server.services.single_flight import SingleFlight
+
+
+def test_get_pool_status(api_client: TestClient) -> None:
+    # Arrange
+    mock_db_client = Mock(spec=PostgreSQLClient)
+    mock_db_client.pool_status.return_value = PoolStatusResponse(
+        pool_size=5,
+        checked_out=2,
+        peak_checked_out=4,
+        overflow=-3,
+        checkouts=10,
+        connections_opened=4,
+        invalidations=0,
+        wait_time_total=0.5,
+        wait_time_max=0.2,
+        wait_time_avg=0.05,
+        timeouts=1,
+    )
+
+    # Act
+    with app.extra["container"].db_client.override(mock_db_client):
+        response = api_client.get("/internal/pool")
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["checkedOut"] == 2
+    assert response.json()["timeouts"] == 1
+
+
+def test_get_cache_stats(api_client: TestClient, dummy_contact_data: ContactResponse) -> None:
+    # Arrange
+    contact_cache = InMemoryContactCache(max_size=10, ttl=60)
+    contact_cache.set(dummy_contact_data.phone_number, dummy_contact_data)
+    contact_cache.get(dummy_contact_data.phone_number)
+
+    # Act
+    with app.extra["container"].contact_cache.override(contact_cache):
+        response = api_client.get("/internal/cache")
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["hits"] == 1
+    assert response.json()["maxSize"] == 10
+
+
+def test_get_phone_number_index_stats(api_client: TestClient) -> None:
+    # Arrange
+    phone_number_index = PhoneNumberIndex()
+    phone_number_index_loader = phone_number_index.start_load()
+    phone_number_index_loader.add_batch(["+972546643567", "+972546643568"])
+    phone_number_index_loader.finish()
+
+    # Act
+    with app.extra["container"].phone_number_index.override(phone_number_index):
+        response = api_client.get("/internal/phone-number-index")
+    disabled_response = api_client.get("/internal/phone-number-index")
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["size"] == 2
+    assert response.json()["loaded"] is True
+    assert disabled_response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_get_lookups_stats(api_client: TestClient) -> None:
+    # Arrange
+    single_flight = SingleFlight()
+    single_flight.do("+972546643567", str, "dummy")
+
+    # Act
+    with app.extra["container"].contact_lookups.override(single_flight):
+        response = api_client.get("/internal/lookups")
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"inFlight": 0, "executions": 1, "coalesced": 0}
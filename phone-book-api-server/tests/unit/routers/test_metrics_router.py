@@ -0,0 +1,40 @@
+from unittest.mock import Mock
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from phone_book_api_server.api.server import app
+from phone_book_api_server.clients.db_client import PostgreSQLClient
+from phone_book_api_server.data_models.pool import PoolStatusResponse
+
+
+def test_get_metrics(api_client: TestClient) -> None:
+    # Arrange
+    mock_db_client = Mock(spec=PostgreSQLClient)
+    mock_db_client.pool_status.return_value = PoolStatusResponse(
+        pool_size=5,
+        checked_out=2,
+        peak_checked_out=4,
+        overflow=-3,
+        checkouts=10,
+        connections_opened=4,
+        invalidations=0,
+        wait_time_total=0.5,
+        wait_time_max=0.2,
+        wait_time_avg=0.05,
+        timeouts=1,
+    )
+    api_client.get("/contacts/search")
+
+    # Act
+    with app.extra["container"].db_client.override(mock_db_client):
+        response = api_client.get("/metrics")
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_requests_total{method="GET",route="/contacts/search",status="422"}' in (
+        response.text
+    )
+    assert "db_pool_checked_out 2" in response.text
+    assert "# TYPE contact_validation_duration_seconds histogram" in response.text
@@ -0,0 +1,116 @@
+from typing import Dict
+from unittest.mock import Mock
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from phone_book_api_server.api.server import app
+from phone_book_api_server.data_models.contacts import ContactResponse
+from phone_book_api_server.profiling import ProfileStore
+
+AUTHORIZATION_HEADERS = {"Authorization": "Bearer dummytoken"}
+
+
+def test_profile_requested_by_header(
+    api_client: TestClient, mock_contact_service: Mock, dummy_contact_data: ContactResponse
+) -> None:
+    # Arrange
+    mock_contact_service.get_contact.return_value = dummy_contact_data
+    container = app.extra["container"]
+
+    # Act
+    with container.contact_service.override(mock_contact_service):
+        response = api_client.get(
+            f"/contacts/{dummy_contact_data.phone_number}", headers={"X-Profile": "dummytoken"}
+        )
+    profile_response = api_client.get(
+        f"/internal/profiles/{response.headers['X-Profile-ID']}", headers=AUTHORIZATION_HEADERS
+    )
+    profiles_response = api_client.get("/internal/profiles", headers=AUTHORIZATION_HEADERS)
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert profile_response.status_code == status.HTTP_200_OK
+    assert profile_response.json()["path"] == f"/contacts/{dummy_contact_data.phone_number}"
+    assert profile_response.json()["statusCode"] == status.HTTP_200_OK
+    assert profile_response.json()["packages"]["fastapi"] > 0
+    assert profiles_response.json()[0]["id"] == response.headers["X-Profile-ID"]
+
+
+def test_requests_are_not_profiled_by_default(api_client: TestClient) -> None:
+    # Arrange
+    profile_store = ProfileStore()
+
+    # Act
+    with app.extra["container"].profile_store.override(profile_store):
+        response = api_client.get("/internal/profiles", headers=AUTHORIZATION_HEADERS)
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == []
+    assert "X-Profile-ID" not in response.headers
+
+
+def test_get_missing_profile(api_client: TestClient) -> None:
+    # Act
+    response = api_client.get("/internal/profiles/dummy", headers=AUTHORIZATION_HEADERS)
+
+    # Assert
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.parametrize("profile_header", ["1", "dummy"])
+def test_profile_header_requires_token(
+    api_client: TestClient,
+    mock_contact_service: Mock,
+    dummy_contact_data: ContactResponse,
+    profile_header: str,
+) -> None:
+    # Arrange
+    mock_contact_service.get_contact.return_value = dummy_contact_data
+    profile_store = ProfileStore()
+    container = app.extra["container"]
+
+    # Act
+    with container.contact_service.override(mock_contact_service):
+        with container.profile_store.override(profile_store):
+            response = api_client.get(
+                f"/contacts/{dummy_contact_data.phone_number}",
+                headers={"X-Profile": profile_header},
+            )
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert "X-Profile-ID" not in response.headers
+    assert profile_store.list() == []
+
+
+@pytest.mark.parametrize(
+    "path, headers",
+    [
+        ("/internal/profiles", {}),
+        ("/internal/profiles", {"Authorization": "Bearer dummy"}),
+        ("/internal/profiles/dummy", {"X-Profile": "dummytoken"}),
+    ],
+)
+def test_get_profiles_requires_token(
+    api_client: TestClient, path: str, headers: Dict[str, str]
+) -> None:
+    # Act
+    response = api_client.get(path, headers=headers)
+
+    # Assert
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_get_profiles_without_configured_token(api_client: TestClient) -> None:
+    # Arrange
+    container = app.extra["container"]
+
+    # Act
+    with container.config.profiling.token.override(None):
+        response = api_client.get("/internal/profiles", headers=AUTHORIZATION_HEADERS)
+
+    # Assert
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -3,6 +3,8 @@ from unittest.mock import Mock
 
 import pytest
 
+from phone_book_api_server.clients.async_db_client import AsyncPostgreSQLClient
+from phone_book_api_server.clients.contact_cache import InMemoryContactCache
 from phone_book_api_server.clients.db_client import PostgreSQLClient
 from phone_book_api_server.data_models.contacts import ContactResponse
 from phone_book_api_server.data_models.db import DeleteContactResponse
@@ -11,6 +13,7 @@ from phone_book_api_server.exceptions.contact import (
     InvalidContactName,
     InvalidContactNumber,
 )
+from phone_book_api_server.services.async_contact_service import AsyncContactService
 from phone_book_api_server.services.contact_service import ContactService
 
 
@@ -70,8 +73,16 @@ def dummy_contact_invalid_name(scope="function") -> ContactResponse:
 
 @pytest.fixture()
 def dummy_contacts_list() -> List[ContactResponse]:
-    """Dummy Contacts list."""
-    return [dummy_contact_data, dummy_contact_data, dummy_contact_data]
+    """Dummy Contacts list, in phone number order."""
+    return [
+        ContactResponse(
+            phone_number=f"+97254664356{digit}",
+            first_name="dummyname",
+            last_name="dummyname",
+            email_address="dummy@dummy.com",
+        )
+        for digit in range(3)
+    ]
 
 
 @pytest.fixture()
@@ -85,6 +96,14 @@ def contact_service(mock_db_client: Mock) -> ContactService:
     return ContactService(db_client=mock_db_client)
 
 
+@pytest.fixture()
+def cached_contact_service(mock_db_client: Mock) -> ContactService:
+    """Contact Service fixture with an in-memory contact cache."""
+    return ContactService(
+        db_client=mock_db_client, contact_cache=InMemoryContactCache(max_size=10, ttl=60)
+    )
+
+
 @pytest.fixture()
 def limit_list_size_response() -> int:
     """Limit Pagination For Contacts List Response."""
@@ -121,3 +140,14 @@ def delete_contact_response_successfuly() -> DeleteContactResponse:
     return DeleteContactResponse(
         detail="Contact with phone number +972546643567 has been successfully deleted."
     )
+
+
+@pytest.fixture()
+def mock_async_db_client() -> Mock:
+    return Mock(spec=AsyncPostgreSQLClient)
+
+
+@pytest.fixture()
+def async_contact_service(mock_async_db_client: Mock) -> AsyncContactService:
+    """Async Contact Service fixture."""
+    return AsyncContactService(db_client=mock_async_db_client)
@@ -0,0 +1,184 @@
+import asyncio
+from unittest.mock import Mock
+
+import fakeredis
+import pytest
+
+from phone_book_api_server.clients.redis_contact_cache import RedisContactCache
+from phone_book_api_server.data_models.contacts import ContactResponse, UpdateContactRequest
+from phone_book_api_server.data_models.db import DeleteContactResponse
+from phone_book_api_server.exceptions.contact import (
+    ContactNotFoundError,
+    InvalidContactName,
+    InvalidContactNumber,
+)
+from phone_book_api_server.services.async_contact_service import AsyncContactService
+from phone_book_api_server.services.single_flight import AsyncSingleFlight
+
+
+def test_insert_contact_async(
+    async_contact_service: AsyncContactService,
+    mock_async_db_client: Mock,
+    dummy_contact_data: ContactResponse,
+) -> None:
+    """Test Insert Contact Async With Valid Params."""
+    # Arrange
+    mock_async_db_client.insert_contact.return_value = dummy_contact_data
+
+    # Act
+    response = asyncio.run(async_contact_service.insert_contact(dummy_contact_data))
+
+    # Assert
+    mock_async_db_client.insert_contact.assert_awaited_once()
+    assert response == dummy_contact_data
+
+
+def test_insert_contact_async_with_invalid_name_error(
+    async_contact_service: AsyncContactService,
+    mock_async_db_client: Mock,
+    dummy_contact_invalid_name: ContactResponse,
+) -> None:
+    """Test Insert Contact Async With Invalid Name."""
+    # Act & Assert
+    with pytest.raises(InvalidContactName):
+        asyncio.run(async_contact_service.insert_contact(dummy_contact_invalid_name))
+    mock_async_db_client.insert_contact.assert_not_awaited()
+
+
+def test_get_contact_async_with_invalid_phone_error(
+    async_contact_service: AsyncContactService,
+    mock_async_db_client: Mock,
+) -> None:
+    """Test Get Contact Async With Invalid Phone Number."""
+    # Act & Assert
+    with pytest.raises(InvalidContactNumber):
+        asyncio.run(async_contact_service.get_contact("0546643567"))
+    mock_async_db_client.get_contact.assert_not_awaited()
+
+
+def test_get_contacts_list_async(
+    async_contact_service: AsyncContactService,
+    mock_async_db_client: Mock,
+    dummy_contact_data: ContactResponse,
+    limit_list_size_response: int,
+) -> None:
+    """Test Get Contacts List Async."""
+    # Arrange
+    mock_async_db_client.get_contacts.return_value = [dummy_contact_data]
+
+    # Act
+    response = asyncio.run(async_contact_service.get_contacts_list(limit_list_size_response))
+
+    # Assert
+    assert response.contacts == [dummy_contact_data]
+    assert response.next_cursor is None
+
+
+def test_update_contact_async(
+    async_contact_service: AsyncContactService,
+    mock_async_db_client: Mock,
+    dummy_contact_data: ContactResponse,
+    dummy_phone_number: str,
+) -> None:
+    """Test Update Contact Async."""
+    # Arrange
+    mock_async_db_client.update_contact.return_value = dummy_contact_data
+
+    # Act
+    response = asyncio.run(
+        async_contact_service.update_contact(
+            UpdateContactRequest(first_name="updatedname"), dummy_phone_number
+        )
+    )
+
+    # Assert
+    mock_async_db_client.update_contact.assert_awaited_once_with(
+        dummy_phone_number, {"first_name": "updatedname"}
+    )
+    mock_async_db_client.get_contact.assert_not_awaited()
+    assert response == dummy_contact_data
+
+
+def test_delete_contact_async(
+    async_contact_service: AsyncContactService,
+    mock_async_db_client: Mock,
+    dummy_phone_number: str,
+    delete_contact_response_successfuly: DeleteContactResponse,
+) -> None:
+    """Test Delete Contact Async."""
+    # Act
+    response = asyncio.run(async_contact_service.delete_contact(dummy_phone_number))
+
+    # Assert
+    mock_async_db_client.delete_contact.assert_awaited_once_with(dummy_phone_number)
+    mock_async_db_client.get_contact.assert_not_awaited()
+    assert response == delete_contact_response_successfuly
+
+
+def test_delete_missing_contact_async(
+    async_contact_service: AsyncContactService,
+    mock_async_db_client: Mock,
+    dummy_phone_number: str,
+) -> None:
+    """Test Delete Contact Async Of A Contact No Row Was Deleted For."""
+    # Arrange
+    mock_async_db_client.delete_contact.return_value = False
+
+    # Act & Assert
+    with pytest.raises(ContactNotFoundError):
+        asyncio.run(async_contact_service.delete_contact(dummy_phone_number))
+
+
+def test_get_contact_async_served_from_shared_cache(
+    mock_async_db_client: Mock,
+    dummy_contact_data: ContactResponse,
+    dummy_phone_number: str,
+) -> None:
+    """Test Get Contact Async Reads A Shared Cache Filled By Another Worker."""
+    # Arrange
+    redis_server = fakeredis.FakeServer()
+    first_worker_service = AsyncContactService(
+        mock_async_db_client, RedisContactCache(fakeredis.FakeRedis(server=redis_server))
+    )
+    second_worker_service = AsyncContactService(
+        mock_async_db_client, RedisContactCache(fakeredis.FakeRedis(server=redis_server))
+    )
+    mock_async_db_client.get_contact.return_value = dummy_contact_data
+
+    # Act
+    asyncio.run(first_worker_service.get_contact(dummy_phone_number))
+    response = asyncio.run(second_worker_service.get_contact(dummy_phone_number))
+
+    # Assert
+    mock_async_db_client.get_contact.assert_awaited_once_with(dummy_phone_number)
+    assert response == dummy_contact_data
+
+
+def test_get_contact_async_coalesces_concurrent_lookups(
+    mock_async_db_client: Mock,
+    dummy_contact_data: ContactResponse,
+    dummy_phone_number: str,
+) -> None:
+    """Test Concurrent Get Contact Async Share One Database Query."""
+    # Arrange
+    single_flight = AsyncSingleFlight()
+    async_contact_service = AsyncContactService(mock_async_db_client, single_flight=single_flight)
+
+    async def slow_get_contact(_: str) -> ContactResponse:
+        await asyncio.sleep(0.05)
+        return dummy_contact_data
+
+    mock_async_db_client.get_contact.side_effect = slow_get_contact
+
+    async def scenario() -> list:
+        return await asyncio.gather(
+            *(async_contact_service.get_contact(dummy_phone_number) for _ in range(5))
+        )
+
+    # Act
+    responses = asyncio.run(scenario())
+
+    # Assert
+    mock_async_db_client.get_contact.assert_awaited_once_with(dummy_phone_number)
+    assert responses == [dummy_contact_data] * 5
+    assert single_flight.stats().coalesced == 4
@@ -0,0 +1,100 @@
+import json
+from typing import List
+from unittest.mock import Mock
+
+import msgpack
+
+from phone_book_api_server.data_models.contacts import ContactResponse, ExportFormat
+from phone_book_api_server.services.contact_service import ContactService
+
+
+def test_export_contacts_ndjson(
+    contact_service: ContactService,
+    mock_db_client: Mock,
+    dummy_contact_data: ContactResponse,
+    dummy_contact_data_without_email: ContactResponse,
+) -> None:
+    # Arrange
+    mock_db_client.stream_contacts.return_value = iter(
+        [[dummy_contact_data], [dummy_contact_data_without_email]]
+    )
+
+    # Act
+    chunks = list(contact_service.export_contacts(ExportFormat.NDJSON, batch_size=1))
+
+    # Assert
+    mock_db_client.stream_contacts.assert_called_once_with(1)
+    rows = [json.loads(line) for line in b"".join(chunks).splitlines()]
+    assert rows == [
+        json.loads(dummy_contact_data.json(by_alias=True)),
+        json.loads(dummy_contact_data_without_email.json(by_alias=True)),
+    ]
+
+
+def test_export_contacts_csv(
+    contact_service: ContactService,
+    mock_db_client: Mock,
+    dummy_contact_data: ContactResponse,
+    dummy_contact_data_without_email: ContactResponse,
+) -> None:
+    # Arrange
+    mock_db_client.stream_contacts.return_value = iter(
+        [[dummy_contact_data, dummy_contact_data_without_email]]
+    )
+
+    # Act
+    chunks: List[bytes] = list(contact_service.export_contacts(ExportFormat.CSV))
+
+    # Assert
+    assert b"".join(chunks).decode().splitlines() == [
+        "firstName,lastName,phoneNumber,emailAddress",
+        "dummyname,dummyname,+972546643567,dummy@dummy.com",
+        "dummyname,dummyname,+972546643567,",
+    ]
+
+
+def test_export_contacts_fast_ndjson(
+    mock_db_client: Mock,
+    dummy_contact_data: ContactResponse,
+    dummy_contact_data_without_email: ContactResponse,
+) -> None:
+    """Test Export Contacts Encodes The Same NDJSON Objects With orjson."""
+    # Arrange
+    contact_service = ContactService(mock_db_client, fast_serialization=True)
+    mock_db_client.stream_contacts.return_value = iter(
+        [[dummy_contact_data, dummy_contact_data_without_email]]
+    )
+
+    # Act
+    chunks = list(contact_service.export_contacts(ExportFormat.NDJSON))
+
+    # Assert
+    rows = [json.loads(line) for line in b"".join(chunks).splitlines()]
+    assert rows == [
+        json.loads(dummy_contact_data.json(by_alias=True)),
+        json.loads(dummy_contact_data_without_email.json(by_alias=True)),
+    ]
+
+
+def test_export_contacts_msgpack(
+    contact_service: ContactService,
+    mock_db_client: Mock,
+    dummy_contact_data: ContactResponse,
+    dummy_contact_data_without_email: ContactResponse,
+) -> None:
+    """Test Export Contacts Streams One MessagePack Map Per Contact."""
+    # Arrange
+    mock_db_client.stream_contacts.return_value = iter(
+        [[dummy_contact_data], [dummy_contact_data_without_email]]
+    )
+
+    # Act
+    chunks = list(contact_service.export_contacts(ExportFormat.MSGPACK, batch_size=1))
+
+    # Assert
+    unpacker = msgpack.Unpacker()
+    unpacker.feed(b"".join(chunks))
+    assert list(unpacker) == [
+        json.loads(dummy_contact_data.json(by_alias=True)),
+        json.loads(dummy_contact_data_without_email.json(by_alias=True)),
+    ]
@@ -0,0 +1,51 @@
+import pytest
+
+from phone_book_api_server.exceptions.contact import (
+    InvalidContactImport,
+    UnsupportedContactImportFormat,
+)
+from phone_book_api_server.services.contact_import import parse_contact_rows
+
+
+@pytest.mark.parametrize(
+    "body, content_type",
+    [
+        (b'[{"firstName": "dummy", "phoneNumber": "+972546643567"}]', "application/json"),
+        (
+            b'{"firstName": "dummy", "phoneNumber": "+972546643567"}\n\n',
+            "application/x-ndjson; charset=utf-8",
+        ),
+        (b"firstName,phoneNumber,emailAddress\ndummy,+972546643567,\n", "text/csv"),
+    ],
+    ids=["json", "ndjson", "csv"],
+)
+def test_parse_contact_rows(body: bytes, content_type: str) -> None:
+    # Act
+    contact_rows = parse_contact_rows(body, content_type)
+
+    # Assert
+    assert len(contact_rows) == 1
+    assert contact_rows[0]["firstName"] == "dummy"
+    assert contact_rows[0]["phoneNumber"] == "+972546643567"
+    assert contact_rows[0].get("emailAddress") is None
+
+
+def test_parse_contact_rows_unsupported_format() -> None:
+    # Act & Assert
+    with pytest.raises(UnsupportedContactImportFormat):
+        parse_contact_rows(b"<contacts/>", "application/xml")
+
+
+@pytest.mark.parametrize(
+    "body, content_type",
+    [
+        (b'{"firstName": "dummy"}', "application/json"),
+        (b"[{", "application/json"),
+        (b"\xff\xfe", "text/csv"),
+    ],
+    ids=["not_an_array", "invalid_json", "invalid_encoding"],
+)
+def test_parse_contact_rows_malformed(body: bytes, content_type: str) -> None:
+    # Act & Assert
+    with pytest.raises(InvalidContactImport):
+        parse_contact_rows(body, content_type)
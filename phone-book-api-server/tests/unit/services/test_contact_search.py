@@ -0,0 +1,30 @@
+import pytest
+
+from phone_book_api_server.data_models.contacts import ContactSearchQuery
+from phone_book_api_server.exceptions.contact import InvalidSearchQuery
+from phone_book_api_server.services.contact_search import parse_search_query
+
+
+@pytest.mark.parametrize(
+    "query, expected_search_query",
+    [
+        ("+972 54-664", ContactSearchQuery(phone_prefix="+97254664")),
+        ("972", ContactSearchQuery(phone_prefix="+972")),
+        (" co ", ContactSearchQuery(name="co", fuzzy=False)),
+        ("cohen", ContactSearchQuery(name="cohen", fuzzy=True)),
+        ("+cohen", ContactSearchQuery(name="+cohen", fuzzy=True)),
+    ],
+    ids=["phone_number", "digits", "short_name", "name", "name_with_plus"],
+)
+def test_parse_search_query(query: str, expected_search_query: ContactSearchQuery) -> None:
+    """Test Parse Search Query Tells Phone Numbers From Names."""
+    # Act & Assert
+    assert parse_search_query(query) == expected_search_query
+
+
+@pytest.mark.parametrize("query", ["", "   "], ids=["empty", "blank"])
+def test_parse_search_query_empty(query: str) -> None:
+    """Test Parse Search Query Without A Query."""
+    # Act & Assert
+    with pytest.raises(InvalidSearchQuery):
+        parse_search_query(query)
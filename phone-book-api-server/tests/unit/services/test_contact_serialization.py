@@ -0,0 +1,102 @@
+import json
+from datetime import datetime
+from typing import List
+
+import msgpack
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import Row, create_engine, literal, null, select, union_all
+
+from phone_book_api_server.data_models.contacts import (
+    ContactResponse,
+    ContactsPageResponse,
+    LookupContactsResponse,
+)
+from phone_book_api_server.data_models.readiness import ReadinessResponse
+from phone_book_api_server.services.contact_serialization import dump_json, dump_msgpack
+
+
+@pytest.fixture()
+def dummy_contacts_rows() -> List[Row]:
+    """Contact Rows As The Database Returns Them."""
+    engine = create_engine("sqlite://")
+    with engine.connect() as connection:
+        return connection.execute(
+            union_all(
+                select(
+                    literal("+972546643567").label("phone_number"),
+                    literal("dummyname").label("first_name"),
+                    literal("dümmy").label("last_name"),
+                    literal("dummy@dummy.com").label("email_address"),
+                ),
+                select(
+                    literal("+972546643568").label("phone_number"),
+                    literal("dummyname").label("first_name"),
+                    literal("dummyname").label("last_name"),
+                    null().label("email_address"),
+                ),
+            )
+        ).all()
+
+
+def standard_json(response: ContactsPageResponse) -> bytes:
+    return JSONResponse(jsonable_encoder(response, by_alias=True)).body
+
+
+def test_dump_json_contacts_rows(dummy_contacts_rows: List[Row]) -> None:
+    """Test Dump JSON Encodes Contact Rows As FastAPI Encodes Their Contact Responses."""
+    # Arrange
+    fast_response = ContactsPageResponse.construct(
+        contacts=dummy_contacts_rows, next_cursor="cursor"
+    )
+    standard_response = ContactsPageResponse(contacts=dummy_contacts_rows, next_cursor="cursor")
+
+    # Act
+    fast_json = dump_json(fast_response)
+
+    # Assert
+    assert fast_json == standard_json(standard_response)
+
+
+def test_dump_json_models() -> None:
+    """Test Dump JSON Encodes Models, Excluded Fields And Datetimes As FastAPI Does."""
+    # Arrange
+    contact = ContactResponse(
+        phone_number="+972546643567", first_name="dummyname", last_name="dummyname", version=2
+    )
+    lookup_response = LookupContactsResponse(
+        contacts={"0546643567": contact}, missing=[], invalid=["dummy"]
+    )
+    readiness_response = ReadinessResponse(ready=False, detail="Loading", startup_seconds=None)
+
+    # Act & Assert
+    assert dump_json(lookup_response) == standard_json(lookup_response)
+    assert dump_json(readiness_response) == standard_json(readiness_response)
+    assert b"version" not in dump_json(lookup_response)
+
+
+def test_dump_json_datetimes() -> None:
+    """Test Dump JSON Formats Naive Datetimes As UTC, As SharedBaseModel Does."""
+    # Act & Assert
+    assert dump_json({"at": datetime(2024, 1, 1)}) == b'{"at":"2024-01-01T00:00:00+00:00"}'
+    with pytest.raises(TypeError):
+        dump_json({"value": object()})
+
+
+def test_dump_msgpack_holds_the_json_object(dummy_contacts_rows: List[Row]) -> None:
+    """Test Dump MessagePack Encodes The Same Object As The JSON Of The Response."""
+    # Arrange
+    fast_response = ContactsPageResponse.construct(
+        contacts=dummy_contacts_rows, next_cursor="cursor"
+    )
+    standard_response = ContactsPageResponse(contacts=dummy_contacts_rows, next_cursor="cursor")
+
+    # Act
+    packed_response = dump_msgpack(fast_response)
+
+    # Assert
+    assert msgpack.unpackb(packed_response) == json.loads(standard_json(standard_response))
+    assert msgpack.unpackb(dump_msgpack({"at": datetime(2024, 1, 1)})) == {
+        "at": "2024-01-01T00:00:00+00:00"
+    }
@@ -1,18 +1,35 @@
-from typing import List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import List, Optional
 from unittest import mock
 from unittest.mock import Mock
 
 import pytest
 from pytest_mock import MockerFixture
 
-from phone_book_api_server.data_models.contacts import ContactResponse
+from phone_book_api_server.clients.phone_number_index import PhoneNumberIndex
+from phone_book_api_server.data_models.contacts import (
+    ContactResponse,
+    ContactSearchQuery,
+    ContactsSort,
+    ImportRowStatus,
+    UpdateContactRequest,
+)
 from phone_book_api_server.data_models.db import DeleteContactResponse
 from phone_book_api_server.exceptions.contact import (
+    ContactNotFoundError,
     InvalidContactEmail,
     InvalidContactName,
     InvalidContactNumber,
+    InvalidContactsLookup,
+    InvalidPageCursor,
+    InvalidSearchQuery,
+    PhoneNumberIndexUnavailable,
 )
 from phone_book_api_server.services.contact_service import ContactService
+from phone_book_api_server.services.pagination import decode_changes_token
+from phone_book_api_server.services.single_flight import SingleFlight
 
 
 def test_insert_contact(
@@ -95,7 +112,118 @@ def test_get_contacts_list(
     mock_db_client.get_contacts.return_value = dummy_contacts_list
     # Act
     with mock.patch("builtins.open", mock.mock_open()) as _:
-        contact_service.get_contacts_list(limit_list_size_response)
+        response = contact_service.get_contacts_list(limit_list_size_response)
+
+    # Assert
+    mock_db_client.get_contacts.assert_called_once_with(
+        limit_list_size_response + 1, ContactsSort.PHONE_NUMBER, None
+    )
+    assert response.contacts == dummy_contacts_list
+    assert response.next_cursor is None
+
+
+def test_get_contacts_list_pages(
+    contact_service: ContactService,
+    mock_db_client: Mock,
+    dummy_contacts_list: List[ContactResponse],
+) -> None:
+    """Test Get Contacts List Follows The Cursor Of The Previous Page."""
+    # Arrange
+    mock_db_client.get_contacts.return_value = dummy_contacts_list
+
+    # Act
+    first_page = contact_service.get_contacts_list(2)
+    contact_service.get_contacts_list(2, first_page.next_cursor)
+
+    # Assert
+    assert first_page.contacts == dummy_contacts_list[:2]
+    mock_db_client.get_contacts.assert_called_with(
+        3, ContactsSort.PHONE_NUMBER, [dummy_contacts_list[1].phone_number]
+    )
+
+
+@pytest.mark.parametrize(
+    "cursor, sort",
+    [
+        ("not-a-cursor", ContactsSort.PHONE_NUMBER),
+        ("WyJwaG9uZV9udW1iZXIiLCIrOTcyNTQ2NjQzNTYxIl0", ContactsSort.NAME),
+    ],
+    ids=["malformed_cursor", "other_sort_cursor"],
+)
+def test_get_contacts_list_invalid_cursor(
+    contact_service: ContactService,
+    mock_db_client: Mock,
+    cursor: str,
+    sort: ContactsSort,
+) -> None:
+    """Test Get Contacts List With An Invalid Cursor."""
+    # Act & Assert
+    with pytest.raises(InvalidPageCursor):
+        contact_service.get_contacts_list(2, cursor, sort)
+    mock_db_client.get_contacts.assert_not_called()
+
+
+def make_change(
+    phone_number: str, change_seq: int, deleted: bool = False, settling: bool = False
+) -> SimpleNamespace:
+    return SimpleNamespace(
+        phone_number=phone_number,
+        first_name=None if deleted else "dummyname",
+        last_name=None if deleted else "dummyname",
+        email_address=None,
+        version=None if deleted else 1,
+        updated_at=None,
+        change_seq=change_seq,
+        deleted=deleted,
+        settling=settling,
+    )
+
+
+def test_get_contacts_changes(contact_service: ContactService, mock_db_client: Mock) -> None:
+    """Test Get Contacts Changes Pages The Feed And Stops Before Settling Changes."""
+    # Arrange
+    mock_db_client.get_contacts_changes.side_effect = [
+        [
+            make_change("+972546643560", 3, deleted=True),
+            make_change("+972546643561", 4),
+            make_change("+972546643560", 5),
+            make_change("+972546643562", 6, deleted=True),
+        ],
+        [make_change("+972546643563", 7), make_change("+972546643564", 8, settling=True)],
+        [],
+    ]
+
+    # Act
+    first_page = contact_service.get_contacts_changes(None, 3, 1.0)
+    second_page = contact_service.get_contacts_changes(first_page.next_token, 3, 1.0)
+    empty_page = contact_service.get_contacts_changes(second_page.next_token, 3, 1.0)
+
+    # Assert
+    assert [contact.phone_number for contact in first_page.contacts] == [
+        "+972546643561",
+        "+972546643560",
+    ]
+    assert first_page.deleted == []
+    assert first_page.has_more
+    assert [contact.phone_number for contact in second_page.contacts] == ["+972546643563"]
+    assert not second_page.has_more
+    assert decode_changes_token(second_page.next_token) == 7
+    assert empty_page.next_token == second_page.next_token
+    assert mock_db_client.get_contacts_changes.call_args_list == [
+        mock.call(0, 4, 1.0, include_deleted=False),
+        mock.call(5, 4, 1.0, include_deleted=True),
+        mock.call(7, 4, 1.0, include_deleted=True),
+    ]
+
+
+def test_get_contacts_changes_invalid_token(
+    contact_service: ContactService, mock_db_client: Mock
+) -> None:
+    """Test Get Contacts Changes With An Invalid Token."""
+    # Act & Assert
+    with pytest.raises(InvalidPageCursor):
+        contact_service.get_contacts_changes("not-a-token", 3)
+    mock_db_client.get_contacts_changes.assert_not_called()
 
 
 @pytest.mark.parametrize(
@@ -107,7 +235,6 @@ def test_get_contacts_list(
     ids=["valid_phone_number", "invalid_phone_number"],
 )
 def test_get_contact(
-    mocker: MockerFixture,
     contact_service: ContactService,
     dummy_contact_data: ContactResponse,
     mock_db_client: Mock,
@@ -115,11 +242,6 @@ def test_get_contact(
     is_valid: bool,
 ) -> None:
     """Test Get Contact."""
-    # Arrange
-    mocker.patch(
-        "phone_book_api_server.services.contact_service.ContactService._is_valid_number",
-        return_value=is_valid,
-    )
     # Act & Assert
     if is_valid:
         mock_db_client.get_contact.return_value = dummy_contact_data
@@ -149,6 +271,29 @@ def test_update_contact(
         contact_service.update_contact(dummy_contact_data, dummy_phone_number)
 
 
+def test_update_contact_single_round_trip(
+    contact_service: ContactService,
+    mock_db_client: Mock,
+    dummy_contact_data: ContactResponse,
+    dummy_phone_number: str,
+) -> None:
+    """Test Update Contact Sends Only The Changed Columns And Skips The Read-Back."""
+    # Arrange
+    mock_db_client.update_contact.return_value = dummy_contact_data
+
+    # Act
+    response = contact_service.update_contact(
+        UpdateContactRequest(last_name="updatedname"), dummy_phone_number
+    )
+
+    # Assert
+    mock_db_client.update_contact.assert_called_once_with(
+        dummy_phone_number, {"last_name": "updatedname"}
+    )
+    mock_db_client.get_contact.assert_not_called()
+    assert response == dummy_contact_data
+
+
 @pytest.mark.parametrize(
     "error_validation",
     [
@@ -173,7 +318,7 @@ def test_update_contact_with_errors(
     # Act & Assert
     if error_validation == "phone_error":
         mocker.patch(
-            "phone_book_api_server.services.contact_service.ContactService._is_valid_number",
+            "phone_book_api_server.services.contact_service.ContactService._normalize_number",
             side_effect=InvalidContactNumber("Invalid phone number."),
         )
         with pytest.raises(InvalidContactNumber):
@@ -198,15 +343,14 @@ def test_update_contact_with_errors(
 
 
 @pytest.mark.parametrize(
-    "is_valid",
+    "dummy_phone_number, is_valid",
     [
-        True,
-        False,
+        ("+972546643567", True),
+        ("0546643567", False),
     ],
     ids=["valid_phone_number", "invalid_phone_number"],
 )
 def test_delete_contact(
-    mocker: MockerFixture,
     mock_db_client: Mock,
     dummy_phone_number: str,
     dummy_contact_data: ContactResponse,
@@ -215,14 +359,6 @@ def test_delete_contact(
     delete_contact_response_successfuly: DeleteContactResponse,
 ) -> None:
     # Arrange
-    mocker.patch(
-        "phone_book_api_server.services.contact_service.ContactService._is_valid_number",
-        return_value=is_valid,
-    )
-    mocker.patch(
-        "phone_book_api_server.services.contact_service.ContactService.get_contact",
-        return_value=dummy_contact_data,
-    )
     mock_db_client.get_contact.return_value = dummy_contact_data
 
     # Act and Assert
@@ -234,3 +370,335 @@ def test_delete_contact(
         with pytest.raises(InvalidContactNumber):
             with mock.patch("builtins.open", mock.mock_open()) as _:
                 contact_service.delete_contact(dummy_phone_number)
+
+
+def test_import_contacts(
+    contact_service: ContactService,
+    mock_db_client: Mock,
+) -> None:
+    """Test Import Contacts Reports Accepted, Rejected And Duplicated Rows."""
+    # Arrange
+    contact_rows = [
+        {"firstName": "dummy", "lastName": "dummy", "phoneNumber": "+972546643567"},
+        {"firstName": "dummy!", "lastName": "dummy", "phoneNumber": "+972546643568"},
+        {"firstName": "dummy", "lastName": "dummy", "phoneNumber": "+972546643567"},
+        {"first_name": "dummy", "last_name": "dummy", "phone_number": "+972546643569"},
+        {"firstName": "dummy"},
+        "not a contact",
+    ]
+    mock_db_client.insert_contacts.return_value = ["+972546643567"]
+
+    # Act
+    response = contact_service.import_contacts(contact_rows, batch_size=1)
+
+    # Assert
+    assert mock_db_client.insert_contacts.call_count == 2
+    assert (response.accepted, response.rejected, response.duplicates) == (1, 3, 2)
+    assert [row.status for row in response.rows] == [
+        ImportRowStatus.ACCEPTED,
+        ImportRowStatus.REJECTED,
+        ImportRowStatus.DUPLICATE,
+        ImportRowStatus.DUPLICATE,
+        ImportRowStatus.REJECTED,
+        ImportRowStatus.REJECTED,
+    ]
+    assert response.rows[1].detail == "Invalid contact name."
+    assert response.rows[4].phone_number is None
+
+
+def test_get_contact_served_from_cache(
+    cached_contact_service: ContactService,
+    mock_db_client: Mock,
+    dummy_contact_data: ContactResponse,
+    dummy_phone_number: str,
+) -> None:
+    """Test Get Contact Reads The Database Once For Repeated Lookups."""
+    # Arrange
+    mock_db_client.get_contact.return_value = dummy_contact_data
+
+    # Act
+    first_response = cached_contact_service.get_contact(dummy_phone_number)
+    second_response = cached_contact_service.get_contact(dummy_phone_number)
+
+    # Assert
+    mock_db_client.get_contact.assert_called_once_with(dummy_phone_number)
+    assert first_response == second_response == dummy_contact_data
+
+
+def test_get_contact_racing_a_write_is_not_cached(
+    cached_contact_service: ContactService,
+    mock_db_client: Mock,
+    dummy_contact_data: ContactResponse,
+    dummy_phone_number: str,
+) -> None:
+    """Test A Contact Invalidated While It Was Read From The Database Is Not Cached."""
+
+    # Arrange
+    def read_before_write(contact_phone_number: str) -> ContactResponse:
+        # Another request updates the contact after this read, before it is cached
+        cached_contact_service._invalidate_cached_contacts(contact_phone_number)
+        return dummy_contact_data
+
+    mock_db_client.get_contact.side_effect = read_before_write
+
+    # Act
+    cached_contact_service.get_contact(dummy_phone_number)
+    mock_db_client.get_contact.side_effect = None
+    mock_db_client.get_contact.return_value = dummy_contact_data
+    cached_contact_service.get_contact(dummy_phone_number)
+    cached_contact_service.get_contact(dummy_phone_number)
+
+    # Assert
+    assert mock_db_client.get_contact.call_count == 2
+
+
+def test_update_contact_invalidates_cache(
+    cached_contact_service: ContactService,
+    mock_db_client: Mock,
+    dummy_contact_data: ContactResponse,
+    dummy_phone_number: str,
+) -> None:
+    """Test Update Contact Drops The Old And New Phone Numbers From The Cache."""
+    # Arrange
+    new_phone_number = "+972546643568"
+    mock_db_client.get_contact.return_value = dummy_contact_data
+    cached_contact_service.get_contact(dummy_phone_number)
+    mock_db_client.update_contact.return_value = dummy_contact_data.copy(
+        update={"phone_number": new_phone_number}
+    )
+
+    # Act
+    cached_contact_service.update_contact(
+        UpdateContactRequest(phone_number=new_phone_number), dummy_phone_number
+    )
+    cached_contact_service.get_contact(dummy_phone_number)
+
+    # Assert
+    assert mock_db_client.get_contact.call_count == 2
+
+
+def test_delete_contact_invalidates_cache(
+    cached_contact_service: ContactService,
+    mock_db_client: Mock,
+    dummy_contact_data: ContactResponse,
+    dummy_phone_number: str,
+) -> None:
+    """Test Delete Contact Drops The Contact From The Cache."""
+    # Arrange
+    mock_db_client.get_contact.return_value = dummy_contact_data
+    cached_contact_service.get_contact(dummy_phone_number)
+
+    # Act
+    cached_contact_service.delete_contact(dummy_phone_number)
+    cached_contact_service.get_contact(dummy_phone_number)
+
+    # Assert
+    assert mock_db_client.get_contact.call_count == 2
+
+
+def test_delete_contact_normalizes_number_once(
+    mocker: MockerFixture,
+    contact_service: ContactService,
+    mock_db_client: Mock,
+) -> None:
+    """Test Delete Contact Validates The Number Once And Uses Its E.164 Form."""
+    # Arrange
+    normalize_number_spy = mocker.spy(contact_service, "_normalize_number")
+
+    # Act
+    contact_service.delete_contact("+972 54-664-3567")
+
+    # Assert
+    assert normalize_number_spy.call_count == 1
+    mock_db_client.get_contact.assert_not_called()
+    mock_db_client.delete_contact.assert_called_once_with("+972546643567")
+
+
+def test_delete_missing_contact(
+    cached_contact_service: ContactService,
+    mock_db_client: Mock,
+    dummy_contact_data: ContactResponse,
+    dummy_phone_number: str,
+) -> None:
+    """Test Delete Contact Trusts The Deleted Rows Over A Cached Copy Of The Contact."""
+    # Arrange
+    mock_db_client.get_contact.return_value = dummy_contact_data
+    cached_contact_service.get_contact(dummy_phone_number)
+    mock_db_client.delete_contact.return_value = False
+
+    # Act
+    with pytest.raises(ContactNotFoundError):
+        cached_contact_service.delete_contact(dummy_phone_number)
+    cached_contact_service.get_contact(dummy_phone_number)
+
+    # Assert
+    assert mock_db_client.get_contact.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "offset, max_results, expected_limit, expected_next_offset",
+    [(0, 200, 3, 2), (0, 2, None, None), (2, 2, None, None)],
+    ids=["next_page", "last_page_of_max_results", "past_max_results"],
+)
+def test_search_contacts(
+    contact_service: ContactService,
+    mock_db_client: Mock,
+    dummy_contacts_list: List[ContactResponse],
+    offset: int,
+    max_results: int,
+    expected_limit: Optional[int],
+    expected_next_offset: Optional[int],
+) -> None:
+    """Test Search Contacts Pages Through At Most Max Results."""
+    # Arrange
+    mock_db_client.search_contacts.return_value = dummy_contacts_list
+
+    # Act
+    response = contact_service.search_contacts("dummy", 2, offset, max_results)
+
+    # Assert
+    assert response.next_offset == expected_next_offset
+    if offset >= max_results:
+        mock_db_client.search_contacts.assert_not_called()
+        assert response.contacts == []
+    else:
+        mock_db_client.search_contacts.assert_called_once_with(
+            ContactSearchQuery(name="dummy", fuzzy=True), 3, offset
+        )
+        assert response.contacts == dummy_contacts_list[:2]
+
+
+def test_autocomplete_phone_numbers(
+    mock_db_client: Mock,
+    dummy_contact_data: ContactResponse,
+    dummy_contacts_list: List[ContactResponse],
+    dummy_phone_number: str,
+) -> None:
+    """Test Autocomplete Searches The Loaded Index, Kept In Step With The Writes."""
+    # Arrange
+    contact_service = ContactService(
+        db_client=mock_db_client, phone_number_index=PhoneNumberIndex()
+    )
+    mock_db_client.stream_phone_numbers.return_value = iter(
+        [[contact.phone_number for contact in dummy_contacts_list]]
+    )
+    contact_service.load_phone_number_index(batch_size=10)
+    mock_db_client.insert_contact.return_value = dummy_contact_data
+    mock_db_client.get_contact.return_value = dummy_contacts_list[0]
+
+    # Act
+    contact_service.insert_contact(dummy_contact_data)
+    contact_service.delete_contact(dummy_contacts_list[0].phone_number)
+    response = contact_service.autocomplete_phone_numbers("+972 54-664", 2)
+
+    # Assert
+    mock_db_client.stream_phone_numbers.assert_called_once_with(10)
+    assert response.phone_numbers == [
+        dummy_contacts_list[1].phone_number,
+        dummy_contacts_list[2].phone_number,
+    ]
+    assert response.total == 3
+    assert (
+        dummy_phone_number in contact_service.autocomplete_phone_numbers("+972", 10).phone_numbers
+    )
+
+
+@pytest.mark.parametrize(
+    "phone_number_index, prefix, expected_error",
+    [
+        (None, "+972", PhoneNumberIndexUnavailable),
+        (PhoneNumberIndex(), "+972", PhoneNumberIndexUnavailable),
+        (PhoneNumberIndex(), "dummy", InvalidSearchQuery),
+    ],
+    ids=["disabled", "not_loaded", "not_a_phone_number"],
+)
+def test_autocomplete_phone_numbers_errors(
+    mock_db_client: Mock,
+    phone_number_index: Optional[PhoneNumberIndex],
+    prefix: str,
+    expected_error: type,
+) -> None:
+    """Test Autocomplete Without A Loaded Index Or A Phone Number Prefix."""
+    # Arrange
+    contact_service = ContactService(
+        db_client=mock_db_client, phone_number_index=phone_number_index
+    )
+    if phone_number_index is not None and expected_error is InvalidSearchQuery:
+        phone_number_index.start_load().finish()
+
+    # Act & Assert
+    with pytest.raises(expected_error):
+        contact_service.autocomplete_phone_numbers(prefix, 10)
+
+
+def test_lookup_contacts(
+    cached_contact_service: ContactService,
+    mock_db_client: Mock,
+    dummy_contacts_list: List[ContactResponse],
+) -> None:
+    """Test Lookup Contacts Reads The Cache First And The Rest In One Query."""
+    # Arrange
+    cached_contact, found_contact, _ = dummy_contacts_list
+    mock_db_client.get_contact.return_value = cached_contact
+    cached_contact_service.get_contact(cached_contact.phone_number)
+    mock_db_client.get_contacts_by_phone_numbers.return_value = [found_contact]
+    requested_phone_numbers = [
+        cached_contact.phone_number,
+        "+972 54-664-3561",
+        dummy_contacts_list[2].phone_number,
+        "dummy",
+    ]
+
+    # Act
+    response = cached_contact_service.lookup_contacts(requested_phone_numbers, 10)
+    mock_db_client.get_contacts_by_phone_numbers.return_value = []
+    cached_contact_service.lookup_contacts(["+972546643561"], 10)
+
+    # Assert
+    mock_db_client.get_contacts_by_phone_numbers.assert_called_once_with(
+        [found_contact.phone_number, dummy_contacts_list[2].phone_number]
+    )
+    assert response.contacts == {
+        cached_contact.phone_number: cached_contact,
+        "+972 54-664-3561": found_contact,
+    }
+    assert response.missing == [dummy_contacts_list[2].phone_number]
+    assert response.invalid == ["dummy"]
+
+
+def test_lookup_contacts_too_many(contact_service: ContactService, mock_db_client: Mock) -> None:
+    """Test Lookup Contacts Rejects More Phone Numbers Than The Maximum."""
+    # Act & Assert
+    with pytest.raises(InvalidContactsLookup):
+        contact_service.lookup_contacts(["+972546643560", "+972546643561"], 1)
+    mock_db_client.get_contacts_by_phone_numbers.assert_not_called()
+
+
+def test_get_contact_coalesces_concurrent_lookups(
+    mock_db_client: Mock, dummy_contact_data: ContactResponse, dummy_phone_number: str
+) -> None:
+    """Test Concurrent Get Contact From The Threadpool Share One Database Query."""
+    # Arrange
+    single_flight = SingleFlight()
+    contact_service = ContactService(db_client=mock_db_client, single_flight=single_flight)
+    release = threading.Event()
+
+    def slow_get_contact(_: str) -> ContactResponse:
+        release.wait(timeout=5)
+        return dummy_contact_data
+
+    mock_db_client.get_contact.side_effect = slow_get_contact
+
+    # Act
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = [
+            executor.submit(contact_service.get_contact, dummy_phone_number) for _ in range(5)
+        ]
+        while single_flight.stats().coalesced < 4:
+            pass
+        release.set()
+        responses = [future.result() for future in futures]
+
+    # Assert
+    mock_db_client.get_contact.assert_called_once_with(dummy_phone_number)
+    assert responses == [dummy_contact_data] * 5
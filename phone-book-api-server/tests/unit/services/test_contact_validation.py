@@ -0,0 +1,63 @@
+import pytest
+
+from phone_book_api_server.exceptions.contact import (
+    InvalidContactEmail,
+    InvalidContactName,
+    InvalidContactNumber,
+)
+from phone_book_api_server.services.contact_validation import (
+    _parse_phone_number,
+    normalize_phone_number,
+    validate_email,
+    validate_name,
+)
+
+
+@pytest.mark.parametrize(
+    "phone_number",
+    ["+972546643567", "+972 54-664-3567", "+972 (54) 664 3567"],
+    ids=["e164", "dashes", "parentheses"],
+)
+def test_normalize_phone_number(phone_number: str) -> None:
+    """Test Normalize Phone Number Returns The E.164 Form."""
+    # Act & Assert
+    assert normalize_phone_number(phone_number) == "+972546643567"
+
+
+@pytest.mark.parametrize(
+    "phone_number",
+    ["0546643567", "+97254", "not a number"],
+    ids=["no_country_code", "too_short", "not_a_number"],
+)
+def test_normalize_phone_number_invalid(phone_number: str) -> None:
+    """Test Normalize Phone Number With Invalid Numbers."""
+    # Act & Assert
+    with pytest.raises(InvalidContactNumber):
+        normalize_phone_number(phone_number)
+
+
+def test_normalize_phone_number_memoized() -> None:
+    """Test Repeated Phone Numbers Are Parsed Once, Valid Or Not."""
+    # Arrange
+    _parse_phone_number.cache_clear()
+
+    # Act
+    for _ in range(3):
+        normalize_phone_number("+972546643567")
+        with pytest.raises(InvalidContactNumber):
+            normalize_phone_number("0546643567")
+
+    # Assert
+    cache_info = _parse_phone_number.cache_info()
+    assert (cache_info.misses, cache_info.hits) == (2, 4)
+
+
+def test_validate_email_and_name() -> None:
+    """Test Validate Email And Name."""
+    # Act & Assert
+    assert validate_email("dummy@dummy.com") == "dummy@dummy.com"
+    assert validate_name("dummyname") == "dummyname"
+    with pytest.raises(InvalidContactEmail):
+        validate_email("dummydummy.com")
+    with pytest.raises(InvalidContactName):
+        validate_name("dummy!name")
@@ -0,0 +1,84 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from phone_book_api_server.exceptions.contact import ContactNotFoundError
+from phone_book_api_server.services.single_flight import AsyncSingleFlight, SingleFlight
+
+
+def test_single_flight_coalesces_concurrent_calls() -> None:
+    """Test Single Flight Runs One Call For Concurrent Callers Of A Key."""
+    # Arrange
+    single_flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def slow_lookup(key: str) -> str:
+        calls.append(key)
+        release.wait(timeout=5)
+        return f"result of {key}"
+
+    # Act
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(single_flight.do, "dummy", slow_lookup, "dummy")]
+        while single_flight.stats().in_flight == 0:
+            pass
+        futures += [
+            executor.submit(single_flight.do, "dummy", slow_lookup, "dummy") for _ in range(3)
+        ]
+        while single_flight.stats().coalesced < 3:
+            pass
+        release.set()
+        results = [future.result() for future in futures]
+
+    # Assert
+    assert calls == ["dummy"]
+    assert results == ["result of dummy"] * 4
+    stats = single_flight.stats()
+    assert (stats.in_flight, stats.executions, stats.coalesced) == (0, 1, 3)
+
+
+def test_single_flight_shares_errors() -> None:
+    """Test Single Flight Raises The Error Of The Call And Runs The Next One Again."""
+    # Arrange
+    single_flight = SingleFlight()
+
+    def missing_lookup() -> None:
+        raise ContactNotFoundError
+
+    # Act & Assert
+    for _ in range(2):
+        with pytest.raises(ContactNotFoundError):
+            single_flight.do("dummy", missing_lookup)
+    assert single_flight.stats().executions == 2
+
+
+def test_async_single_flight_coalesces_concurrent_calls() -> None:
+    """Test Async Single Flight Survives A Cancelled Caller And Shares The Result."""
+    # Arrange
+    single_flight = AsyncSingleFlight()
+    calls = []
+
+    async def slow_lookup(key: str) -> str:
+        calls.append(key)
+        await asyncio.sleep(0.05)
+        return f"result of {key}"
+
+    async def scenario() -> list:
+        callers = [
+            asyncio.ensure_future(single_flight.do("dummy", slow_lookup, "dummy")) for _ in range(4)
+        ]
+        await asyncio.sleep(0)
+        callers[0].cancel()
+        return await asyncio.gather(*callers[1:])
+
+    # Act
+    results = asyncio.run(scenario())
+
+    # Assert
+    assert calls == ["dummy"]
+    assert results == ["result of dummy"] * 3
+    stats = single_flight.stats()
+    assert (stats.in_flight, stats.executions, stats.coalesced) == (0, 1, 3)
@@ -0,0 +1,57 @@
+from benchmarks.compare import compare_reports
+from benchmarks.harness import BenchmarkReport, BenchmarkResult, run_benchmark, summarize
+
+
+def test_summarize_computes_throughput_and_percentiles() -> None:
+    # Arrange
+    latencies = [index / 1000 for index in range(1, 101)]
+
+    # Act
+    result = summarize("dummy", latencies, elapsed=2.0)
+
+    # Assert
+    assert result.iterations == 100
+    assert result.throughput == 50.0
+    assert round(result.p50_ms, 2) == 50.5
+    assert round(result.p99_ms, 2) == 99.01
+
+
+def test_run_benchmark_calls_until_min_time() -> None:
+    # Arrange
+    iterations = []
+
+    # Act
+    result = run_benchmark("dummy", iterations.append, min_time=0.01, warmup=2)
+
+    # Assert
+    assert iterations[:3] == [-1, -2, 0]
+    assert result.iterations == len(iterations) - 2
+
+
+def test_compare_reports_shows_the_change_of_shared_benchmarks() -> None:
+    # Arrange
+    def get_report(throughput: float, p99_ms: float) -> BenchmarkReport:
+        return BenchmarkReport(
+            commit="dummy",
+            created_at="2024-01-01T00:00:00+00:00",
+            python="3.9",
+            contacts=1000,
+            database_client="sync",
+            results=[
+                BenchmarkResult(
+                    name="service/get_contact",
+                    iterations=100,
+                    throughput=throughput,
+                    p50_ms=1.0,
+                    p95_ms=1.0,
+                    p99_ms=p99_ms,
+                )
+            ],
+        )
+
+    # Act
+    lines = compare_reports(get_report(100.0, 2.0), get_report(150.0, 1.0))
+
+    # Assert
+    assert len(lines) == 2
+    assert lines[1].split() == ["service/get_contact", "150.0", "+50.0%", "1.000", "-50.0%"]
@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+
+from phone_book_api_server import SETTINGS
+
+# The package changes the working directory on import, the imports start from the project
+PROJECT_DIR = os.path.dirname(SETTINGS.ROOT_DIR)
+# Cold start budget of importing the server module, autoscaled workers must be ready fast
+IMPORT_TIME_BUDGET_SECONDS = 1.0
+IMPORT_TIME_RUNS = 3
+
+
+def _get_import_seconds() -> float:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import phone_book_api_server.api.server"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=PROJECT_DIR,
+    )
+    server_line = next(
+        line
+        for line in result.stderr.splitlines()
+        if line.endswith("| phone_book_api_server.api.server")
+    )
+    return int(server_line.split("|")[1]) / 10**6
+
+
+def test_import_server_within_budget() -> None:
+    # Act
+    import_seconds = min(_get_import_seconds() for _ in range(IMPORT_TIME_RUNS))
+
+    # Assert
+    assert import_seconds < IMPORT_TIME_BUDGET_SECONDS
+
+
+def test_import_server_builds_nothing() -> None:
+    # Arrange
+    code = (
+        "import sys\n"
+        "import phone_book_api_server.api.server as server\n"
+        "print('app' in vars(server))\n"
+        "lazy_modules = ('asyncpg', 'redis', 'sqlalchemy.ext.asyncio')\n"
+        "print(sorted(m for m in lazy_modules if m in sys.modules))"
+    )
+
+    # Act
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=PROJECT_DIR
+    )
+
+    # Assert
+    assert result.stdout.splitlines()[-2:] == ["False", "[]"]
@@ -0,0 +1,78 @@
+import os
+from typing import Any, Dict
+
+import pytest
+
+from phone_book_api_server.launcher import (
+    check_worker_caches,
+    get_server_options,
+    get_worker_state_warnings,
+)
+
+
+def test_get_server_options_defaults() -> None:
+    # Act
+    options = get_server_options(None)
+
+    # Assert
+    assert options == {
+        "host": "0.0.0.0",
+        "port": 8000,
+        "workers": 1,
+        "loop": "uvloop",
+        "http": "httptools",
+        "backlog": 2048,
+        "timeout_keep_alive": 5,
+        "limit_concurrency": None,
+        "limit_max_requests": None,
+        "access_log": False,
+    }
+
+
+def test_get_server_options_from_config() -> None:
+    # Act
+    options = get_server_options({"port": "9000", "workers": 4, "loop": "auto", "backlog": 512})
+    per_core_options = get_server_options({"workers": 0})
+
+    # Assert
+    assert options["port"] == 9000
+    assert options["workers"] == 4
+    assert per_core_options["workers"] == (os.cpu_count() or 1)
+    assert options["loop"] == "auto"
+    assert options["backlog"] == 512
+    assert options["http"] == "httptools"
+
+
+def test_get_worker_state_warnings() -> None:
+    # Arrange
+    config = {
+        "cache": {"backend": "memory", "max_size": 10000, "ttl": 60, "invalidation": "none"},
+        "autocomplete": {"index": "memory"},
+    }
+    redis_config = {**config, "cache": {**config["cache"], "invalidation": "redis"}}
+
+    # Act & Assert
+    assert len(get_worker_state_warnings(config, workers=4)) == 1
+    assert get_worker_state_warnings(config, workers=1) == []
+    assert get_worker_state_warnings(redis_config, workers=4) == []
+
+
+@pytest.mark.parametrize(
+    "cache_config, workers, refused",
+    [
+        ({"backend": "memory", "max_size": 10000, "invalidation": "none"}, 4, True),
+        ({"backend": "memory", "max_size": 10000, "invalidation": "local"}, 4, True),
+        ({"backend": "memory", "max_size": 10000, "invalidation": "none"}, 1, False),
+        ({"backend": "memory", "max_size": 10000, "invalidation": "redis"}, 4, False),
+        ({"backend": "memory", "max_size": 0, "invalidation": "none"}, 4, False),
+        ({"backend": "redis", "max_size": 10000, "invalidation": "none"}, 4, False),
+    ],
+    ids=["none", "local", "one_worker", "redis_invalidation", "no_cache", "redis_cache"],
+)
+def test_check_worker_caches(cache_config: Dict[str, Any], workers: int, refused: bool) -> None:
+    # Act & Assert
+    if refused:
+        with pytest.raises(ValueError):
+            check_worker_caches({"cache": cache_config}, workers)
+    else:
+        check_worker_caches({"cache": cache_config}, workers)
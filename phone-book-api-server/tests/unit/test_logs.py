@@ -0,0 +1,72 @@
+import io
+import json
+import logging
+
+from phone_book_api_server.logs import (
+    JsonFormatter,
+    QueueLogHandler,
+    RequestContextFilter,
+    reset_request_context,
+    set_request_context,
+)
+
+
+def _record(level: int, message: str, *args: object) -> logging.LogRecord:
+    return logging.makeLogRecord(
+        {
+            "name": "dummy",
+            "levelno": level,
+            "levelname": logging.getLevelName(level),
+            "msg": message,
+            "args": args,
+        }
+    )
+
+
+def test_json_formatter() -> None:
+    # Arrange
+    record = _record(logging.INFO, "got %d contacts", 3)
+    record.path = "/contacts/"
+
+    # Act
+    entry = json.loads(JsonFormatter().format(record))
+
+    # Assert
+    assert entry["message"] == "got 3 contacts"
+    assert entry["level"] == "INFO"
+    assert entry["path"] == "/contacts/"
+
+
+def test_request_context_filter_drops_unsampled_success_logs() -> None:
+    # Arrange
+    request_context_filter = RequestContextFilter()
+    info_record = _record(logging.INFO, "dummy")
+    warning_record = _record(logging.WARNING, "dummy")
+
+    # Act
+    token = set_request_context("dummy-id", sampled=False)
+    try:
+        is_info_kept = request_context_filter.filter(info_record)
+        is_warning_kept = request_context_filter.filter(warning_record)
+    finally:
+        reset_request_context(token)
+
+    # Assert
+    assert not is_info_kept
+    assert is_warning_kept
+    assert warning_record.request_id == "dummy-id"
+
+
+def test_queue_log_handler_writes_json_lines() -> None:
+    # Arrange
+    stream = io.StringIO()
+    queue_log_handler = QueueLogHandler(stream)
+
+    # Act
+    queue_log_handler.handle(_record(logging.INFO, "first"))
+    queue_log_handler.handle(_record(logging.ERROR, "second"))
+    queue_log_handler.close()
+
+    # Assert
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line["message"] for line in lines] == ["first", "second"]
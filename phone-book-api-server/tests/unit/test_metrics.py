@@ -0,0 +1,74 @@
+import asyncio
+import threading
+
+from phone_book_api_server.metrics import MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    # Arrange
+    registry = MetricsRegistry()
+    histogram = registry.histogram("dummy_seconds", "Dummy", ("method",), buckets=(0.1, 1.0))
+
+    # Act
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, "get")
+    lines = registry.render().splitlines()
+
+    # Assert
+    assert lines == [
+        "# HELP dummy_seconds Dummy",
+        "# TYPE dummy_seconds histogram",
+        'dummy_seconds_bucket{method="get",le="0.1"} 1',
+        'dummy_seconds_bucket{method="get",le="1.0"} 2',
+        'dummy_seconds_bucket{method="get",le="+Inf"} 3',
+        'dummy_seconds_count{method="get"} 3',
+        'dummy_seconds_sum{method="get"} 5.55',
+    ]
+
+
+def test_counter_sums_the_counts_of_every_thread() -> None:
+    # Arrange
+    registry = MetricsRegistry()
+    counter = registry.counter("dummy_total", "Dummy", ("status",))
+
+    def count() -> None:
+        for _ in range(1000):
+            counter.inc("200")
+
+    threads = [threading.Thread(target=count) for _ in range(4)]
+
+    # Act
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counter.inc('4"04')
+
+    # Assert
+    assert registry.render().splitlines()[2:] == [
+        'dummy_total{status="200"} 4000',
+        'dummy_total{status="4\\"04"} 1',
+    ]
+
+
+def test_histogram_times_functions_and_coroutines() -> None:
+    # Arrange
+    registry = MetricsRegistry()
+    histogram = registry.histogram("dummy_seconds", "Dummy", ("method",))
+
+    @histogram.time("sync")
+    def sync_function() -> str:
+        return "dummy"
+
+    @histogram.time("async")
+    async def async_function() -> str:
+        return "dummy"
+
+    # Act
+    results = (sync_function(), asyncio.run(async_function()))
+
+    # Assert
+    assert results == ("dummy", "dummy")
+    rendered_metrics = registry.render()
+    assert 'dummy_seconds_count{method="sync"} 1' in rendered_metrics
+    assert 'dummy_seconds_count{method="async"} 1' in rendered_metrics
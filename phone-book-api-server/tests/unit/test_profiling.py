@@ -0,0 +1,108 @@
+import os
+
+import sqlalchemy
+
+from phone_book_api_server.profiling import (
+    ProfileStore,
+    finish_request_profile,
+    get_package,
+    install_sql_timing,
+    profile_thread,
+    start_request_profile,
+)
+
+
+def test_get_package_of_profiled_functions() -> None:
+    # Arrange
+    site_packages = os.path.join(os.sep, "venv", "lib", "python3.9", "site-packages")
+
+    # Act
+    packages = [
+        get_package(os.path.join(site_packages, "sqlalchemy", "orm", "session.py"), "close"),
+        get_package(os.path.join(site_packages, "six.py"), "wraps"),
+        get_package(os.path.join(os.sep, "app", "phone_book_api_server", "logs.py"), "emit"),
+        get_package("~", "<method 'execute' of 'psycopg2.extensions.cursor' objects>"),
+        get_package("~", "<built-in method _json.encode_basestring>"),
+        get_package("~", "<built-in method builtins.len>"),
+        get_package("~", "<built-in method len>"),
+    ]
+
+    # Assert
+    assert packages == [
+        "sqlalchemy",
+        "six",
+        "phone_book_api_server",
+        "psycopg2",
+        "_json",
+        "builtins",
+        "builtins",
+    ]
+
+
+def test_request_profile_times_sql_statements() -> None:
+    # Arrange
+    install_sql_timing()
+    engine = sqlalchemy.create_engine("sqlite://")
+
+    # Act
+    profile, context_token = start_request_profile("GET", "/dummy", max_statements=1)
+    with engine.connect() as connection:
+        connection.exec_driver_sql("SELECT 1")
+        connection.exec_driver_sql("SELECT 2")
+    seconds = finish_request_profile(profile, context_token)
+    profile_response = profile.finish(200, seconds)
+
+    # Assert
+    assert profile_response.sql_statements_count == 2
+    assert [timing.statement for timing in profile_response.sql_statements] == ["SELECT 1"]
+    assert profile_response.packages["sqlalchemy"] > 0
+    assert "cumulative" in profile_response.stats
+
+
+def test_profile_thread_merges_the_thread_stats() -> None:
+    # Arrange
+    def dummy_service_method() -> int:
+        return sum(range(100))
+
+    # Act
+    unprofiled_method = profile_thread(dummy_service_method)
+    profile, context_token = start_request_profile("GET", "/dummy")
+    profiled_method = profile_thread(dummy_service_method)
+    result = profiled_method()
+    seconds = finish_request_profile(profile, context_token)
+
+    # Assert
+    assert unprofiled_method is dummy_service_method
+    assert result == 4950
+    assert "dummy_service_method" in profile.finish(200, seconds).stats
+
+
+def test_one_request_is_profiled_at_a_time() -> None:
+    # Act
+    profile, context_token = start_request_profile("GET", "/dummy")
+    concurrent_profile = start_request_profile("GET", "/dummy")
+    finish_request_profile(profile, context_token)
+    next_profile = start_request_profile("GET", "/dummy")
+    finish_request_profile(*next_profile)
+
+    # Assert
+    assert concurrent_profile is None
+    assert next_profile is not None
+
+
+def test_profile_store_keeps_the_latest_profiles() -> None:
+    # Arrange
+    profile_store = ProfileStore(max_profiles=2)
+    profiles = []
+    for index in range(3):
+        profile, context_token = start_request_profile("GET", f"/dummy/{index}")
+        profiles.append(profile.finish(200, finish_request_profile(profile, context_token)))
+
+    # Act
+    for profile in profiles:
+        profile_store.add(profile)
+
+    # Assert
+    assert [summary.path for summary in profile_store.list()] == ["/dummy/2", "/dummy/1"]
+    assert profile_store.get(profiles[0].id) is None
+    assert profile_store.get(profiles[2].id) == profiles[2]